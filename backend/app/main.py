@@ -1,21 +1,68 @@
 # backend/app/main.py - Updated complete version
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
 import os
+import asyncio
+import logging
+import importlib
 from dotenv import load_dotenv
 
 # Import routes
 from app.routes.inventory import router as inventory_router
 from app.routes.line_webhook import router as webhook_router
 from app.routes.business import router as business_router
+from app.routes.users import router as users_router
+from app.services.line_bot_service import line_bot_service
+from app.services.line_event_queue import line_event_queue
+from app.services.stock_alerts import stock_alerts
+from app.storage import close_storage, get_storage
+from app.utils.db import run_sync
+from app.utils.supabase_client import get_supabase_client
+from app.utils.metrics import METRICS_ENABLED, MetricsMiddleware, loop_lag_monitor, register_stats, render_metrics
+from app.utils.query_log import QUERY_LOG_ENABLED, QueryLogMiddleware
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Clients and SDKs are built on first use so the app serves /health as soon
+# as it is imported; warm-up then builds them in the background
+WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "true").lower() != "false"
+WARM_UP_MODULES = ("numpy", "jwt", "httpx", "linebot.models", "linebot.exceptions")
+
+async def warm_up():
+    try:
+        await run_sync(get_supabase_client)
+        await run_sync(lambda: line_bot_service.parser)
+        for module in WARM_UP_MODULES:
+            await run_sync(importlib.import_module, module)
+        await get_storage().warm_up()
+    except Exception as e:
+        logger.warning("Warm-up failed, clients will be built on first use: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    line_event_queue.start(line_bot_service.handle_event)
+    stock_alerts.start(line_bot_service.send_stock_alerts)
+    loop_lag_monitor.start()
+    warming = asyncio.create_task(warm_up()) if WARM_UP_ON_STARTUP else None
+    yield
+    if warming is not None:
+        warming.cancel()
+        await asyncio.gather(warming, return_exceptions=True)
+    await loop_lag_monitor.stop()
+    await line_event_queue.stop()
+    await stock_alerts.stop()
+    await line_bot_service.messaging.aclose()
+    await close_storage()
+
 app = FastAPI(
     title="LINE Inventory Copilot API",
     version="1.0.0",
-    description="FastAPI backend for LINE-based inventory management"
+    description="FastAPI backend for LINE-based inventory management",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -30,10 +77,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if QUERY_LOG_ENABLED:
+    app.add_middleware(QueryLogMiddleware)
+
+# Outermost, so latency covers the other middleware too
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    register_stats("line_webhook_queue", line_event_queue.stats)
+    register_stats("stock_alerts", stock_alerts.stats)
+
 # Include routers
 app.include_router(inventory_router, prefix="/api")
 app.include_router(webhook_router)
 app.include_router(business_router, prefix="/api")
+app.include_router(users_router, prefix="/api")
 
 @app.get("/")
 def read_root():
@@ -48,9 +105,18 @@ def health_check():
     return {
         "status": "OK",
         "service": "FastAPI",
-        "environment": os.getenv("ENVIRONMENT", "development")
+        "environment": os.getenv("ENVIRONMENT", "development"),
+        "webhook_queue": line_event_queue.stats(),
+        "stock_alerts": stock_alerts.stats()
     }
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
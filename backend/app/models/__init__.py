@@ -1,14 +1,24 @@
 # backend/app/models/__init__.py
-from .user import User, UserCreate, UserUpdate
+from .user import User, UserCreate, UserUpdate, UserStatusSummary
 from .business import Business, BusinessCreate, BusinessUpdate
-from .product import Product, ProductCreate, ProductUpdate
-from .inventory import Inventory, InventoryTransaction, TransactionCreate
+from .product import Product, ProductCreate, ProductUpdate, ProductPage
+from .inventory import (
+    Inventory, InventoryTransaction, TransactionCreate,
+    TransactionBatchCreate, TransactionBatchItemResult, TransactionBatchResult,
+    CategorySummary, InventorySummary
+)
 from .trial_code import TrialCode, TrialCodeCreate, TrialCodeUpdate
+from .analytics import MovementTotals, ProductMovement, MovementAnalytics
+from .forecast import ReorderSuggestion, ReorderPlan
 
 __all__ = [
-    "User", "UserCreate", "UserUpdate",
+    "User", "UserCreate", "UserUpdate", "UserStatusSummary",
     "Business", "BusinessCreate", "BusinessUpdate",
-    "Product", "ProductCreate", "ProductUpdate",
+    "Product", "ProductCreate", "ProductUpdate", "ProductPage",
     "Inventory", "InventoryTransaction", "TransactionCreate",
-    "TrialCode", "TrialCodeCreate", "TrialCodeUpdate"
+    "TransactionBatchCreate", "TransactionBatchItemResult", "TransactionBatchResult",
+    "CategorySummary", "InventorySummary",
+    "TrialCode", "TrialCodeCreate", "TrialCodeUpdate",
+    "MovementTotals", "ProductMovement", "MovementAnalytics",
+    "ReorderSuggestion", "ReorderPlan"
 ]
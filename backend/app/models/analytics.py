@@ -0,0 +1,32 @@
+# backend/app/models/analytics.py
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from datetime import date
+import uuid
+
+class MovementTotals(BaseModel):
+    start: date
+    stock_in: int = 0
+    stock_out: int = 0
+    adjustments: int = 0
+    adjustment_delta: int = 0
+    transactions: int = 0
+
+class ProductMovement(BaseModel):
+    product_id: uuid.UUID
+    name: Optional[str] = None
+    stock_in: int = 0
+    stock_out: int = 0
+    adjustment_delta: int = 0
+    current_stock: int = 0
+    daily_velocity: float = 0.0
+    days_of_cover: Optional[float] = None
+
+class MovementAnalytics(BaseModel):
+    business_id: uuid.UUID
+    start: date
+    end: date
+    bucket: Literal["day", "week"]
+    totals: MovementTotals
+    buckets: List[MovementTotals]
+    products: List[ProductMovement]
@@ -0,0 +1,26 @@
+# backend/app/models/forecast.py
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date
+import uuid
+
+class ReorderSuggestion(BaseModel):
+    product_id: uuid.UUID
+    name: Optional[str] = None
+    current_stock: int = 0
+    daily_demand: float = 0.0
+    demand_std: float = 0.0
+    safety_stock: int = 0
+    reorder_point: int = 0
+    suggested_order_quantity: int = 0
+    days_of_cover: Optional[float] = None
+
+class ReorderPlan(BaseModel):
+    business_id: uuid.UUID
+    as_of: date
+    history_days: int
+    lead_time_days: int
+    review_days: int
+    service_level: float
+    products_evaluated: int
+    products: List[ReorderSuggestion]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime
 from decimal import Decimal
 import uuid
@@ -51,3 +51,40 @@ class TransactionCreate(BaseModel):
     notes: Optional[str] = None
     reference_number: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
+
+class TransactionBatchCreate(BaseModel):
+    transactions: List[TransactionCreate] = Field(..., min_length=1, max_length=5000)
+
+class TransactionBatchItemResult(BaseModel):
+    index: int
+    success: bool
+    product_id: uuid.UUID
+    transaction_id: Optional[uuid.UUID] = None
+    previous_stock: Optional[int] = None
+    new_stock: Optional[int] = None
+    error: Optional[str] = None
+
+class TransactionBatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TransactionBatchItemResult]
+
+class CategorySummary(BaseModel):
+    category: Optional[str] = None
+    sku_count: int = 0
+    total_units: int = 0
+    stock_value_cost: Decimal = Decimal("0")
+    stock_value_retail: Decimal = Decimal("0")
+    low_stock_count: int = 0
+
+class InventorySummary(BaseModel):
+    business_id: uuid.UUID
+    sku_count: int = 0
+    total_units: int = 0
+    stock_value_cost: Decimal = Decimal("0")
+    stock_value_retail: Decimal = Decimal("0")
+    low_stock_count: int = 0
+    out_of_stock_count: int = 0
+    categories: List[CategorySummary] = Field(default_factory=list)
+    recent_transactions: List[InventoryTransaction] = Field(default_factory=list)
+    generated_at: datetime
@@ -1,6 +1,6 @@
 # backend/app/models/product.py
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 import uuid
@@ -36,3 +36,7 @@ class Product(ProductBase):
 
     class Config:
         from_attributes = True
+
+class ProductPage(BaseModel):
+    items: List[Product]
+    next_cursor: Optional[uuid.UUID] = None
@@ -25,3 +25,9 @@ class User(UserBase):
 
     class Config:
         from_attributes = True
+
+class UserStatusSummary(BaseModel):
+    business_count: int = 0
+    product_count: int = 0
+    low_stock_count: int = 0
+    last_activity_at: Optional[datetime] = None
@@ -1,11 +1,15 @@
 # backend/app/routes/business.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from datetime import datetime, timezone
 from typing import List
 from uuid import UUID
 
 from app.models import Business, BusinessCreate, BusinessUpdate, TrialCode, TrialCodeCreate
 from app.services.business_service import business_service
 from app.utils.auth import get_current_user
+from app.utils.db import execute
+from app.utils.etag import etag_matches, not_modified
+from app.utils.responses import json_response
 
 router = APIRouter(prefix="/business", tags=["business"])
 
@@ -25,14 +29,19 @@ async def create_business(
 @router.get("/{business_id}", response_model=Business)
 async def get_business(
     business_id: UUID,
+    request: Request,
     current_user = Depends(get_current_user)
 ):
     """Get business by ID"""
     try:
+        etag = await business_service.business_etag(business_id, current_user.id)
+        if etag and etag_matches(request, etag):
+            return not_modified(etag)
+
         business = await business_service.get_business_by_id(business_id, current_user.id)
         if not business:
             raise HTTPException(status_code=404, detail="Business not found")
-        return business
+        return json_response(business, etag)
     except HTTPException:
         raise
     except Exception as e:
@@ -53,12 +62,14 @@ async def update_business(
         
         # Update business
         update_data = business_data.dict(exclude_unset=True)
-        result = await business_service.supabase.table('businesses').update(update_data).eq('id', str(business_id)).execute()
+        # The business ETag is derived from updated_at
+        update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+        result = await execute(business_service.supabase.table('businesses').update(update_data).eq('id', str(business_id)))
         
         if not result.data:
             raise HTTPException(status_code=400, detail="Failed to update business")
         
-        return Business(**result.data[0])
+        return json_response(Business(**result.data[0]))
         
     except HTTPException:
         raise
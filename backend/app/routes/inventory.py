@@ -1,11 +1,20 @@
 # backend/app/routes/inventory.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import List, Literal, Optional
 from uuid import UUID
 
-from app.models import Product, ProductCreate, InventoryTransaction, TransactionCreate
-from app.services.inventory_service import inventory_service
+from app.models import (
+    Product, ProductCreate, ProductUpdate, ProductPage, InventoryTransaction, TransactionCreate,
+    TransactionBatchCreate, TransactionBatchResult, MovementAnalytics, ReorderPlan, InventorySummary
+)
+from app.services.inventory_service import inventory_service, MAX_PRODUCT_PAGE_LIMIT
+from app.services.analytics_service import analytics_service
+from app.services.forecast_service import forecast_service, ReorderPolicy
 from app.utils.auth import get_current_user
+from app.utils.etag import CACHE_CONTROL, etag_matches, not_modified
+from app.utils.responses import json_response
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
@@ -21,13 +30,51 @@ async def create_product(
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/businesses/{business_id}/products", response_model=List[Product])
+@router.put("/products/{product_id}", response_model=Product)
+async def update_product(
+    product_id: UUID,
+    product_data: ProductUpdate,
+    current_user = Depends(get_current_user)
+):
+    try:
+        product = await inventory_service.update_product(product_id, product_data, current_user.id)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return product
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/businesses/{business_id}/products", response_model=ProductPage)
 async def get_business_products(
     business_id: UUID,
+    request: Request,
+    limit: int = Query(100, ge=1, le=MAX_PRODUCT_PAGE_LIMIT),
+    cursor: Optional[UUID] = None,
+    category: Optional[str] = None,
+    updated_since: Optional[datetime] = None,
     current_user = Depends(get_current_user)
 ):
+    """List active products a page at a time; pass next_cursor back as cursor.
+
+    With `Accept: application/x-ndjson` the whole (filtered) catalog is
+    streamed instead, one product per line, ignoring `limit`.
+    """
     try:
-        return await inventory_service.get_products_by_business(business_id, current_user.id)
+        stream = "application/x-ndjson" in request.headers.get("accept", "")
+        version = await inventory_service.products_version(business_id, current_user.id)
+        etag = inventory_service.products_etag(business_id, version, stream, limit, cursor, category, updated_since)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        if stream:
+            rows = await inventory_service.stream_products(business_id, current_user.id, cursor, category, updated_since)
+            return StreamingResponse(rows, media_type="application/x-ndjson", headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+        page = await inventory_service.get_products_by_business(business_id, current_user.id, limit, cursor, category, updated_since)
+        return json_response(page, etag)
     except ValueError as e:
         raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
@@ -37,13 +84,45 @@ async def get_business_products(
 async def find_product_by_barcode(
     business_id: UUID,
     barcode: str,
+    request: Request,
     current_user = Depends(get_current_user)
 ):
     try:
-        product = await inventory_service.find_product_by_barcode(business_id, barcode, current_user.id)
+        version = await inventory_service.products_version(business_id, current_user.id)
+        etag = inventory_service.products_etag(business_id, version, "barcode", barcode)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        product = await inventory_service.find_product_by_barcode(business_id, barcode, current_user.id, version)
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
-        return product
+        return json_response(product, etag)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/businesses/{business_id}/products/sku/{sku}", response_model=Product)
+async def find_product_by_sku(
+    business_id: UUID,
+    sku: str,
+    request: Request,
+    current_user = Depends(get_current_user)
+):
+    try:
+        version = await inventory_service.products_version(business_id, current_user.id)
+        etag = inventory_service.products_etag(business_id, version, "sku", sku)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        product = await inventory_service.find_product_by_sku(business_id, sku, current_user.id, version)
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+        return json_response(product, etag)
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
@@ -56,5 +135,76 @@ async def record_inventory_transaction(
 ):
     try:
         return await inventory_service.record_transaction(transaction_data, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/transactions/batch", response_model=TransactionBatchResult)
+async def record_inventory_transactions_batch(
+    batch: TransactionBatchCreate,
+    current_user = Depends(get_current_user)
+):
+    """Record up to 5000 transactions in one request, with a result per item"""
+    try:
+        results = await inventory_service.record_transactions_batch(batch.transactions, current_user.id)
+        succeeded = sum(1 for result in results if result.success)
+        return json_response(TransactionBatchResult(succeeded=succeeded, failed=len(results) - succeeded, results=results))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/businesses/{business_id}/analytics", response_model=MovementAnalytics)
+async def get_movement_analytics(
+    business_id: UUID,
+    days: int = Query(30, ge=1, le=730),
+    bucket: Literal["day", "week"] = "day",
+    limit: int = Query(100, ge=1, le=1000),
+    current_user = Depends(get_current_user)
+):
+    """Stock movement totals per day or week, plus velocity and days of cover for the top `limit` products"""
+    try:
+        return json_response(await analytics_service.get_movement_analytics(business_id, current_user.id, days, bucket, limit))
+    except ValueError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/businesses/{business_id}/reorder-plan", response_model=ReorderPlan)
+async def get_reorder_plan(
+    business_id: UUID,
+    history_days: int = Query(90, ge=7, le=730),
+    lead_time_days: int = Query(7, ge=0, le=365),
+    review_days: int = Query(7, ge=0, le=365),
+    service_level: float = Query(0.95, gt=0.5, lt=1),
+    only_reorder: bool = True,
+    limit: int = Query(500, ge=1, le=50000),
+    current_user = Depends(get_current_user)
+):
+    """Demand forecast, reorder point and suggested order quantity per product, most urgent first"""
+    try:
+        policy = ReorderPolicy(lead_time_days=lead_time_days, review_days=review_days, service_level=service_level)
+        return json_response(await forecast_service.get_reorder_plan(business_id, current_user.id, history_days, policy, only_reorder, limit))
+    except ValueError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/businesses/{business_id}/summary", response_model=InventorySummary)
+async def get_inventory_summary(
+    business_id: UUID,
+    request: Request,
+    current_user = Depends(get_current_user)
+):
+    """Everything the dashboard shows in one cached response; send If-None-Match to get a 304 when unchanged"""
+    try:
+        versions = await inventory_service.inventory_summary_versions(business_id, current_user.id)
+        etag = inventory_service.inventory_summary_etag(business_id, versions)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        summary = await inventory_service.get_inventory_summary(business_id, current_user.id, versions)
+        return json_response(summary, etag)
+    except ValueError as e:
+        raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,11 +1,8 @@
 # backend/app/routes/line_webhook.py
 from fastapi import APIRouter, Request, HTTPException
-from linebot import WebhookHandler
-from linebot.exceptions import InvalidSignatureError
-from linebot.models import MessageEvent, TextMessage
-import os
 
 from app.services.line_bot_service import line_bot_service
+from app.services.line_event_queue import line_event_queue
 
 router = APIRouter(prefix="/webhook", tags=["webhook"])
 
@@ -14,15 +11,16 @@ async def handle_line_webhook(request: Request):
     signature = request.headers.get('x-line-signature', '')
     body = await request.body()
     body_str = body.decode('utf-8')
+    from linebot.exceptions import InvalidSignatureError
 
     try:
-        line_bot_service.handler.handle(body_str, signature)
+        events = line_bot_service.parser.parse(body_str, signature)
     except InvalidSignatureError:
         raise HTTPException(status_code=400, detail="Invalid signature")
 
-    return {"status": "ok"}
+    # Ack first; the worker pool replies to the events. A 503 makes LINE
+    # redeliver the payload once the queue has drained (or started).
+    if not await line_event_queue.enqueue(events):
+        raise HTTPException(status_code=503, detail="Webhook queue is full or not running")
 
-# Register LINE webhook handlers
-@line_bot_service.handler.add(MessageEvent, message=TextMessage)
-def handle_text_message(event):
-    line_bot_service.handle_message(event)
+    return {"status": "ok"}
@@ -0,0 +1,16 @@
+# backend/app/routes/users.py
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.models import UserStatusSummary
+from app.services.status_summary import status_summary
+from app.utils.auth import get_current_user
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+@router.get("/me/status", response_model=UserStatusSummary)
+async def get_my_status(current_user = Depends(get_current_user)):
+    """Business, product and low-stock counts for the current user"""
+    try:
+        return await status_summary.get_user_summary(current_user.id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,82 @@
+# backend/app/services/access_control.py
+import os
+import time
+from typing import Dict, Set
+from app.utils.cache import TTLCache, SingleFlight
+from app.storage import get_storage
+
+# Higher rank can do everything a lower rank can
+ROLE_RANKS = {"member": 1, "staff": 1, "manager": 2, "admin": 3, "owner": 4}
+
+# A denial is re-checked upstream once the cached grants are this old, so a
+# membership added outside the API (e.g. an approved join request) applies quickly
+DENIAL_RECHECK_SECONDS = 10
+
+class AccessControl:
+    """Answers "can user U act on business B with role R" from cached grants.
+
+    Grants per user are loaded from both businesses.owner_id and active
+    business_members rows, so owners and members go through the same check.
+    """
+
+    def __init__(self, ttl: float = 300.0, maxsize: int = 10000):
+        self._grants = TTLCache(maxsize=maxsize, ttl=ttl, name="business_grants", on_evict=self._forget)
+        # Users with cached grants per business; entries leave with their grants
+        self._users_by_business: Dict[str, Set[str]] = {}
+        self._loads = SingleFlight()
+
+    async def get_roles(self, user_id, refresh: bool = False) -> Dict[str, str]:
+        """Map of business_id -> role for every business the user can act on"""
+        user_id = str(user_id)
+        entry = None if refresh else self._grants.get(user_id)
+        if entry is None:
+            entry = await self._loads.do(user_id, lambda: self._load(user_id))
+        return entry[0]
+
+    async def require(self, user_id, business_id, role: str = "member") -> str:
+        """Return the user's role on the business, or raise ValueError if it is insufficient"""
+        user_id, business_id = str(user_id), str(business_id)
+
+        entry = self._grants.get(user_id)
+        if entry is None or (business_id not in entry[0] and time.monotonic() - entry[1] > DENIAL_RECHECK_SECONDS):
+            entry = await self._loads.do(user_id, lambda: self._load(user_id))
+
+        granted = entry[0].get(business_id)
+        if granted is None or ROLE_RANKS.get(granted, 0) < ROLE_RANKS[role]:
+            raise ValueError("Business not found or access denied")
+        return granted
+
+    async def _load(self, user_id: str):
+        owned, memberships = await get_storage().get_business_grants(user_id)
+
+        roles: Dict[str, str] = {}
+        for member in memberships:
+            if member.get("status") in (None, "active"):
+                roles[str(member["business_id"])] = member.get("role") or "member"
+        for business_id in owned:
+            roles[str(business_id)] = "owner"
+
+        entry = (roles, time.monotonic())
+        self._grants.set(user_id, entry)
+        for business_id in roles:
+            self._users_by_business.setdefault(business_id, set()).add(user_id)
+        return entry
+
+    def _forget(self, user_id: str, entry) -> None:
+        for business_id in entry[0]:
+            users = self._users_by_business.get(business_id)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self._users_by_business[business_id]
+
+    def invalidate_user(self, user_id) -> None:
+        """Forget a user's grants after their ownership or memberships change"""
+        self._grants.pop(str(user_id))
+
+    def invalidate_business(self, business_id) -> None:
+        """Forget grants of every cached user of a business (e.g. member removed)"""
+        for user_id in self._users_by_business.pop(str(business_id), set()):
+            self._grants.pop(user_id)
+
+access_control = AccessControl(ttl=float(os.getenv("ACCESS_CACHE_TTL_SECONDS", 300)))
@@ -0,0 +1,176 @@
+# backend/app/services/analytics_service.py
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, List, Optional
+from uuid import UUID
+from app.models import MovementTotals, ProductMovement, MovementAnalytics
+from app.utils.cache import TTLCache
+from app.utils.db import execute
+from app.utils.supabase_client import get_supabase_client
+from app.services.access_control import access_control
+from app.services.change_tracker import change_tracker, INVENTORY, PRODUCTS
+from app.services.inventory_service import inventory_service
+from app.services.ledger import TYPE_CODES, STOCK_IN, STOCK_OUT, SET_STOCK
+
+# NumPy is imported on first use to keep it off the startup path
+if TYPE_CHECKING:
+    import numpy as np
+
+# Supabase caps responses at 1000 rows
+LEDGER_PAGE_SIZE = 1000
+
+@dataclass
+class LedgerColumns:
+    """Ledger rows of one business as parallel arrays, products coded 0..n-1"""
+    product_ids: List[str]
+    products: "np.ndarray"
+    types: "np.ndarray"
+    quantities: "np.ndarray"
+    deltas: "np.ndarray"
+    days: "np.ndarray"
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+class AnalyticsService:
+    def __init__(self):
+        # Bound on staleness from writes that bypass this process: results
+        # expire after max_age and read a catalog at most max_age old, so
+        # ledger totals and stock lag by at most max_age, product names by
+        # at most twice that
+        self.max_age = change_tracker.max_age or 60.0
+        self._results = TTLCache(
+            maxsize=int(os.getenv("ANALYTICS_CACHE_SIZE", 1000)),
+            ttl=self.max_age,
+            name="analytics"
+        )
+
+    @property
+    def supabase(self):
+        return get_supabase_client()
+
+    async def load_ledger(self, business_id, since: datetime, transaction_type: Optional[str] = None) -> LedgerColumns:
+        """Pull the ledger since `since` column-wise, converting each page to arrays as it arrives"""
+        import numpy as np
+        codes: Dict[str, int] = {}
+        chunks = []
+        start = np.datetime64(since.astimezone(timezone.utc).replace(tzinfo=None), "s")
+        cursor = None
+
+        while True:
+            query = self.supabase.table("inventory_transactions").select(
+                "id, product_id, transaction_type, quantity, previous_stock, new_stock, created_at"
+            ).eq("business_id", str(business_id)).gte("created_at", since.isoformat())
+            if transaction_type:
+                query = query.eq("transaction_type", transaction_type)
+            if cursor:
+                created_at, last_id = cursor
+                query = query.or_(f'created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt.{last_id})')
+            result = await execute(query.order("created_at").order("id").limit(LEDGER_PAGE_SIZE))
+
+            page = result.data
+            if page:
+                count = len(page)
+                # PostgREST returns timestamptz in UTC; the offset is dropped for numpy
+                created = np.array([row["created_at"][:19] for row in page], dtype="datetime64[s]")
+                chunks.append((
+                    np.fromiter((codes.setdefault(row["product_id"], len(codes)) for row in page), dtype=np.int32, count=count),
+                    np.fromiter((TYPE_CODES[row["transaction_type"]] for row in page), dtype=np.int8, count=count),
+                    np.fromiter((row["quantity"] for row in page), dtype=np.int64, count=count),
+                    np.fromiter(((row["new_stock"] or 0) - (row["previous_stock"] or 0) for row in page), dtype=np.int64, count=count),
+                    ((created - start) // np.timedelta64(1, "D")).astype(np.int32)
+                ))
+            if len(page) < LEDGER_PAGE_SIZE:
+                break
+            cursor = (page[-1]["created_at"], page[-1]["id"])
+
+        if not chunks:
+            return LedgerColumns([], *(np.empty(0, dtype) for dtype in (np.int32, np.int8, np.int64, np.int64, np.int32)))
+        return LedgerColumns(list(codes), *(np.concatenate(column) for column in zip(*chunks)))
+
+    async def get_movement_analytics(self, business_id: UUID, user_id: UUID, days: int = 30, bucket: str = "day", limit: int = 100) -> MovementAnalytics:
+        """Stock in/out/adjustment totals per day or week and per-product velocity over the last `days` days"""
+        await access_control.require(user_id, business_id)
+
+        end = datetime.now(timezone.utc).date()
+        key = (str(business_id), days, bucket, limit, end, change_tracker.version(business_id, INVENTORY, PRODUCTS))
+        analytics = self._results.get(key)
+        if analytics is None:
+            analytics = await self._compute(business_id, user_id, end - timedelta(days=days - 1), end, bucket, limit)
+            self._results.set(key, analytics)
+        return analytics
+
+    async def _compute(self, business_id, user_id, start: date, end: date, bucket: str, limit: int) -> MovementAnalytics:
+        import numpy as np
+        ledger = await self.load_ledger(business_id, datetime.combine(start, time.min, tzinfo=timezone.utc))
+        days = (end - start).days + 1
+        size = 7 if bucket == "week" else 1
+        bucket_count = -(-days // size)
+
+        stock_in = ledger.types == STOCK_IN
+        stock_out = ledger.types == STOCK_OUT
+        adjustment = ledger.types == SET_STOCK
+
+        def total(index, mask, weights, length):
+            return np.rint(np.bincount(index[mask], weights[mask], minlength=length)).astype(np.int64)
+
+        def count(index, mask, length):
+            return np.bincount(index[mask], minlength=length)
+
+        # Per time bucket, clipped to the window in case of clock skew on the last day
+        index = np.clip(ledger.days, 0, days - 1) // size
+        everything = np.ones(len(ledger), dtype=bool)
+        per_bucket = np.stack([
+            total(index, stock_in, ledger.quantities, bucket_count),
+            total(index, stock_out, ledger.quantities, bucket_count),
+            count(index, adjustment, bucket_count),
+            total(index, adjustment, ledger.deltas, bucket_count),
+            count(index, everything, bucket_count)
+        ], axis=1)
+
+        def totals(row, bucket_start):
+            return MovementTotals(
+                start=bucket_start, stock_in=int(row[0]), stock_out=int(row[1]),
+                adjustments=int(row[2]), adjustment_delta=int(row[3]), transactions=int(row[4])
+            )
+
+        # Per product: fastest movers first
+        product_count = len(ledger.product_ids)
+        product_in = total(ledger.products, stock_in, ledger.quantities, product_count)
+        product_out = total(ledger.products, stock_out, ledger.quantities, product_count)
+        product_delta = total(ledger.products, adjustment, ledger.deltas, product_count)
+        top = np.lexsort((-product_in, -product_out))[:limit]
+
+        product_ids = [ledger.product_ids[code] for code in top]
+        stocks = await inventory_service.get_stock_levels(business_id, product_ids, user_id) if product_ids else {}
+        # Stock levels are read fresh; names come from a catalog within max_age
+        catalog = await inventory_service.get_catalog(business_id, max_age=self.max_age)
+
+        products = []
+        for code, product_id in zip(top.tolist(), product_ids):
+            velocity = float(product_out[code]) / days
+            current_stock = stocks.get(product_id, 0)
+            product = catalog.by_id.get(product_id)
+            products.append(ProductMovement(
+                product_id=product_id,
+                name=product.name if product else None,
+                stock_in=int(product_in[code]),
+                stock_out=int(product_out[code]),
+                adjustment_delta=int(product_delta[code]),
+                current_stock=current_stock,
+                daily_velocity=round(velocity, 3),
+                days_of_cover=round(current_stock / velocity, 1) if velocity else None
+            ))
+
+        return MovementAnalytics(
+            business_id=business_id,
+            start=start,
+            end=end,
+            bucket=bucket,
+            totals=totals(per_bucket.sum(axis=0), start),
+            buckets=[totals(row, start + timedelta(days=number * size)) for number, row in enumerate(per_bucket)],
+            products=products
+        )
+
+analytics_service = AnalyticsService()
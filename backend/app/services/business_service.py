@@ -3,15 +3,21 @@ from datetime import datetime, timedelta
 import uuid
 from app.models import Business, BusinessCreate, TrialCode
 from app.utils.supabase_client import get_supabase_client
+from app.utils.db import execute
+from app.services.access_control import access_control
+from app.services.status_summary import status_summary
+from app.services.change_tracker import change_tracker, BUSINESS
+from app.utils.etag import make_etag
 
 class BusinessService:
-    def __init__(self):
-        self.supabase = get_supabase_client()
+    @property
+    def supabase(self):
+        return get_supabase_client()
 
     async def validate_trial_code(self, code: str) -> bool:
         """Validate if a trial code is valid and not expired"""
         try:
-            result = await self.supabase.table('trial_codes').select('*').eq('code', code).eq('is_used', False).single()
+            result = await execute(self.supabase.table('trial_codes').select('*').eq('code', code).eq('is_used', False).single())
             
             if not result.data:
                 return False
@@ -31,11 +37,11 @@ class BusinessService:
     async def mark_trial_code_used(self, code: str, user_id: uuid.UUID) -> bool:
         """Mark a trial code as used"""
         try:
-            await self.supabase.table('trial_codes').update({
+            await execute(self.supabase.table('trial_codes').update({
                 'is_used': True,
                 'used_by': str(user_id),
                 'used_at': datetime.utcnow().isoformat()
-            }).eq('code', code)
+            }).eq('code', code))
             return True
         except Exception as e:
             print(f"Error marking trial code as used: {e}")
@@ -60,7 +66,7 @@ class BusinessService:
             business_dict.pop('trial_code', None)  # Remove trial_code from business data
             
             # Create business
-            result = await self.supabase.table('businesses').insert(business_dict).execute()
+            result = await execute(self.supabase.table('businesses').insert(business_dict))
             
             if not result.data:
                 raise ValueError("Failed to create business")
@@ -69,11 +75,13 @@ class BusinessService:
             await self.mark_trial_code_used(business_data.trial_code, user_id)
             
             # Create owner membership
-            await self.supabase.table('business_members').insert({
+            await execute(self.supabase.table('business_members').insert({
                 'business_id': result.data[0]['id'],
                 'user_id': str(user_id),
                 'role': 'owner'
-            }).execute()
+            }))
+            access_control.invalidate_user(user_id)
+            status_summary.business_created(result.data[0]['id'])
             
             return Business(**result.data[0])
             
@@ -81,22 +89,29 @@ class BusinessService:
             print(f"Error creating business: {e}")
             raise e
 
+    async def business_etag(self, business_id: uuid.UUID, user_id: uuid.UUID) -> Optional[str]:
+        """ETag of the business record if the user has access, from its updated_at only"""
+        try:
+            await access_control.require(user_id, business_id)
+        except ValueError:
+            return None
+        return make_etag("business", business_id, (await change_tracker.data_versions(business_id, BUSINESS))[BUSINESS])
+
     async def get_business_by_id(self, business_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Business]:
         """Get business by ID if user has access"""
         try:
             # Check if user is owner or member
-            membership_result = await self.supabase.table('business_members').select('*').eq('business_id', str(business_id)).eq('user_id', str(user_id)).execute()
-            
-            if not membership_result.data:
-                return None
-            
-            result = await self.supabase.table('businesses').select('*').eq('id', str(business_id)).single()
+            await access_control.require(user_id, business_id)
+
+            result = await execute(self.supabase.table('businesses').select('*').eq('id', str(business_id)).single())
             
             if not result.data:
                 return None
             
             return Business(**result.data)
             
+        except ValueError:
+            return None
         except Exception as e:
             print(f"Error getting business: {e}")
             return None
@@ -113,7 +128,7 @@ class BusinessService:
                 'created_by': str(created_by) if created_by else None
             }
             
-            result = await self.supabase.table('trial_codes').insert(trial_code_data).execute()
+            result = await execute(self.supabase.table('trial_codes').insert(trial_code_data))
             
             if not result.data:
                 raise ValueError("Failed to create trial code")
@@ -0,0 +1,88 @@
+# backend/app/services/change_tracker.py
+import os
+import time
+import uuid
+import asyncio
+import threading
+from typing import Dict, Tuple
+from app.utils.cache import TTLCache
+from app.utils.db import execute
+from app.utils.supabase_client import get_supabase_client
+
+# What a business-level cache can depend on
+BUSINESS, PRODUCTS, INVENTORY = "business", "products", "inventory"
+# Table and business column behind each kind, for data_versions()
+VERSION_TABLES = {BUSINESS: ("businesses", "id"), PRODUCTS: ("products", "business_id"), INVENTORY: ("inventory", "business_id")}
+
+class ChangeTracker:
+    """Per-business change counters bumped by the API write paths.
+
+    In-process caches key on `version(business_id, ...)` so they turn over
+    on the next write through this process. Counters are per process and
+    miss writes made elsewhere (other workers, the web app writing to
+    Supabase directly), so versions also roll over every `max_age` seconds,
+    which bounds how stale a cached result can get. ETags must not be that
+    loose and use data_versions() instead, which misses outside writes for
+    a few seconds at most.
+    """
+
+    def __init__(self, max_age: float = 60.0, data_version_ttl: float = 5.0):
+        self.max_age = max_age
+        # Distinguishes this process's counters from a restarted one's
+        self.epoch = uuid.uuid4().hex[:8]
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        # data_versions() results by (business, kind), dropped by bump()
+        self._data_versions = TTLCache(maxsize=10000, ttl=data_version_ttl, name="data_versions")
+
+    def bump(self, business_id, *kinds: str) -> None:
+        business_id = str(business_id)
+        with self._lock:
+            for kind in kinds:
+                self._counters[(business_id, kind)] = self._counters.get((business_id, kind), 0) + 1
+        for kind in kinds:
+            self._data_versions.pop((business_id, kind))
+
+    def version(self, business_id, *kinds: str) -> str:
+        """Opaque token that changes whenever any of `kinds` changes for the business"""
+        business_id = str(business_id)
+        counters = ".".join(str(self._counters.get((business_id, kind), 0)) for kind in kinds)
+        window = int(time.time() // self.max_age) if self.max_age else 0
+        return f"{self.epoch}-{counters}-{window}"
+
+    async def data_versions(self, business_id, *kinds: str) -> Dict[str, str]:
+        """Version per kind read from the rows themselves: latest updated_at and row count.
+
+        Unlike the counters this is the same in every worker and sees writes
+        that bypass the API (every writer sets updated_at). Results are kept
+        until a write through this process bumps the kind, or for
+        `data_version_ttl` seconds for writes made elsewhere, so a repeated
+        conditional request costs no query.
+        """
+        business_id = str(business_id)
+        versions = {kind: self._data_versions.get((business_id, kind)) for kind in kinds}
+        missing = [kind for kind, version in versions.items() if version is None]
+        if not missing:
+            return versions
+
+        # A write that lands while the query runs may not be in its result;
+        # such a version is returned but not kept
+        counters = {kind: self._counters.get((business_id, kind), 0) for kind in missing}
+        supabase = get_supabase_client()
+        results = await asyncio.gather(*(
+            execute(
+                supabase.table(VERSION_TABLES[kind][0]).select("updated_at", count="exact")
+                .eq(VERSION_TABLES[kind][1], business_id).order("updated_at", desc=True, nullsfirst=False).limit(1)
+            )
+            for kind in missing
+        ))
+        for kind, result in zip(missing, results):
+            versions[kind] = f"{result.count}@{result.data[0]['updated_at'] if result.data else ''}"
+            if self._counters.get((business_id, kind), 0) == counters[kind]:
+                self._data_versions.set((business_id, kind), versions[kind])
+        return versions
+
+change_tracker = ChangeTracker(
+    max_age=float(os.getenv("CHANGE_TRACKER_MAX_AGE_SECONDS", 60)),
+    data_version_ttl=float(os.getenv("DATA_VERSION_TTL_SECONDS", 5))
+)
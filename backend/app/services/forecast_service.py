@@ -0,0 +1,154 @@
+# backend/app/services/forecast_service.py
+import os
+import math
+from dataclasses import dataclass, astuple
+from datetime import datetime, time, timedelta, timezone
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Dict, Optional
+from uuid import UUID
+from app.models import ReorderSuggestion, ReorderPlan
+from app.utils.cache import TTLCache
+from app.utils.db import run_sync
+from app.services.access_control import access_control
+from app.services.analytics_service import analytics_service
+from app.services.change_tracker import change_tracker, INVENTORY, PRODUCTS
+from app.services.inventory_service import inventory_service
+from app.services.status_summary import status_summary
+
+if TYPE_CHECKING:
+    import numpy as np
+
+@dataclass(frozen=True)
+class ReorderPolicy:
+    lead_time_days: int = 7
+    review_days: int = 7
+    service_level: float = 0.95
+    smoothing: float = 0.1
+
+def demand_matrix(products: "np.ndarray", days: "np.ndarray", quantities: "np.ndarray", product_count: int, day_count: int) -> "np.ndarray":
+    """Units sold per product per day as a products × days float32 matrix"""
+    import numpy as np
+    keep = (products >= 0) & (days >= 0) & (days < day_count)
+    flat = np.bincount(
+        products[keep].astype(np.int64) * day_count + days[keep],
+        weights=quantities[keep],
+        minlength=product_count * day_count
+    )
+    return flat.astype(np.float32).reshape(product_count, day_count)
+
+def reorder_points(demand: "np.ndarray", stock: "np.ndarray", policy: ReorderPolicy) -> Dict[str, "np.ndarray"]:
+    """Demand forecast, safety stock, reorder point and order quantity for every product row at once.
+
+    The forecast is simple exponential smoothing started from the first day.
+    Its final level is a fixed weighted sum of the history, so all products
+    are forecast with one matrix-vector product. Safety stock covers demand
+    variability over the lead time at the requested service level, and
+    products at or below their reorder point are topped up to cover lead
+    time plus one review period.
+    """
+    import numpy as np
+    day_count = demand.shape[1]
+    alpha = policy.smoothing
+    weights = alpha * (1 - alpha) ** np.arange(day_count - 1, -1, -1, dtype=np.float64)
+    weights[0] = (1 - alpha) ** (day_count - 1)
+    forecast = demand @ weights.astype(np.float32)
+
+    deviation = demand.std(axis=1, ddof=1) if day_count > 1 else np.zeros(len(demand), dtype=np.float32)
+    z = NormalDist().inv_cdf(policy.service_level)
+    safety_stock = np.ceil(z * deviation * math.sqrt(policy.lead_time_days))
+    reorder_point = np.ceil(forecast * policy.lead_time_days + safety_stock)
+    target = forecast * (policy.lead_time_days + policy.review_days) + safety_stock
+    order = np.where(stock <= reorder_point, np.ceil(np.maximum(target - stock, 0)), 0)
+    cover = np.divide(stock, forecast, out=np.full(len(stock), np.inf), where=forecast > 0)
+
+    return {
+        "forecast": forecast,
+        "deviation": deviation,
+        "safety_stock": safety_stock.astype(np.int64),
+        "reorder_point": reorder_point.astype(np.int64),
+        "order": order.astype(np.int64),
+        "cover": cover
+    }
+
+class ForecastService:
+    def __init__(self):
+        self._plans = TTLCache(maxsize=int(os.getenv("FORECAST_CACHE_SIZE", 200)), ttl=float(os.getenv("FORECAST_CACHE_TTL_SECONDS", 900)), name="reorder_plans")
+
+    async def get_reorder_plan(
+        self,
+        business_id: UUID,
+        user_id: UUID,
+        history_days: int = 90,
+        policy: ReorderPolicy = ReorderPolicy(),
+        only_reorder: bool = True,
+        limit: Optional[int] = 500
+    ) -> ReorderPlan:
+        """Reorder plan for a business, cached until its products or stock change"""
+        await access_control.require(user_id, business_id)
+
+        key = (str(business_id), history_days, astuple(policy), only_reorder, limit, change_tracker.version(business_id, INVENTORY, PRODUCTS))
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = await self.compute_plan(business_id, history_days, policy, only_reorder, limit)
+            self._plans.set(key, plan)
+        return plan
+
+    async def compute_plan(
+        self,
+        business_id,
+        history_days: int = 90,
+        policy: ReorderPolicy = ReorderPolicy(),
+        only_reorder: bool = True,
+        limit: Optional[int] = None
+    ) -> ReorderPlan:
+        """Forecast every active product of a business from its stock_out history (callers check access)"""
+        import numpy as np
+        as_of = datetime.now(timezone.utc).date()
+        since = datetime.combine(as_of - timedelta(days=history_days - 1), time.min, tzinfo=timezone.utc)
+        ledger = await analytics_service.load_ledger(business_id, since, transaction_type="stock_out")
+        catalog = await inventory_service.get_catalog(business_id)
+        summary = await status_summary.get_business_summary(business_id)
+
+        products = catalog.active_products()
+        positions = {str(product.id): position for position, product in enumerate(products)}
+        rows = np.array([positions.get(product_id, -1) for product_id in ledger.product_ids], dtype=np.int64)
+        stock = np.array([summary.stocks.get(str(product.id), 0) for product in products], dtype=np.float64)
+
+        def compute():
+            demand = demand_matrix(rows[ledger.products], ledger.days, ledger.quantities, len(products), history_days)
+            return reorder_points(demand, stock, policy)
+
+        # NumPy releases the GIL, so the heavy part runs off the event loop
+        result = await run_sync(compute)
+
+        selected = np.flatnonzero(result["order"] > 0) if only_reorder else np.arange(len(products))
+        selected = selected[np.argsort(result["cover"][selected], kind="stable")][:limit]
+
+        suggestions = []
+        for position in selected.tolist():
+            product = products[position]
+            cover = result["cover"][position]
+            suggestions.append(ReorderSuggestion(
+                product_id=product.id,
+                name=product.name,
+                current_stock=int(stock[position]),
+                daily_demand=round(float(result["forecast"][position]), 3),
+                demand_std=round(float(result["deviation"][position]), 3),
+                safety_stock=int(result["safety_stock"][position]),
+                reorder_point=int(result["reorder_point"][position]),
+                suggested_order_quantity=int(result["order"][position]),
+                days_of_cover=round(float(cover), 1) if np.isfinite(cover) else None
+            ))
+
+        return ReorderPlan(
+            business_id=business_id,
+            as_of=as_of,
+            history_days=history_days,
+            lead_time_days=policy.lead_time_days,
+            review_days=policy.review_days,
+            service_level=policy.service_level,
+            products_evaluated=len(products),
+            products=suggestions
+        )
+
+forecast_service = ForecastService()
@@ -0,0 +1,159 @@
+# backend/app/services/intent_matcher.py
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+class AhoCorasick:
+    """Multi-pattern substring matcher: finds every pattern in one pass over the text"""
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+
+        for pattern, payload in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append((len(pattern), payload))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (start, end, payload) for every occurrence of every pattern"""
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in out[state]:
+                yield index - length + 1, index + 1, payload
+
+# Checked in this order when a message hits several intents ("how many" beats "how")
+INTENT_KEYWORDS = {
+    "stock_query": {
+        "en": ["stock", "inventory", "how many", "how much", "left", "remaining", "qty", "quantity"],
+        "th": ["สต็อก", "สต๊อก", "คงเหลือ", "เหลือ", "กี่", "จำนวน", "คลัง"],
+    },
+    "help": {
+        "en": ["help", "what", "how"],
+        "th": ["ช่วย", "วิธี", "ทำอะไร", "ยังไง", "อย่างไร"],
+    },
+    "products": {
+        "en": ["product", "products", "item", "items"],
+        "th": ["สินค้า", "รายการ"],
+    },
+}
+# A standalone count ("do we have 5 iphone"), not digits inside a SKU or barcode
+_QUANTITY = re.compile(r"(?<![\w.-])\d{1,6}(?![\w.-])")
+
+@dataclass
+class IntentMatch:
+    intent: Optional[str]
+    quantity: Optional[int] = None
+    keywords: List[str] = field(default_factory=list)
+
+class IntentMatcher:
+    """Keyword intent classifier over English and Thai, compiled once.
+
+    The keyword set is small, so it is compiled into one regex alternation
+    (longest keyword first). The re engine tries the alternation at each
+    position rather than walking one automaton, but for a few dozen short
+    keywords that is still quicker than the pure-Python AhoCorasick, which is
+    kept for product names (thousands of patterns).
+    """
+
+    def __init__(self, keywords: Dict[str, Dict[str, List[str]]] = INTENT_KEYWORDS):
+        self.priority = list(keywords)
+        self._intents: Dict[str, str] = {}
+        for intent, languages in keywords.items():
+            for words in languages.values():
+                for word in words:
+                    self._intents.setdefault(word.lower(), intent)
+
+        by_length = sorted(self._intents, key=len, reverse=True)
+        latin = "|".join(re.escape(word) for word in by_length if word.isascii())
+        thai = "|".join(re.escape(word) for word in by_length if not word.isascii())
+        # Latin keywords must be whole words ("how" is not in "show", "left"
+        # is not in "leftover"); Thai has no spaces
+        self._pattern = re.compile(rf"(?<![a-z0-9])(?:{latin})(?![a-z0-9])|{thai}")
+
+    def match(self, message: str) -> IntentMatch:
+        message = message.lower()
+        hits = self._pattern.findall(message)
+        intents = {self._intents[hit] for hit in hits}
+        intent = next((name for name in self.priority if name in intents), None)
+        quantity = _QUANTITY.search(message)
+        return IntentMatch(
+            intent=intent,
+            quantity=int(quantity.group()) if quantity else None,
+            keywords=hits
+        )
+
+# Name words too common to identify a product on their own
+_NAME_STOP_WORDS = {"the", "and", "for", "with", "of", "in"}
+
+def is_whole_word(text: str, start: int, end: int) -> bool:
+    """Latin terms must cover whole words ("pro" is not in "products")"""
+    if not text[start].isascii():
+        return True
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+def build_product_index(products, max_products_per_word: int = 100) -> AhoCorasick:
+    """Automaton over product names, name words, SKUs and barcodes for finding mentions in chat.
+
+    Name words shared by more than `max_products_per_word` products (e.g.
+    "model", "pack") identify nothing and are left out.
+    """
+    product_terms = []
+    word_counts: Dict[str, int] = {}
+    for product in products:
+        words = {word.lower() for word in (product.name or "").split()}
+        for word in words:
+            word_counts[word] = word_counts.get(word, 0) + 1
+        terms = {(term or "").strip().lower() for term in (product.name, product.sku, product.barcode)}
+        product_terms.append((product, terms, words))
+
+    patterns = []
+    for product, terms, words in product_terms:
+        terms |= {word for word in words if word_counts[word] <= max_products_per_word}
+        for term in terms:
+            if len(term) >= 2 and term not in _NAME_STOP_WORDS:
+                patterns.append((term, product))
+    return AhoCorasick(patterns)
+
+def find_product_mentions(index: AhoCorasick, message: str, limit: int = 5) -> list:
+    """Products best matching the message: most matched characters of name, SKU or barcode"""
+    message = message.lower()
+    scores: Dict[str, int] = {}
+    products: Dict[str, Any] = {}
+    for start, end, product in index.finditer(message):
+        if is_whole_word(message, start, end):
+            key = str(product.id)
+            scores[key] = scores.get(key, 0) + end - start
+            products[key] = product
+
+    if not scores:
+        return []
+    best = max(scores.values())
+    return [products[key] for key, score in scores.items() if score == best][:limit]
+
+intent_matcher = IntentMatcher()
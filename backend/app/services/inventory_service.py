@@ -1,99 +1,394 @@
 # backend/app/services/inventory_service.py
-from typing import List, Optional
-from uuid import UUID
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 from app.utils.supabase_client import get_supabase_client
-from app.models import Product, ProductCreate, InventoryTransaction, TransactionCreate
+from app.utils.db import execute
+from app.storage import get_storage
+from app.models import (
+    Product, ProductCreate, ProductUpdate, InventoryTransaction, TransactionCreate,
+    TransactionBatchItemResult, CategorySummary, InventorySummary
+)
+from app.services.ledger import chain_movements
+from app.services.product_catalog import ProductCatalog, catalog_cache
+from app.services.access_control import access_control
+from app.services.status_summary import status_summary
+from app.services.stock_alerts import stock_alerts
+from app.services.change_tracker import change_tracker, PRODUCTS, INVENTORY
+from app.utils.cache import TTLCache
+from app.utils.etag import make_etag
+from app.utils.responses import dumps, project
+
+# Ledger rows written per apply_inventory_batch call, ids per PostgREST in.() filter,
+# and rows per page when streaming products (Supabase caps responses at 1000 rows)
+BATCH_CHUNK_SIZE = 500
+IN_FILTER_CHUNK_SIZE = 200
+CATALOG_PAGE_SIZE = 1000
+# A product page asks for one row more than it returns, which must fit under the cap
+MAX_PRODUCT_PAGE_LIMIT = CATALOG_PAGE_SIZE - 1
+RECENT_TRANSACTIONS = 10
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
 class InventoryService:
     def __init__(self):
-        self.supabase = get_supabase_client()
+        self._inventory_summaries = TTLCache(maxsize=1000, ttl=change_tracker.max_age or 60.0, name="inventory_summaries")
+
+    @property
+    def supabase(self):
+        # Looked up on use, so importing a service doesn't build the client
+        return get_supabase_client()
 
     async def create_product(self, product_data: ProductCreate, user_id: UUID) -> Product:
         """Create a new product"""
         try:
-            # Verify user owns the business
-            business_check = self.supabase.table("businesses").select("id").eq("id", product_data.business_id).eq("owner_id", user_id).execute()
-
-            if not business_check.data:
-                raise ValueError("Business not found or access denied")
+            await access_control.require(user_id, product_data.business_id)
 
             # Create product
-            result = self.supabase.table("products").insert(product_data.dict()).execute()
+            result = await execute(self.supabase.table("products").insert(product_data.model_dump(mode="json")))
 
             if result.data:
-                return Product(**result.data[0])
+                product = Product(**result.data[0])
+                catalog_cache.product_changed(product.business_id, product)
+                status_summary.product_changed(product.business_id, product)
+                change_tracker.bump(product.business_id, PRODUCTS)
+                return product
             else:
                 raise Exception("Failed to create product")
 
+        except ValueError:
+            raise
         except Exception as e:
             raise Exception(f"Error creating product: {str(e)}")
 
-    async def get_products_by_business(self, business_id: UUID, user_id: UUID) -> List[Product]:
-        """Get all products for a business"""
+    async def update_product(self, product_id: UUID, product_data: ProductUpdate, user_id: UUID) -> Optional[Product]:
+        """Update a product"""
         try:
-            # Verify ownership
-            business_check = self.supabase.table("businesses").select("id").eq("id", business_id).eq("owner_id", user_id).execute()
+            existing = await execute(self.supabase.table("products").select("business_id").eq("id", product_id))
+
+            if not existing.data:
+                return None
+
+            business_id = existing.data[0]["business_id"]
+
+            await access_control.require(user_id, business_id)
+
+            update_data = product_data.model_dump(mode="json", exclude_unset=True)
+            # ETags are derived from updated_at (change_tracker.data_versions)
+            update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
+            result = await execute(self.supabase.table("products").update(update_data).eq("id", product_id))
+
+            if result.data:
+                product = Product(**result.data[0])
+                catalog_cache.product_changed(business_id, product)
+                status_summary.product_changed(business_id, product)
+                change_tracker.bump(business_id, PRODUCTS)
+                return product
+            else:
+                raise Exception("Failed to update product")
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise Exception(f"Error updating product: {str(e)}")
 
-            if not business_check.data:
-                raise ValueError("Business not found or access denied")
+    async def get_products_by_business(
+        self,
+        business_id: UUID,
+        user_id: UUID,
+        limit: int = 100,
+        cursor: Optional[UUID] = None,
+        category: Optional[str] = None,
+        updated_since: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Get one keyset page of active products for a business, shaped like ProductPage"""
+        try:
+            await access_control.require(user_id, business_id)
 
-            result = self.supabase.table("products").select("*").eq("business_id", business_id).eq("is_active", True).execute()
+            # One extra row tells us whether another page follows
+            limit = min(limit, MAX_PRODUCT_PAGE_LIMIT)
+            query = self._product_list_query(business_id, cursor, category, updated_since).limit(limit + 1)
+            result = await execute(query)
 
-            return [Product(**product) for product in result.data]
+            rows = result.data[:limit]
+            next_cursor = rows[-1]["id"] if len(result.data) > limit else None
+            # Rows go straight back out to the client, so they are trimmed to
+            # the Product fields rather than validated into models
+            return {"items": project(Product, rows), "next_cursor": next_cursor}
 
+        except ValueError:
+            raise
         except Exception as e:
             raise Exception(f"Error fetching products: {str(e)}")
 
-    async def find_product_by_barcode(self, business_id: UUID, barcode: str, user_id: UUID) -> Optional[Product]:
+    async def stream_products(
+        self,
+        business_id: UUID,
+        user_id: UUID,
+        cursor: Optional[UUID] = None,
+        category: Optional[str] = None,
+        updated_since: Optional[datetime] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream active products as NDJSON, one upstream page in memory at a time"""
+        await access_control.require(user_id, business_id)
+
+        async def pages():
+            last_id = cursor
+            while True:
+                query = self._product_list_query(business_id, last_id, category, updated_since).limit(CATALOG_PAGE_SIZE)
+                result = await execute(query)
+                if result.data:
+                    # Same schema as the paged list
+                    yield b"".join(dumps(row) + b"\n" for row in project(Product, result.data))
+                if len(result.data) < CATALOG_PAGE_SIZE:
+                    return
+                last_id = result.data[-1]["id"]
+
+        return pages()
+
+    def _product_list_query(self, business_id, cursor, category, updated_since):
+        query = self.supabase.table("products").select("*").eq("business_id", business_id).eq("is_active", True)
+        if category:
+            query = query.eq("category", category)
+        if updated_since:
+            query = query.gte("updated_at", updated_since.isoformat())
+        if cursor:
+            query = query.gt("id", cursor)
+        return query.order("id")
+
+    async def find_product_by_barcode(self, business_id: UUID, barcode: str, user_id: UUID, version: Optional[str] = None) -> Optional[Product]:
         """Find product by barcode"""
         try:
-            # Verify ownership
-            business_check = self.supabase.table("businesses").select("id").eq("id", business_id).eq("owner_id", user_id).execute()
+            await access_control.require(user_id, business_id)
 
-            if not business_check.data:
-                raise ValueError("Business not found or access denied")
+            catalog = await self.get_catalog(business_id, version)
+            return catalog.find_by_barcode(barcode)
 
-            result = self.supabase.table("products").select("*").eq("business_id", business_id).eq("barcode", barcode).execute()
+        except ValueError:
+            raise
+        except Exception as e:
+            raise Exception(f"Error finding product: {str(e)}")
 
-            if result.data:
-                return Product(**result.data[0])
-            return None
+    async def find_product_by_sku(self, business_id: UUID, sku: str, user_id: UUID, version: Optional[str] = None) -> Optional[Product]:
+        """Find product by SKU"""
+        try:
+            await access_control.require(user_id, business_id)
+
+            catalog = await self.get_catalog(business_id, version)
+            return catalog.find_by_sku(sku)
 
+        except ValueError:
+            raise
         except Exception as e:
             raise Exception(f"Error finding product: {str(e)}")
 
+    async def get_catalog(self, business_id: UUID, version: Optional[str] = None, max_age: Optional[float] = None) -> ProductCatalog:
+        """In-process catalog of a business's products (callers check access), at `version` or at most `max_age` seconds old if given"""
+        return await catalog_cache.get(business_id, lambda: self._fetch_catalog_products(business_id), version, max_age)
+
+    async def _fetch_catalog_products(self, business_id: UUID) -> List[Product]:
+        return [Product(**row) for row in await get_storage().list_products(str(business_id))]
+
     async def record_transaction(self, transaction_data: TransactionCreate, user_id: UUID) -> InventoryTransaction:
         """Record inventory transaction"""
         try:
-            # Get current stock
-            current_inventory = self.supabase.table("inventory").select("current_stock").eq("business_id", transaction_data.business_id).eq("product_id", transaction_data.product_id).execute()
-
-            current_stock = current_inventory.data[0]["current_stock"] if current_inventory.data else 0
-
-            # Calculate new stock based on transaction type
-            if transaction_data.transaction_type == "stock_in":
-                new_stock = current_stock + transaction_data.quantity
-            elif transaction_data.transaction_type == "stock_out":
-                new_stock = max(0, current_stock - transaction_data.quantity)
-            else:  # adjustment
-                new_stock = transaction_data.quantity
-
-            # Create transaction record
-            transaction_record = {
-                **transaction_data.dict(),
-                "user_id": user_id,
-                "previous_stock": current_stock,
-                "new_stock": new_stock
+            await access_control.require(user_id, transaction_data.business_id)
+
+            # Stock read, ledger insert and stock update happen atomically in
+            # one round trip (migrations/001_record_inventory_transaction.sql)
+            params = {
+                f"p_{field}": value
+                for field, value in transaction_data.model_dump(mode="json").items()
             }
+            params["p_user_id"] = str(user_id)
 
-            result = self.supabase.table("inventory_transactions").insert(transaction_record).execute()
+            row = await get_storage().record_transaction(params)
 
-            if result.data:
-                return InventoryTransaction(**result.data[0])
+            if row:
+                transaction = InventoryTransaction(**row)
+                status_summary.stock_changed(transaction.business_id, transaction.product_id, transaction.new_stock, transaction.created_at)
+                stock_alerts.stock_changed(transaction.business_id, transaction.product_id, transaction.previous_stock, transaction.new_stock)
+                change_tracker.bump(transaction.business_id, INVENTORY)
+                return transaction
             else:
                 raise Exception("Failed to record transaction")
 
+        except ValueError:
+            raise
         except Exception as e:
             raise Exception(f"Error recording transaction: {str(e)}")
 
+    async def record_transactions_batch(self, transactions: List[TransactionCreate], user_id: UUID) -> List[TransactionBatchItemResult]:
+        """Record many inventory transactions, chained per product and written in chunks"""
+        results: Dict[int, TransactionBatchItemResult] = {}
+
+        def fail(index: int, error: str):
+            results[index] = TransactionBatchItemResult(
+                index=index, success=False, product_id=transactions[index].product_id, error=error
+            )
+
+        # Access and product checks run once per business / product, not per item
+        roles = await access_control.get_roles(user_id)
+        allowed_businesses = {str(t.business_id) for t in transactions} & set(roles)
+
+        product_ids = list({str(t.product_id) for t in transactions})
+        product_business: Dict[str, str] = {}
+        for ids in _chunks(product_ids, IN_FILTER_CHUNK_SIZE):
+            products = await execute(self.supabase.table("products").select("id, business_id").in_("id", ids))
+            product_business.update({row["id"]: row["business_id"] for row in products.data})
+
+        # Group valid items by product, keeping submission order within each product
+        groups: Dict[Tuple[str, str], List[dict]] = {}
+        for index, transaction in enumerate(transactions):
+            key = (str(transaction.business_id), str(transaction.product_id))
+            if key[0] not in allowed_businesses:
+                fail(index, "Business not found or access denied")
+            elif product_business.get(key[1]) != key[0]:
+                fail(index, "Product not found in business")
+            else:
+                row = transaction.model_dump(mode="json")
+                row.update(id=str(uuid4()), user_id=str(user_id), index=index)
+                groups.setdefault(key, []).append(row)
+
+        stocks = await self._read_stocks(list(groups))
+        pending = [row for group in groups.values() for row in group]
+
+        for chunk in _chunks(pending, BATCH_CHUNK_SIZE):
+            error = await self._apply_batch_chunk(chunk, stocks)
+            if not error:
+                for business_id in {row["business_id"] for row in chunk}:
+                    change_tracker.bump(business_id, INVENTORY)
+            for row in chunk:
+                if error:
+                    fail(row["index"], error)
+                else:
+                    status_summary.stock_changed(row["business_id"], row["product_id"], row["new_stock"])
+                    stock_alerts.stock_changed(row["business_id"], row["product_id"], row["previous_stock"], row["new_stock"])
+                    results[row["index"]] = TransactionBatchItemResult(
+                        index=row["index"],
+                        success=True,
+                        product_id=row["product_id"],
+                        transaction_id=row["id"],
+                        previous_stock=row["previous_stock"],
+                        new_stock=row["new_stock"]
+                    )
+
+        return [results[index] for index in range(len(transactions))]
+
+    async def products_version(self, business_id: UUID, user_id: UUID) -> str:
+        """Data version of the business's products; read it before the products it validates"""
+        await access_control.require(user_id, business_id)
+        return (await change_tracker.data_versions(business_id, PRODUCTS))[PRODUCTS]
+
+    def products_etag(self, business_id: UUID, version: str, *parts) -> str:
+        """ETag for a product read of the business; `parts` identify the request (filters, lookup key)"""
+        return make_etag("products", business_id, version, *parts)
+
+    async def inventory_summary_versions(self, business_id: UUID, user_id: UUID) -> Dict[str, str]:
+        """Data versions the inventory summary is built from"""
+        await access_control.require(user_id, business_id)
+        return await change_tracker.data_versions(business_id, PRODUCTS, INVENTORY)
+
+    def inventory_summary_etag(self, business_id: UUID, versions: Dict[str, str]) -> str:
+        """ETag of the business's inventory summary; changes with every product or stock write"""
+        return make_etag("inventory-summary", business_id, versions[PRODUCTS], versions[INVENTORY])
+
+    async def get_inventory_summary(self, business_id: UUID, user_id: UUID, versions: Optional[Dict[str, str]] = None) -> InventorySummary:
+        """Dashboard totals for a business: stock units and value overall and per category, low stock, recent movements"""
+        await access_control.require(user_id, business_id)
+        if versions is None:
+            versions = await change_tracker.data_versions(business_id, PRODUCTS, INVENTORY)
+
+        # Keyed by data version, so a cached summary is never older than its ETag
+        key = (str(business_id), versions[PRODUCTS], versions[INVENTORY])
+        summary = self._inventory_summaries.get(key)
+        if summary is None:
+            summary = await self._build_inventory_summary(business_id, versions)
+            self._inventory_summaries.set(key, summary)
+        return summary
+
+    async def _build_inventory_summary(self, business_id: UUID, versions: Dict[str, str]) -> InventorySummary:
+        catalog = await self.get_catalog(business_id, versions[PRODUCTS])
+        stock_summary = await status_summary.get_business_summary(business_id, f"{versions[PRODUCTS]}/{versions[INVENTORY]}")
+        recent = await execute(
+            self.supabase.table("inventory_transactions").select("*").eq("business_id", str(business_id))
+            .order("created_at", desc=True).limit(RECENT_TRANSACTIONS)
+        )
+
+        zero = Decimal("0")
+        categories: Dict[Optional[str], CategorySummary] = defaultdict(CategorySummary)
+        out_of_stock = 0
+        for product in catalog.active_products():
+            product_id = str(product.id)
+            units = stock_summary.stocks.get(product_id, 0)
+            category = categories[product.category]
+            category.sku_count += 1
+            category.total_units += units
+            category.stock_value_cost += (product.cost_price or zero) * units
+            category.stock_value_retail += (product.selling_price or zero) * units
+            category.low_stock_count += product_id in stock_summary.low_stock
+            out_of_stock += units <= 0
+
+        breakdown = []
+        for name, category in sorted(categories.items(), key=lambda item: (item[0] is None, item[0] or "")):
+            category.category = name
+            breakdown.append(category)
+
+        return InventorySummary(
+            business_id=business_id,
+            sku_count=sum(category.sku_count for category in breakdown),
+            total_units=sum(category.total_units for category in breakdown),
+            stock_value_cost=sum((category.stock_value_cost for category in breakdown), zero),
+            stock_value_retail=sum((category.stock_value_retail for category in breakdown), zero),
+            low_stock_count=sum(category.low_stock_count for category in breakdown),
+            out_of_stock_count=out_of_stock,
+            categories=breakdown,
+            recent_transactions=[InventoryTransaction(**row) for row in recent.data],
+            generated_at=datetime.now(timezone.utc)
+        )
+
+    async def get_stock_levels(self, business_id: UUID, product_ids: List[str], user_id: UUID) -> Dict[str, int]:
+        """Current stock per product id (0 for products without an inventory row)"""
+        await access_control.require(user_id, business_id)
+        stocks = await self._read_stocks([(str(business_id), str(product_id)) for product_id in product_ids])
+        return {str(product_id): stocks.get((str(business_id), str(product_id)), 0) for product_id in product_ids}
+
+    async def _read_stocks(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """Current stock per (business_id, product_id) in as few queries as possible"""
+        by_business: Dict[str, set] = {}
+        for business_id, product_id in keys:
+            by_business.setdefault(business_id, set()).add(product_id)
+        results = await asyncio.gather(*(
+            get_storage().read_stocks(business_id, list(product_ids)) for business_id, product_ids in by_business.items()
+        ))
+        # Movements apply to the default location's row, the one read here
+        return {(str(row["business_id"]), str(row["product_id"])): row["current_stock"] for rows in results for row in rows}
+
+    async def _apply_batch_chunk(self, chunk: List[dict], stocks: Dict[Tuple[str, str], int]) -> Optional[str]:
+        """Chain and write one chunk; re-chain once from fresh stock if another writer got there first"""
+        key = lambda row: (row["business_id"], row["product_id"])
+
+        for attempt in range(2):
+            # Chain from a copy so a rejected chunk leaves the running stocks untouched
+            chunk_stocks = {k: stocks.get(k, 0) for k in map(key, chunk)}
+            rows = chain_movements(chunk, chunk_stocks, key=key)
+            payload = [
+                {**{k: v for k, v in row.items() if k != "index"}, "position": position}
+                for position, row in enumerate(rows)
+            ]
+
+            try:
+                await get_storage().apply_batch(payload)
+                stocks.update(chunk_stocks)
+                return None
+            except Exception as e:
+                if "stock_conflict" not in str(e) or attempt:
+                    return f"Error recording transaction: {str(e)}"
+                stocks.update(await self._read_stocks(list(chunk_stocks)))
+
 inventory_service = InventoryService()
@@ -0,0 +1,107 @@
+# backend/app/services/ledger.py
+from typing import Dict, Hashable, Iterable, List
+
+# The inventory location movements apply to (record_inventory_transaction's default)
+DEFAULT_LOCATION = "main"
+
+def next_stock(current_stock: int, transaction_type: str, quantity: int) -> int:
+    """Stock after one movement (same rule as record_inventory_transaction)"""
+    if transaction_type == "stock_in":
+        return current_stock + quantity
+    if transaction_type == "stock_out":
+        return max(0, current_stock - quantity)
+    # adjustment / count set the stock outright
+    return quantity
+
+def chain_movements(rows: Iterable[dict], stocks: Dict[Hashable, int], key=lambda row: row["product_id"]) -> List[dict]:
+    """Fill previous_stock/new_stock on ledger rows in one pass.
+
+    Rows must be in ledger order. `stocks` holds the opening stock per key and
+    is advanced in place, so consecutive chunks can be chained from it.
+    """
+    chained = []
+    for row in rows:
+        product_key = key(row)
+        previous_stock = stocks.get(product_key, 0)
+        row["previous_stock"] = previous_stock
+        row["new_stock"] = stocks[product_key] = next_stock(previous_stock, row["transaction_type"], row["quantity"])
+        chained.append(row)
+    return chained
+
+# Transaction type codes used by the vectorized replay
+STOCK_IN, STOCK_OUT, SET_STOCK = 0, 1, 2
+TYPE_CODES = {"stock_in": STOCK_IN, "stock_out": STOCK_OUT, "adjustment": SET_STOCK, "count": SET_STOCK}
+_CODE_TYPES = {STOCK_IN: "stock_in", STOCK_OUT: "stock_out", SET_STOCK: "adjustment"}
+
+def replay_movements(products, types, quantities, stocks):
+    """Vectorized next_stock over a chunk of ledger rows from many products.
+
+    `products` are integer product codes indexing `stocks` (the opening stock
+    per product, advanced in place like chain_movements), `types` are
+    TYPE_CODES and rows are in ledger order. Returns new_stock per row.
+
+    Rows are grouped by product and split into segments at every adjustment /
+    count. Within a segment the floored stock_out rule is the Lindley
+    recursion x = max(0, x + d), whose closed form is the segment's running
+    sum minus its running minimum, so the whole chunk is a few cumsums.
+    Products with negative stock_in / adjustment quantities or a negative
+    opening stock don't fit that form and are replayed row by row.
+    """
+    import numpy as np
+
+    products = np.asarray(products, dtype=np.int64)
+    types = np.asarray(types, dtype=np.int8)
+    quantities = np.asarray(quantities, dtype=np.int64)
+    result = np.empty(len(products), dtype=np.int64)
+    if not len(products):
+        return result
+
+    # Stable sort by product; radix sort when the codes fit in 16 bits
+    if products.min() >= 0 and products.max() < 2 ** 16:
+        order = np.argsort(products.astype(np.uint16), kind="stable")
+    else:
+        order = np.argsort(products * len(products) + np.arange(len(products)))
+    p, t, q = products[order], types[order], quantities[order]
+    new_stock = np.empty(len(p), dtype=np.int64)
+
+    product_start = np.empty(len(p), dtype=bool)
+    product_start[0] = True
+    np.not_equal(p[1:], p[:-1], out=product_start[1:])
+    is_set = t == SET_STOCK
+
+    # Row by row for products the closed form doesn't cover
+    irregular = np.unique(p[((t != STOCK_OUT) & (q < 0)) | (product_start & (stocks[p] < 0))])
+    scalar_rows = np.isin(p, irregular)
+    for index in np.flatnonzero(scalar_rows):
+        code = p[index]
+        stocks[code] = new_stock[index] = next_stock(int(stocks[code]), _CODE_TYPES[int(t[index])], int(q[index]))
+
+    rows = ~scalar_rows
+    if rows.any():
+        p, t, q, is_set, head = p[rows], t[rows], q[rows], is_set[rows], (product_start | is_set)[rows]
+        segment = np.cumsum(head) - 1
+        opening = np.where(is_set, q, stocks[p])[head][segment]
+
+        delta = np.where(t == STOCK_IN, q, np.where(t == STOCK_OUT, -q, 0))
+        running = np.cumsum(delta)
+        running -= (running - delta)[head][segment]
+
+        # Segmented running minimum: shift each segment below all earlier ones
+        span = int(running.max() - running.min()) + 1
+        if span * (int(segment[-1]) + 1) < 2 ** 62:
+            shift = segment * span
+            floor = np.minimum.accumulate(running - shift) + shift
+        else:
+            starts = np.flatnonzero(head)
+            floor = np.concatenate([np.minimum.accumulate(part) for part in np.split(running, starts[1:])])
+
+        replayed = running - np.minimum(-opening, floor)
+        new_stock[rows] = replayed
+
+        last = np.empty(len(p), dtype=bool)
+        last[-1] = True
+        np.not_equal(p[1:], p[:-1], out=last[:-1])
+        stocks[p[last]] = replayed[last]
+
+    result[order] = new_stock
+    return result
@@ -1,45 +1,103 @@
 # backend/app/services/line_bot_service.py
 import os
-from linebot import LineBotApi, WebhookHandler
-from linebot.models import MessageEvent, TextMessage, TextSendMessage
+import asyncio
 from app.utils.supabase_client import get_supabase_client
+from app.utils.db import execute
+from app.utils.cache import TTLCache, SingleFlight
+from app.services.line_messaging_client import LineMessagingClient, text_message
+from app.services.intent_matcher import intent_matcher, build_product_index, find_product_mentions
+from app.services.access_control import access_control, ROLE_RANKS
+from app.services.inventory_service import inventory_service
+from app.services.status_summary import status_summary
+from app.models import TransactionCreate
+
+PRODUCTS_PAGE_SIZE = 10
+ALERT_DIGEST_MAX_LINES = 30
+NO_BUSINESS_MESSAGE = "🏢 You're not part of a business yet. Create one from the dashboard to start tracking stock."
+STOCK_FALLBACK_MESSAGE = "📦 I can help you check inventory! Use /scan to record stock movements or /dashboard to see your overview."
 
 class LineBotService:
     def __init__(self):
-        self.line_bot_api = LineBotApi(os.getenv('LINE_CHANNEL_ACCESS_TOKEN'))
-        self.handler = WebhookHandler(os.getenv('LINE_CHANNEL_SECRET'))
-        self.supabase = get_supabase_client()
+        self.messaging = LineMessagingClient(
+            os.getenv('LINE_CHANNEL_ACCESS_TOKEN'),
+            rate_limit=float(os.getenv('LINE_API_RATE_LIMIT', 1000))
+        )
+        self._parser = None
+        self._line_users = TTLCache(maxsize=int(os.getenv('LINE_USER_CACHE_SIZE', 10000)), ttl=600, name="line_users")
+        self._line_user_loads = SingleFlight()
+        self._alert_recipients = TTLCache(maxsize=10000, ttl=300, name="alert_recipients")
 
-    def handle_message(self, event):
-        """Handle incoming LINE messages"""
-        user_id = event.source.user_id
-        message_text = event.message.text.lower().strip()
+    @property
+    def supabase(self):
+        return get_supabase_client()
+
+    @property
+    def parser(self):
+        # The LINE SDK is slow to import; it is only needed once webhooks arrive
+        if self._parser is None:
+            from linebot import WebhookParser
+            self._parser = WebhookParser(os.getenv('LINE_CHANNEL_SECRET'))
+        return self._parser
 
-        # Find or create user
-        user = self.find_or_create_line_user(user_id)
+    async def handle_event(self, event):
+        """Dispatch one parsed webhook event (called from the event worker pool)"""
+        from linebot.models import MessageEvent, TextMessage
+        if isinstance(event, MessageEvent) and isinstance(event.message, TextMessage):
+            await self.handle_message(event)
+
+    async def reply(self, event, text):
+        # Queued events can outlive their reply token; fall back to a push to
+        # where the message came from (a group or room, or the user)
+        source = event.source
+        to = getattr(source, "group_id", None) or getattr(source, "room_id", None) or source.user_id
+        await self.messaging.reply(event.reply_token, [text_message(text)], fallback_to=to)
+
+    async def handle_message(self, event):
+        """Handle incoming LINE messages"""
+        # Case is kept for command arguments (SKUs); matching lowercases itself
+        message_text = event.message.text.strip()
 
+        # The user record is resolved lazily by the commands that need it
         if message_text.startswith('/'):
-            return self.handle_command(event, message_text)
+            return await self.handle_command(event, message_text)
         else:
-            return self.handle_natural_language(event, message_text)
+            return await self.handle_natural_language(event, message_text)
 
-    def handle_command(self, event, command):
+    async def handle_command(self, event, text):
         """Handle bot commands"""
-        reply_token = event.reply_token
+        command, *args = text.split()
+        command = command.lower()
+        line_user_id = event.source.user_id
 
         if command == '/help':
             message = """🤖 Inventory Copilot Commands:
 
 /help - Show this help
 /status - Check your account status
+/in <barcode> <qty> - Record stock in
+/out <barcode> <qty> - Record stock out
+/stock <product> - Check stock by barcode, SKU or name
+/products [page] - List your products
 /scan - Open barcode scanner
 /dashboard - Open dashboard
-/products - List your products
 
 Questions? Just ask me about your inventory!"""
 
         elif command == '/status':
-            message = self.get_user_status(event.source.user_id)
+            message = await self.get_user_status(line_user_id)
+
+        elif command in ('/in', '/out'):
+            message = await self.record_stock_movement(line_user_id, command, args)
+
+        elif command == '/stock':
+            query = " ".join(args)
+            if query:
+                message = await self.answer_stock_question(line_user_id, query, not_found=f"🔍 No product matching \"{query}\"")
+            else:
+                message = "Usage: /stock <barcode, SKU or product name>"
+
+        elif command == '/products':
+            message = await self.list_products(line_user_id, args[0] if args else "1")
 
         elif command == '/scan':
             message = "📱 Opening barcode scanner..."
@@ -52,79 +110,255 @@ Questions? Just ask me about your inventory!"""
         else:
             message = f"Unknown command: {command}\nType /help for available commands."
 
-        self.line_bot_api.reply_message(
-            reply_token,
-            TextSendMessage(text=message)
-        )
+        await self.reply(event, message)
 
-    def handle_natural_language(self, event, message):
+    async def handle_natural_language(self, event, message):
         """Handle natural language queries"""
-        reply_token = event.reply_token
+        match = intent_matcher.match(message)
+        intent = match.intent
 
-        if any(word in message for word in ['stock', 'inventory', 'how many']):
-            response = "📦 I can help you check inventory! Use /scan to record stock movements or /dashboard to see your overview."
-        elif any(word in message for word in ['help', 'what', 'how']):
+        if intent == 'stock_query':
+            response = await self.answer_stock_question(event.source.user_id, message, quantity=match.quantity)
+        elif intent == 'help':
             response = "Hi! I'm your Inventory Copilot 🤖\nI help you manage stock with just your phone. Type /help to see what I can do!"
-        elif any(word in message for word in ['product', 'item']):
+        elif intent == 'products':
             response = "🏷️ Want to manage products? Use /products to see your items or /scan to add new ones!"
         else:
             response = "I'm learning! Try /help to see what I can do, or ask me about your inventory. 🚀"
 
-        self.line_bot_api.reply_message(
-            reply_token,
-            TextSendMessage(text=response)
-        )
+        await self.reply(event, response)
+
+    async def answer_stock_question(self, line_user_id, message, not_found=STOCK_FALLBACK_MESSAGE, quantity=None):
+        """Answer "how many X" from the business catalog and current stock.
+
+        With a quantity ("do we have 5 X left") each line also says whether
+        the stock covers it.
+        """
+        try:
+            user, business_id = await self.get_line_business(line_user_id)
+            if not business_id:
+                return not_found
+
+            catalog = await inventory_service.get_catalog(business_id)
+            product = find_catalog_product(catalog, message)
+            if product:
+                products = [product]
+            else:
+                if catalog.mention_index is None:
+                    catalog.mention_index = build_product_index(catalog.active_products())
+                products = find_product_mentions(catalog.mention_index, message)
+            if not products:
+                return not_found
+
+            stocks = await inventory_service.get_stock_levels(business_id, [str(p.id) for p in products], user["id"])
+            lines = [stock_line(p, stocks[str(p.id)], quantity) for p in products]
+            return "📦 Current stock\n\n" + "\n".join(lines)
+
+        except Exception as e:
+            print(f"Error answering stock question: {e}")
+            return not_found
+
+    async def record_stock_movement(self, line_user_id, command, args):
+        """/in and /out: record a stock movement for a barcode or SKU"""
+        usage = f"Usage: {command} <barcode> <qty>"
+        if not 1 <= len(args) <= 2 or (len(args) == 2 and not args[1].isdigit()):
+            return usage
+        quantity = int(args[1]) if len(args) == 2 else 1
+        if quantity <= 0:
+            return usage
+
+        try:
+            user, business_id = await self.get_line_business(line_user_id)
+            if not business_id:
+                return NO_BUSINESS_MESSAGE
+
+            catalog = await inventory_service.get_catalog(business_id)
+            product = find_catalog_product(catalog, args[0])
+            if not product:
+                return f"🔍 No product with barcode or SKU {args[0]}"
+
+            stock_in = command == '/in'
+            transaction = await inventory_service.record_transaction(
+                TransactionCreate(
+                    business_id=business_id,
+                    product_id=product.id,
+                    user_id=user["id"],
+                    transaction_type="stock_in" if stock_in else "stock_out",
+                    quantity=quantity,
+                    reason="LINE chat"
+                ),
+                user["id"]
+            )
+
+            message = f"""✅ {"Stock in" if stock_in else "Stock out"}: {product.name}
 
-    def find_or_create_line_user(self, line_user_id):
+{"+" if stock_in else "-"}{quantity} {product.unit}
+Stock: {transaction.previous_stock} → {transaction.new_stock} {product.unit}"""
+            if not stock_in and transaction.previous_stock < quantity:
+                message += f"\n⚠️ Only {transaction.previous_stock} were in stock"
+            return message
+
+        except ValueError:
+            return "❌ You don't have access to record stock for this business."
+        except Exception as e:
+            print(f"Error recording stock movement: {e}")
+            return "❌ Could not record the movement. Please try again later."
+
+    async def list_products(self, line_user_id, page):
+        """/products [page]: active products with current stock, a page at a time"""
+        if not page.isdigit() or int(page) < 1:
+            return "Usage: /products [page]"
+        page = int(page)
+
+        try:
+            user, business_id = await self.get_line_business(line_user_id)
+            if not business_id:
+                return NO_BUSINESS_MESSAGE
+
+            catalog = await inventory_service.get_catalog(business_id)
+            products = sorted(catalog.active_products(), key=lambda p: (p.name.lower(), str(p.id)))
+            if not products:
+                return "🏷️ No products yet. Use /scan to add your first one!"
+
+            pages = (len(products) + PRODUCTS_PAGE_SIZE - 1) // PRODUCTS_PAGE_SIZE
+            page = min(page, pages)
+            start = (page - 1) * PRODUCTS_PAGE_SIZE
+            products = products[start:start + PRODUCTS_PAGE_SIZE]
+
+            stocks = await inventory_service.get_stock_levels(business_id, [str(p.id) for p in products], user["id"])
+            lines = [
+                f"{start + number}. {p.name}: {stocks[str(p.id)]} {p.unit}" + (f" ({p.barcode or p.sku})" if p.barcode or p.sku else "")
+                for number, p in enumerate(products, 1)
+            ]
+            message = f"🏷️ Products ({page}/{pages})\n\n" + "\n".join(lines)
+            if page < pages:
+                message += f"\n\nNext page: /products {page + 1}"
+            return message
+
+        except Exception as e:
+            print(f"Error listing products: {e}")
+            return "❌ Could not load products. Please try again later."
+
+    async def send_stock_alerts(self, business_id, alerts):
+        """Push one low-stock digest for a business to its owner and managers"""
+        recipients = await self.get_alert_recipients(business_id)
+        if not recipients:
+            return
+
+        catalog = await inventory_service.get_catalog(business_id)
+        lines = []
+        for alert in sorted(alerts, key=lambda alert: (alert.stock - alert.min_stock_level, alert.product_id)):
+            product = catalog.by_id.get(alert.product_id)
+            name = product.name if product else alert.product_id
+            if alert.out_of_stock:
+                lines.append(f"• {name}: out of stock")
+            else:
+                lines.append(f"• {name}: {alert.stock} {product.unit if product else ''} (min {alert.min_stock_level})")
+        if len(lines) > ALERT_DIGEST_MAX_LINES:
+            lines = lines[:ALERT_DIGEST_MAX_LINES] + [f"... and {len(lines) - ALERT_DIGEST_MAX_LINES} more"]
+
+        message = "⚠️ Low stock alert\n\n" + "\n".join(lines) + "\n\nRestock with /in <barcode> <qty>"
+        results = await asyncio.gather(*(self.messaging.push(to, text_message(message)) for to in recipients), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        if len(errors) == len(results):
+            raise errors[0]
+
+    async def get_alert_recipients(self, business_id):
+        """LINE user ids of the business owner and active managers and admins"""
+        business_id = str(business_id)
+        recipients = self._alert_recipients.get(business_id)
+        if recipients is None:
+            business, members = await asyncio.gather(
+                execute(self.supabase.table("businesses").select("owner_id").eq("id", business_id)),
+                execute(self.supabase.table("business_members").select("user_id, role, status").eq("business_id", business_id))
+            )
+            user_ids = {row["owner_id"] for row in business.data}
+            user_ids |= {
+                member["user_id"] for member in members.data
+                if member.get("status") in (None, "active") and ROLE_RANKS.get(member.get("role"), 0) >= ROLE_RANKS["manager"]
+            }
+
+            recipients = []
+            if user_ids:
+                users = await execute(self.supabase.table("users").select("line_user_id").in_("id", list(user_ids)))
+                recipients = sorted({user["line_user_id"] for user in users.data if user.get("line_user_id")})
+            self._alert_recipients.set(business_id, recipients)
+        return recipients
+
+    async def get_line_business(self, line_user_id):
+        """The LINE user's record and the business their chat commands act on (owned first)"""
+        user = await self.get_line_user(line_user_id)
+        if not user:
+            return None, None
+
+        roles = await access_control.get_roles(user["id"])
+        if not roles:
+            return user, None
+        business_id = min(roles, key=lambda business: (-ROLE_RANKS.get(roles[business], 0), business))
+        return user, business_id
+
+    async def get_line_user(self, line_user_id):
+        """Cached find-or-create; concurrent first messages from one user share one resolution"""
+        user = self._line_users.get(line_user_id)
+        if user is None:
+            user = await self._line_user_loads.do(line_user_id, lambda: self.find_or_create_line_user(line_user_id))
+            if user is not None:
+                self._line_users.set(line_user_id, user)
+        return user
+
+    def invalidate_line_user(self, line_user_id):
+        self._line_users.pop(line_user_id)
+
+    async def find_or_create_line_user(self, line_user_id):
         """Find or create user from LINE ID"""
         try:
             # Check if user exists
-            result = self.supabase.table("users").select("*").eq("line_user_id", line_user_id).execute()
+            result = await execute(self.supabase.table("users").select("*").eq("line_user_id", line_user_id))
 
             if result.data:
                 return result.data[0]
 
             # Get LINE profile
-            profile = self.line_bot_api.get_profile(line_user_id)
+            profile = await self.messaging.get_profile(line_user_id)
 
             # Create new user record
             user_data = {
                 "line_user_id": line_user_id,
-                "full_name": profile.display_name,
+                "full_name": profile.get("displayName"),
                 "email": f"{line_user_id}@line.temp",  # Temporary email
-                "avatar_url": profile.picture_url
+                "avatar_url": profile.get("pictureUrl")
             }
 
-            result = self.supabase.table("users").insert(user_data).execute()
+            try:
+                result = await execute(self.supabase.table("users").insert(user_data))
+            except Exception:
+                # Another worker process created the user first
+                result = await execute(self.supabase.table("users").select("*").eq("line_user_id", line_user_id))
             return result.data[0] if result.data else None
 
         except Exception as e:
             print(f"Error finding/creating user: {e}")
             return None
 
-    def get_user_status(self, line_user_id):
+    async def get_user_status(self, line_user_id):
         """Get user account status"""
         try:
-            result = self.supabase.table("users").select("""
-                *,
-                businesses (
-                    id,
-                    name,
-                    created_at
-                )
-            """).eq("line_user_id", line_user_id).execute()
-
-            if not result.data:
+            user = await self.get_line_user(line_user_id)
+
+            if not user:
                 return "❌ Account not found. Please use /help to get started."
 
-            user = result.data[0]
-            business_count = len(user.get('businesses', []))
+            summary = await status_summary.get_user_summary(user["id"])
+            last_activity = summary.last_activity_at.strftime("%Y-%m-%d %H:%M UTC") if summary.last_activity_at else "No activity yet"
 
             status_text = f"""✅ Account Status
 
 👤 Name: {user['full_name'] or 'Not set'}
 📧 Email: {user['email']}
-🏢 Businesses: {business_count}
+🏢 Businesses: {summary.business_count}
+🏷️ Products: {summary.product_count}
+⚠️ Low stock: {summary.low_stock_count}
+🕒 Last activity: {last_activity}
 
 Ready to manage your inventory! 🚀"""
 
@@ -134,4 +368,19 @@ Ready to manage your inventory! 🚀"""
             print(f"Error getting user status: {e}")
             return "❌ Could not check status. Please try again later."
 
+def find_catalog_product(catalog, term):
+    """Exact barcode or SKU match among active products"""
+    term = term.strip()
+    product = catalog.find_by_barcode(term) or catalog.find_by_sku(term) or catalog.find_by_sku(term.upper())
+    return product if product and product.is_active else None
+
+def stock_line(product, stock, quantity=None):
+    """One product's stock, checked against the asked quantity unless that is part of its name ("iphone 15")"""
+    line = f"• {product.name}: {stock} {product.unit}"
+    if not quantity or str(quantity) in (product.name or "").lower().split():
+        return line
+    if stock >= quantity:
+        return f"{line} ✅ enough for {quantity}"
+    return f"{line} ⚠️ {quantity - stock} short of {quantity}"
+
 line_bot_service = LineBotService()
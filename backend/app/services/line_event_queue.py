@@ -0,0 +1,114 @@
+# backend/app/services/line_event_queue.py
+import os
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class LineEventQueue:
+    """Bounded worker pool that processes LINE webhook events after the webhook has been acked.
+
+    Events are sharded onto one queue per worker by their source (user, group
+    or room), so events from the same source are handled in order while
+    different sources run concurrently.
+    """
+
+    def __init__(self, workers: int = 8, maxsize: int = 1000, enqueue_timeout: float = 1.0):
+        self.workers = workers
+        self.maxsize = maxsize
+        self.enqueue_timeout = enqueue_timeout
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.duplicates = 0
+        self._handler: Optional[Callable[[object], Awaitable[None]]] = None
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        # LINE redelivers a whole payload when we answer 503; skip what we already took
+        self._seen = TTLCache(maxsize=50000, ttl=3600, name="webhook_dedup")
+
+    def start(self, handler: Callable[[object], Awaitable[None]]) -> None:
+        if self._tasks:
+            return
+        self._handler = handler
+        self._queues = [asyncio.Queue(maxsize=self.maxsize) for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._work(queue)) for queue in self._queues]
+
+    async def stop(self, drain_timeout: float = 10.0) -> None:
+        """Let queued events finish (up to drain_timeout), then stop the workers"""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*(queue.join() for queue in self._queues)), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("LINE event queue stopped with %d events pending", self.depth())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, events) -> bool:
+        """Queue events for processing; False means the queue stayed full or isn't running (apply backpressure)"""
+        if not self._tasks:
+            # Before start() or after stop(): nothing would process the events
+            self.rejected += len(events)
+            return False
+        for event in events:
+            event_id = getattr(event, "webhook_event_id", None)
+            if event_id and event_id in self._seen:
+                self.duplicates += 1
+                continue
+
+            queue = self._queues[hash(self._source_key(event)) % len(self._queues)]
+            try:
+                await asyncio.wait_for(queue.put(event), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                return False
+
+            if event_id:
+                self._seen.set(event_id, True)
+        return True
+
+    @staticmethod
+    def _source_key(event) -> str:
+        source = getattr(event, "source", None)
+        for attribute in ("user_id", "group_id", "room_id"):
+            value = getattr(source, attribute, None)
+            if value:
+                return value
+        return ""
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            event = await queue.get()
+            try:
+                await self._handler(event)
+                self.processed += 1
+            except Exception:
+                self.failed += 1
+                logger.exception("Error handling LINE event")
+            finally:
+                queue.task_done()
+
+    def depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "depth": self.depth(),
+            "max_worker_depth": max((queue.qsize() for queue in self._queues), default=0),
+            "capacity": self.workers * self.maxsize,
+            "processed": self.processed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "duplicates": self.duplicates
+        }
+
+line_event_queue = LineEventQueue(
+    workers=int(os.getenv("LINE_EVENT_WORKERS", 8)),
+    maxsize=int(os.getenv("LINE_EVENT_QUEUE_SIZE", 1000))
+)
@@ -0,0 +1,189 @@
+# backend/app/services/line_messaging_client.py
+import os
+import time
+import uuid
+import random
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+from app.utils.metrics import observe_upstream
+
+# httpx is imported with the first call; it is slow to import and only the bot needs it
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+LINE_API_BASE_URL = os.getenv("LINE_API_BASE_URL", "https://api.line.me")
+
+# LINE accepts at most 5 message objects per reply/push call
+MAX_MESSAGES_PER_CALL = 5
+
+def text_message(text: str) -> dict:
+    return {"type": "text", "text": text}
+
+class LineApiError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"LINE API {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+    @property
+    def invalid_reply_token(self) -> bool:
+        # Expired or already used; other 400s are malformed requests
+        return self.status_code == 400 and "invalid reply token" in self.detail.lower()
+
+class TokenBucket:
+    """Async token bucket: `rate` calls per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class LineMessagingClient:
+    """Async LINE Messaging API client on one pooled keep-alive connection pool.
+
+    Calls are rate limited, retried with jittered exponential backoff on 429
+    and 5xx, and pushes to the same user within a short window are coalesced
+    into one multi-message call.
+    """
+
+    def __init__(
+        self,
+        access_token: Optional[str],
+        base_url: str = LINE_API_BASE_URL,
+        rate_limit: float = 1000.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.2,
+        coalesce_window: float = 0.05
+    ):
+        self.access_token = access_token
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.coalesce_window = coalesce_window
+        self.calls: Dict[str, int] = {}
+        self.retries = 0
+        self._limiter = TokenBucket(rate_limit, rate_limit)
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._pending: Dict[str, List[tuple]] = {}
+        self._flushes: Set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> "httpx.AsyncClient":
+        # Created on first use so it binds to the running event loop
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"Authorization": f"Bearer {self.access_token}"},
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=50),
+                timeout=httpx.Timeout(10.0)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, name: str, method: str, path: str, json: Optional[dict] = None, headers: Optional[dict] = None) -> "httpx.Response":
+        import httpx
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+        for attempt in range(self.max_retries + 1):
+            await self._limiter.acquire()
+            retry_after = None
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(method, path, json=json, headers=headers)
+            except httpx.TransportError as e:
+                observe_upstream("line", name, time.perf_counter() - started, "error")
+                if attempt == self.max_retries:
+                    raise LineApiError(0, str(e))
+            else:
+                observe_upstream("line", name, time.perf_counter() - started, "ok" if response.status_code < 400 else str(response.status_code))
+                if response.status_code < 400:
+                    return response
+                # 409 on a retried push means an earlier attempt was accepted
+                if response.status_code == 409 and headers and "X-Line-Retry-Key" in headers:
+                    return response
+                if (response.status_code != 429 and response.status_code < 500) or attempt == self.max_retries:
+                    raise LineApiError(response.status_code, response.text)
+                retry_after = response.headers.get("retry-after")
+
+            self.retries += 1
+            delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff_base * 2 ** attempt
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    async def reply(self, reply_token: str, messages: List[dict], fallback_to: Optional[str] = None) -> None:
+        """Reply to an event; if the reply token is no longer valid, push to `fallback_to` instead.
+
+        `fallback_to` is the event's source (user, group or room id). Messages
+        past the five a reply can carry are pushed to it after the reply.
+        """
+        first, rest = messages[:MAX_MESSAGES_PER_CALL], messages[MAX_MESSAGES_PER_CALL:]
+        try:
+            await self._request("reply", "POST", "/v2/bot/message/reply", json={"replyToken": reply_token, "messages": first})
+        except LineApiError as e:
+            if not e.invalid_reply_token or not fallback_to:
+                raise
+            rest = messages
+        if not rest:
+            return
+        if not fallback_to:
+            logger.warning("Dropped %d reply messages over LINE's limit of %d per call", len(rest), MAX_MESSAGES_PER_CALL)
+            return
+        await asyncio.gather(*(self.push(fallback_to, message) for message in rest))
+
+    async def push(self, to: str, message: dict) -> None:
+        """Push a message; pushes to the same recipient within the coalesce window share one call"""
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending.setdefault(to, [])
+        pending.append((message, future))
+        if len(pending) == 1:
+            asyncio.get_running_loop().call_later(self.coalesce_window, self._schedule_flush, to)
+        await future
+
+    def _schedule_flush(self, to: str) -> None:
+        task = asyncio.ensure_future(self._flush(to))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, to: str) -> None:
+        pending = self._pending.pop(to, [])
+        for start in range(0, len(pending), MAX_MESSAGES_PER_CALL):
+            group = pending[start:start + MAX_MESSAGES_PER_CALL]
+            try:
+                # One retry key per group lets LINE drop a retried push that already went through
+                await self._request(
+                    "push", "POST", "/v2/bot/message/push",
+                    json={"to": to, "messages": [message for message, _ in group]},
+                    headers={"X-Line-Retry-Key": str(uuid.uuid4())}
+                )
+            except Exception as e:
+                for _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, future in group:
+                    if not future.done():
+                        future.set_result(None)
+
+    async def get_profile(self, user_id: str) -> dict:
+        response = await self._request("profile", "GET", f"/v2/bot/profile/{user_id}")
+        return response.json()
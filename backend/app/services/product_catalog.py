@@ -0,0 +1,170 @@
+# backend/app/services/product_catalog.py
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+from app.models import Product
+from app.utils.cache import SingleFlight, register_cache
+
+def _index(index: Dict[str, List[Product]], key: str, product: Product) -> None:
+    products = index.setdefault(key, [])
+    products.append(product)
+    if len(products) > 1:
+        products.sort(key=lambda product: str(product.id))
+
+def _unindex(index: Dict[str, List[Product]], key: str, product: Product) -> None:
+    products = index.get(key)
+    if products is None:
+        return
+    products[:] = [other for other in products if other is not product]
+    if not products:
+        del index[key]
+
+class ProductCatalog:
+    """All products of one business, indexed by id, barcode and SKU"""
+
+    def __init__(self, business_id: str, products: List[Product]):
+        self.business_id = business_id
+        self.loaded_at = time.monotonic()
+        # Data version the catalog was loaded at (change_tracker.data_versions), if any
+        self.version: Optional[str] = None
+        self.by_id: Dict[str, Product] = {}
+        # Barcodes and SKUs can be shared; lookups return the lowest id, as the catalog loads
+        self.by_barcode: Dict[str, List[Product]] = {}
+        self.by_sku: Dict[str, List[Product]] = {}
+        # Built on demand by the LINE bot (intent_matcher.build_product_index)
+        self.mention_index = None
+        for product in products:
+            self.upsert(product)
+
+    def upsert(self, product: Product) -> None:
+        self.remove(str(product.id))
+        self.mention_index = None
+        self.by_id[str(product.id)] = product
+        if product.barcode:
+            _index(self.by_barcode, product.barcode, product)
+        if product.sku:
+            _index(self.by_sku, product.sku, product)
+
+    def remove(self, product_id: str) -> None:
+        product = self.by_id.pop(product_id, None)
+        if product is None:
+            return
+        self.mention_index = None
+        if product.barcode:
+            _unindex(self.by_barcode, product.barcode, product)
+        if product.sku:
+            _unindex(self.by_sku, product.sku, product)
+
+    def find_by_barcode(self, barcode: str) -> Optional[Product]:
+        products = self.by_barcode.get(barcode)
+        return products[0] if products else None
+
+    def find_by_sku(self, sku: str) -> Optional[Product]:
+        products = self.by_sku.get(sku)
+        return products[0] if products else None
+
+    def active_products(self) -> List[Product]:
+        return [product for product in self.by_id.values() if product.is_active]
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+class CatalogCache:
+    """LRU cache of per-business catalogs, capped by the total number of cached products.
+
+    Catalogs load lazily on first access and are patched in place by the
+    product write paths. The TTL bounds staleness from writes that bypass the
+    API (e.g. the web app writing to Supabase directly). Callers that need
+    the catalog at a known data version (ETag'd responses) pass it, and a
+    catalog loaded at another version is reloaded.
+    """
+
+    def __init__(self, max_products: int = 200_000, ttl: float = 600.0):
+        self.max_products = max_products
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._catalogs: "OrderedDict[str, ProductCatalog]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+
+    async def get(
+        self,
+        business_id,
+        load: Callable[[], Awaitable[List[Product]]],
+        version: Optional[str] = None,
+        max_age: Optional[float] = None
+    ) -> ProductCatalog:
+        """Return the business catalog, loading it once for concurrent callers on a miss.
+
+        `max_age` tightens the TTL for callers whose own results promise fresher data.
+        """
+        business_id = str(business_id)
+        ttl = self.ttl if max_age is None else min(self.ttl, max_age)
+        with self._lock:
+            catalog = self._catalogs.get(business_id)
+            if (catalog is not None and time.monotonic() - catalog.loaded_at < ttl
+                    and (version is None or catalog.version == version)):
+                self._catalogs.move_to_end(business_id)
+                self.hits += 1
+                return catalog
+            self.misses += 1
+
+        return await self._loads.do((business_id, version), lambda: self._load(business_id, load, version))
+
+    async def _load(self, business_id: str, load, version: Optional[str] = None) -> ProductCatalog:
+        generation = self._generations.get(business_id, 0)
+        catalog = ProductCatalog(business_id, await load())
+        catalog.version = version
+
+        with self._lock:
+            # A write landed while loading; serve this copy but don't keep it
+            if self._generations.get(business_id, 0) != generation:
+                return catalog
+            self._discard(business_id)
+            self._catalogs[business_id] = catalog
+            self._size += len(catalog)
+            self._evict()
+        return catalog
+
+    def _evict(self) -> None:
+        # Least recently used first, always keeping the most recent catalog
+        while self._size > self.max_products and len(self._catalogs) > 1:
+            self._discard(next(iter(self._catalogs)))
+
+    def _discard(self, business_id: str) -> None:
+        catalog = self._catalogs.pop(business_id, None)
+        if catalog is not None:
+            self._size -= len(catalog)
+
+    def product_changed(self, business_id, product: Product) -> None:
+        """Apply a created or updated product to a cached catalog"""
+        business_id = str(business_id)
+        with self._lock:
+            self._generations[business_id] = self._generations.get(business_id, 0) + 1
+            catalog = self._catalogs.get(business_id)
+            if catalog is not None:
+                self._size -= len(catalog)
+                catalog.upsert(product)
+                self._size += len(catalog)
+                self._evict()
+
+    def invalidate(self, business_id) -> None:
+        business_id = str(business_id)
+        with self._lock:
+            self._generations[business_id] = self._generations.get(business_id, 0) + 1
+            self._discard(business_id)
+
+    def __len__(self) -> int:
+        """Cached products across all catalogs"""
+        return self._size
+
+catalog_cache = CatalogCache(
+    max_products=int(os.getenv("CATALOG_CACHE_MAX_PRODUCTS", 200_000)),
+    ttl=float(os.getenv("CATALOG_CACHE_TTL_SECONDS", 600))
+)
+register_cache("catalog", catalog_cache)
@@ -0,0 +1,154 @@
+# backend/app/services/status_summary.py
+import os
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
+from app.models import UserStatusSummary
+from app.utils.cache import TTLCache, SingleFlight
+from app.utils.db import execute
+from app.utils.supabase_client import get_supabase_client
+from app.services.access_control import access_control
+from app.services.ledger import DEFAULT_LOCATION
+
+SUMMARY_PAGE_SIZE = 1000
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+@dataclass
+class BusinessSummary:
+    """Counters behind a business's status line, patched by the write paths"""
+    active_products: Set[str] = field(default_factory=set)
+    stocks: Dict[str, int] = field(default_factory=dict)
+    min_levels: Dict[str, int] = field(default_factory=dict)
+    low_stock: Set[str] = field(default_factory=set)
+    last_activity_at: Optional[datetime] = None
+    # Data version it was loaded at (change_tracker.data_versions), if any
+    version: Optional[str] = None
+
+    def refresh(self, product_id: str) -> None:
+        # Same rule as the dashboard: low when stock is at or below the minimum level
+        if product_id in self.active_products and self.stocks.get(product_id, 0) <= self.min_levels.get(product_id, 0):
+            self.low_stock.add(product_id)
+        else:
+            self.low_stock.discard(product_id)
+
+    def touch(self, at: Optional[datetime]) -> None:
+        if at and (self.last_activity_at is None or at > self.last_activity_at):
+            self.last_activity_at = at
+
+class StatusSummaryService:
+    """Per-user status (businesses, products, low stock, last activity) without a join per request.
+
+    Summaries are kept per business and built once on a miss; business,
+    product and transaction writes through the API update them in place. A
+    user's status adds up the summaries of the businesses they can access.
+    """
+
+    def __init__(self, ttl: float = 300.0, maxsize: int = 10000):
+        self._summaries = TTLCache(maxsize=maxsize, ttl=ttl, name="status_summaries")
+        self._generations: Dict[str, int] = {}
+        self._loads = SingleFlight()
+
+    @property
+    def supabase(self):
+        return get_supabase_client()
+
+    async def get_user_summary(self, user_id) -> UserStatusSummary:
+        roles = await access_control.get_roles(user_id)
+        summaries = await asyncio.gather(*(self.get_business_summary(business_id) for business_id in roles))
+        activity = [summary.last_activity_at for summary in summaries if summary.last_activity_at]
+        return UserStatusSummary(
+            business_count=len(summaries),
+            product_count=sum(len(summary.active_products) for summary in summaries),
+            low_stock_count=sum(len(summary.low_stock) for summary in summaries),
+            last_activity_at=max(activity, default=None)
+        )
+
+    async def get_business_summary(self, business_id, version: Optional[str] = None) -> BusinessSummary:
+        """The business's summary; with a data version, one loaded at another version is reloaded"""
+        business_id = str(business_id)
+        summary = self._summaries.get(business_id)
+        if summary is None or (version is not None and summary.version != version):
+            summary = await self._loads.do((business_id, version), lambda: self._load(business_id, version))
+        return summary
+
+    async def _load(self, business_id: str, version: Optional[str] = None) -> BusinessSummary:
+        generation = self._generations.get(business_id, 0)
+        products, inventory, latest = await asyncio.gather(
+            self._select_all("products", "id", business_id, is_active=True),
+            self._select_all("inventory", "id, product_id, current_stock, min_stock_level", business_id, location=DEFAULT_LOCATION),
+            execute(self.supabase.table("inventory_transactions").select("created_at").eq("business_id", business_id).order("created_at", desc=True).limit(1))
+        )
+
+        summary = BusinessSummary(active_products={row["id"] for row in products}, version=version)
+        # Only the default location's row, the one transactions move
+        for row in inventory:
+            summary.stocks[row["product_id"]] = row["current_stock"] or 0
+            summary.min_levels[row["product_id"]] = row["min_stock_level"] or 0
+        for product_id in summary.active_products:
+            summary.refresh(product_id)
+        if latest.data:
+            summary.touch(_parse_timestamp(latest.data[0]["created_at"]))
+
+        # A write landed while loading; serve this copy but don't keep it
+        if self._generations.get(business_id, 0) == generation:
+            self._summaries.set(business_id, summary)
+        return summary
+
+    async def _select_all(self, table: str, columns: str, business_id: str, **filters) -> list:
+        rows = []
+        last_id = None
+        while True:
+            query = self.supabase.table(table).select(columns).eq("business_id", business_id)
+            for column, value in filters.items():
+                query = query.eq(column, value)
+            if last_id:
+                query = query.gt("id", last_id)
+            result = await execute(query.order("id").limit(SUMMARY_PAGE_SIZE))
+            rows.extend(result.data)
+            if len(result.data) < SUMMARY_PAGE_SIZE:
+                return rows
+            last_id = result.data[-1]["id"]
+
+    def _changed(self, business_id) -> Optional[BusinessSummary]:
+        business_id = str(business_id)
+        self._generations[business_id] = self._generations.get(business_id, 0) + 1
+        return self._summaries.get(business_id)
+
+    def business_created(self, business_id) -> None:
+        self._changed(business_id)
+        self._summaries.set(str(business_id), BusinessSummary(last_activity_at=datetime.now(timezone.utc)))
+
+    def product_changed(self, business_id, product) -> None:
+        summary = self._changed(business_id)
+        if summary is None:
+            return
+        product_id = str(product.id)
+        if product.is_active:
+            summary.active_products.add(product_id)
+        else:
+            summary.active_products.discard(product_id)
+        summary.refresh(product_id)
+        summary.touch(_parse_timestamp(product.updated_at))
+
+    def stock_changed(self, business_id, product_id, new_stock: int, at=None) -> None:
+        summary = self._changed(business_id)
+        if summary is None:
+            return
+        product_id = str(product_id)
+        summary.stocks[product_id] = new_stock
+        summary.refresh(product_id)
+        summary.touch(_parse_timestamp(at) or datetime.now(timezone.utc))
+
+    def invalidate_business(self, business_id) -> None:
+        self._changed(business_id)
+        self._summaries.pop(str(business_id))
+
+status_summary = StatusSummaryService(
+    ttl=float(os.getenv("STATUS_SUMMARY_TTL_SECONDS", 300)),
+    maxsize=int(os.getenv("STATUS_SUMMARY_CACHE_SIZE", 10000))
+)
@@ -0,0 +1,128 @@
+# backend/app/services/stock_alerts.py
+import os
+import math
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from app.services.status_summary import status_summary
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StockAlert:
+    product_id: str
+    stock: int
+    min_stock_level: int
+
+    @property
+    def out_of_stock(self) -> bool:
+        return self.stock <= 0
+
+class StockAlertEngine:
+    """Low-stock alerts evaluated on each stock change instead of by polling inventory.
+
+    A product alerts when a movement takes it from above its min_stock_level
+    to at or below it. It stays quiet until stock climbs back above the
+    minimum plus a hysteresis band, so stock hovering at the threshold
+    doesn't alert on every movement. Alerts are debounced per business and
+    handed to the deliverer as one digest.
+    """
+
+    def __init__(self, debounce_seconds: float = 30.0, hysteresis_ratio: float = 0.1):
+        self.debounce_seconds = debounce_seconds
+        self.hysteresis_ratio = hysteresis_ratio
+        self.fired = 0
+        self.suppressed = 0
+        self.digests = 0
+        self.failed = 0
+        self._deliver: Optional[Callable[[str, List[StockAlert]], Awaitable[None]]] = None
+        self._changes: Dict[str, List[Tuple[str, int, int]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._alerted: Dict[str, Set[str]] = {}
+        self._flushes: Set[asyncio.Task] = set()
+
+    def start(self, deliver: Callable[[str, List[StockAlert]], Awaitable[None]]) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        """Evaluate and deliver whatever is still waiting out its debounce"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        await asyncio.gather(*(self._flush(business_id) for business_id in list(self._changes)), *list(self._flushes), return_exceptions=True)
+        self._deliver = None
+
+    def stock_changed(self, business_id, product_id, previous_stock: int, new_stock: int) -> None:
+        """Queue a committed movement; evaluated against thresholds when the business's debounce ends"""
+        if self._deliver is None:
+            return
+        business_id, product_id = str(business_id), str(product_id)
+        # Stock going up only matters for re-arming a product, or cancelling a pending alert
+        if new_stock >= previous_stock and business_id not in self._changes and product_id not in self._alerted.get(business_id, ()):
+            return
+
+        self._changes.setdefault(business_id, []).append((product_id, previous_stock, new_stock))
+        if business_id not in self._timers:
+            self._timers[business_id] = asyncio.get_running_loop().call_later(self.debounce_seconds, self._schedule_flush, business_id)
+
+    def _band(self, min_stock_level: int) -> int:
+        return max(1, math.ceil(min_stock_level * self.hysteresis_ratio))
+
+    def _schedule_flush(self, business_id: str) -> None:
+        task = asyncio.ensure_future(self._flush(business_id))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, business_id: str) -> None:
+        self._timers.pop(business_id, None)
+        changes = self._changes.pop(business_id, [])
+        if not changes or self._deliver is None:
+            return
+
+        try:
+            # Thresholds come from the cached per-business summary (inventory.min_stock_level)
+            summary = await status_summary.get_business_summary(business_id)
+            alerted = self._alerted.setdefault(business_id, set())
+            alerts: Dict[str, StockAlert] = {}
+            for product_id, previous_stock, new_stock in changes:
+                if product_id not in summary.active_products:
+                    continue
+                min_stock_level = summary.min_levels.get(product_id, 0)
+                if new_stock > min_stock_level + self._band(min_stock_level):
+                    # Restocked: re-arm, and drop an alert that hasn't gone out yet
+                    alerted.discard(product_id)
+                    alerts.pop(product_id, None)
+                elif new_stock > min_stock_level:
+                    continue
+                elif product_id in alerts:
+                    alerts[product_id].stock = new_stock
+                elif product_id in alerted:
+                    self.suppressed += 1
+                elif previous_stock > min_stock_level:
+                    alerts[product_id] = StockAlert(product_id, new_stock, min_stock_level)
+
+            if alerts:
+                await self._deliver(business_id, list(alerts.values()))
+                # Only a delivered alert suppresses the next one; a failed digest
+                # leaves its products armed for the next drop below the minimum
+                alerted.update(alerts)
+                self.fired += len(alerts)
+                self.digests += 1
+        except Exception as e:
+            self.failed += 1
+            logger.exception("Stock alert digest for business %s failed: %s", business_id, e)
+
+    def stats(self) -> dict:
+        return {
+            "pending_businesses": len(self._changes),
+            "fired": self.fired,
+            "suppressed": self.suppressed,
+            "digests": self.digests,
+            "failed": self.failed
+        }
+
+stock_alerts = StockAlertEngine(
+    debounce_seconds=float(os.getenv("STOCK_ALERT_DEBOUNCE_SECONDS", 30)),
+    hysteresis_ratio=float(os.getenv("STOCK_ALERT_HYSTERESIS_RATIO", 0.1))
+)
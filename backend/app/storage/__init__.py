@@ -0,0 +1,44 @@
+# backend/app/storage/__init__.py
+import os
+from typing import Optional
+from app.storage.base import StorageBackend
+
+# "supabase" (PostgREST, the default) or "postgres" (direct, needs DATABASE_URL)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase")
+
+_storage: Optional[StorageBackend] = None
+
+def create_storage(backend: str = STORAGE_BACKEND) -> StorageBackend:
+    if backend == "supabase":
+        from app.storage.supabase_backend import SupabaseStorage
+        from app.utils.supabase_client import get_supabase_client
+        return SupabaseStorage(get_supabase_client())
+    if backend == "postgres":
+        from app.storage.postgres_backend import PostgresStorage
+        dsn = os.getenv("DATABASE_URL")
+        if not dsn:
+            raise ValueError("STORAGE_BACKEND=postgres needs DATABASE_URL")
+        return PostgresStorage(
+            dsn,
+            min_size=int(os.getenv("POSTGRES_POOL_MIN_SIZE", 1)),
+            max_size=int(os.getenv("POSTGRES_POOL_MAX_SIZE", 10)),
+            statement_cache_size=int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", 100))
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND {backend!r}")
+
+def get_storage() -> StorageBackend:
+    """The configured backend, created on first use"""
+    global _storage
+    if _storage is None:
+        _storage = create_storage()
+    return _storage
+
+def set_storage(storage: Optional[StorageBackend]) -> None:
+    global _storage
+    _storage = storage
+
+async def close_storage() -> None:
+    if _storage is not None:
+        await _storage.close()
+
+__all__ = ["StorageBackend", "STORAGE_BACKEND", "create_storage", "get_storage", "set_storage", "close_storage"]
@@ -0,0 +1,39 @@
+# backend/app/storage/base.py
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from app.services.ledger import DEFAULT_LOCATION
+
+class StorageBackend(ABC):
+    """The hot queries of the services, behind one interface so they can skip PostgREST.
+
+    Rows come back as plain dicts shaped like PostgREST returns them, with ids
+    as strings. Everything else still goes through the Supabase client.
+    """
+
+    name = "base"
+
+    async def warm_up(self) -> None:
+        """Open connections ahead of the first query"""
+
+    async def close(self) -> None:
+        """Release connections; the backend reconnects on next use"""
+
+    @abstractmethod
+    async def get_business_grants(self, user_id: str) -> Tuple[List[str], List[Dict]]:
+        """Ids of the businesses the user owns, and their business_members rows (business_id, role, status)"""
+
+    @abstractmethod
+    async def list_products(self, business_id: str) -> List[Dict]:
+        """Every product row of a business, active or not, ordered by id"""
+
+    @abstractmethod
+    async def read_stocks(self, business_id: str, product_ids: List[str], location: str = DEFAULT_LOCATION) -> List[Dict]:
+        """Inventory rows (business_id, product_id, current_stock) of the business's products at one location"""
+
+    @abstractmethod
+    async def record_transaction(self, params: Dict) -> Optional[Dict]:
+        """Run record_inventory_transaction with its p_* parameters and return the ledger row"""
+
+    @abstractmethod
+    async def apply_batch(self, transactions: List[Dict]) -> None:
+        """Run apply_inventory_batch on one chunk of chained ledger rows; raises on stock_conflict"""
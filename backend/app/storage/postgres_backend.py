@@ -0,0 +1,124 @@
+# backend/app/storage/postgres_backend.py
+import json
+import asyncio
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from app.services.ledger import DEFAULT_LOCATION
+from app.storage.base import StorageBackend
+from app.utils.metrics import track_upstream
+
+GRANTS_SQL = """
+    select id::text as business_id, 'owner' as role, null::text as status, true as owned
+      from businesses where owner_id = $1::uuid
+    union all
+    select business_id::text, role, status, false
+      from business_members where user_id = $1::uuid
+"""
+PRODUCTS_SQL = "select * from products where business_id = $1::uuid order by id"
+STOCKS_SQL = """
+    select business_id::text, product_id::text, current_stock
+      from inventory
+     where business_id = $1::uuid and location = $2 and product_id = any($3::uuid[])
+"""
+RECORD_TRANSACTION_PARAMS = (
+    "p_business_id", "p_product_id", "p_user_id", "p_transaction_type", "p_quantity",
+    "p_unit_cost", "p_reason", "p_notes", "p_reference_number", "p_metadata"
+)
+RECORD_TRANSACTION_SQL = """
+    select * from record_inventory_transaction(
+        $1::uuid, $2::uuid, $3::uuid, $4::text, $5::integer, $6::numeric, $7::text, $8::text, $9::text, $10::jsonb
+    )
+"""
+APPLY_BATCH_SQL = "select apply_inventory_batch($1::jsonb)"
+
+def _row(record) -> Dict:
+    # Ids as strings, like PostgREST returns them
+    return {key: str(value) if isinstance(value, UUID) else value for key, value in record.items()}
+
+async def _init_connection(connection) -> None:
+    for codec in ("json", "jsonb"):
+        await connection.set_type_codec(codec, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+class PostgresStorage(StorageBackend):
+    """The hot queries straight over the Postgres protocol on an asyncpg pool.
+
+    asyncpg prepares each statement once per connection and reuses it from
+    its statement cache, so the hot queries skip parsing and planning after
+    the first call. Behind a transaction-mode pooler (Supabase port 6543)
+    prepared statements don't survive; connect directly or set
+    statement_cache_size to 0.
+    """
+
+    name = "postgres"
+
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10, statement_cache_size: int = 100):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.statement_cache_size = statement_cache_size
+        self._pool = None
+        self._lock = asyncio.Lock()
+
+    async def pool(self):
+        """The connection pool, opened on first use (asyncpg is only imported then)"""
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    try:
+                        import asyncpg
+                    except ImportError as e:
+                        raise RuntimeError("STORAGE_BACKEND=postgres needs the asyncpg package") from e
+                    self._pool = await asyncpg.create_pool(
+                        self.dsn,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        statement_cache_size=self.statement_cache_size,
+                        init=_init_connection
+                    )
+        return self._pool
+
+    async def warm_up(self) -> None:
+        await self.pool()
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.close()
+
+    async def get_business_grants(self, user_id: str) -> Tuple[List[str], List[Dict]]:
+        pool = await self.pool()
+        with track_upstream("postgres", "business_grants.select"):
+            rows = await pool.fetch(GRANTS_SQL, user_id)
+        owned = [row["business_id"] for row in rows if row["owned"]]
+        memberships = [{"business_id": row["business_id"], "role": row["role"], "status": row["status"]} for row in rows if not row["owned"]]
+        return owned, memberships
+
+    async def list_products(self, business_id: str) -> List[Dict]:
+        pool = await self.pool()
+        with track_upstream("postgres", "products.select"):
+            records = await pool.fetch(PRODUCTS_SQL, str(business_id))
+        return [_row(record) for record in records]
+
+    async def read_stocks(self, business_id: str, product_ids: List[str], location: str = DEFAULT_LOCATION) -> List[Dict]:
+        if not product_ids:
+            return []
+        pool = await self.pool()
+        with track_upstream("postgres", "inventory.select"):
+            records = await pool.fetch(STOCKS_SQL, str(business_id), location, [str(product_id) for product_id in product_ids])
+        return [dict(record) for record in records]
+
+    async def record_transaction(self, params: Dict) -> Optional[Dict]:
+        values = [params.get(name) for name in RECORD_TRANSACTION_PARAMS]
+        # The API hands over JSON-mode values; numeric wants a Decimal
+        if values[5] is not None:
+            values[5] = Decimal(str(values[5]))
+        pool = await self.pool()
+        with track_upstream("postgres", "rpc.record_inventory_transaction"):
+            record = await pool.fetchrow(RECORD_TRANSACTION_SQL, *values)
+        return _row(record) if record else None
+
+    async def apply_batch(self, transactions: List[Dict]) -> None:
+        pool = await self.pool()
+        with track_upstream("postgres", "rpc.apply_inventory_batch"):
+            await pool.fetchval(APPLY_BATCH_SQL, transactions)
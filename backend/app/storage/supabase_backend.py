@@ -0,0 +1,56 @@
+# backend/app/storage/supabase_backend.py
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from app.services.ledger import DEFAULT_LOCATION
+from app.storage.base import StorageBackend
+from app.utils.db import execute
+
+# Supabase caps responses at 1000 rows; ids per in.() filter keep the URL short
+PAGE_SIZE = 1000
+IN_FILTER_CHUNK_SIZE = 200
+
+class SupabaseStorage(StorageBackend):
+    """The hot queries over PostgREST with the shared Supabase client"""
+
+    name = "supabase"
+
+    def __init__(self, client):
+        self.supabase = client
+
+    async def get_business_grants(self, user_id: str) -> Tuple[List[str], List[Dict]]:
+        owned, memberships = await asyncio.gather(
+            execute(self.supabase.table("businesses").select("id").eq("owner_id", user_id)),
+            execute(self.supabase.table("business_members").select("business_id, role, status").eq("user_id", user_id))
+        )
+        return [row["id"] for row in owned.data], memberships.data
+
+    async def list_products(self, business_id: str) -> List[Dict]:
+        rows: List[Dict] = []
+        last_id = None
+        while True:
+            query = self.supabase.table("products").select("*").eq("business_id", business_id).order("id").limit(PAGE_SIZE)
+            if last_id:
+                query = query.gt("id", last_id)
+            result = await execute(query)
+            rows.extend(result.data)
+            if len(result.data) < PAGE_SIZE:
+                return rows
+            last_id = result.data[-1]["id"]
+
+    async def read_stocks(self, business_id: str, product_ids: List[str], location: str = DEFAULT_LOCATION) -> List[Dict]:
+        rows: List[Dict] = []
+        for start in range(0, len(product_ids), IN_FILTER_CHUNK_SIZE):
+            ids = product_ids[start:start + IN_FILTER_CHUNK_SIZE]
+            result = await execute(
+                self.supabase.table("inventory").select("business_id, product_id, current_stock")
+                .eq("business_id", business_id).eq("location", location).in_("product_id", ids)
+            )
+            rows.extend(result.data)
+        return rows
+
+    async def record_transaction(self, params: Dict) -> Optional[Dict]:
+        result = await execute(self.supabase.rpc("record_inventory_transaction", params))
+        return result.data[0] if result.data else None
+
+    async def apply_batch(self, transactions: List[Dict]) -> None:
+        await execute(self.supabase.rpc("apply_inventory_batch", {"p_transactions": transactions}))
@@ -1,36 +1,126 @@
 # backend/app/utils/auth.py
+import os
+import time
+import hashlib
+from typing import Optional
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.models import User
+from app.utils.cache import TTLCache
 from app.utils.supabase_client import get_supabase_client
-import jwt
+from app.utils.db import execute, run_sync
+from app.utils.metrics import track_upstream
 
 security = HTTPBearer()
-supabase = get_supabase_client()
+
+# Legacy Supabase projects sign access tokens with the shared HS256 secret;
+# newer ones use asymmetric keys published on the project's JWKS endpoint.
+JWT_SECRET = os.environ.get("SUPABASE_JWT_SECRET")
+JWT_AUDIENCE = os.environ.get("SUPABASE_JWT_AUDIENCE", "authenticated")
+JWT_LEEWAY_SECONDS = 30
+# Algorithms a JWKS key may verify with; the token header never picks one
+JWKS_ALGORITHMS = ("RS256", "RS384", "RS512", "PS256", "ES256", "ES384", "ES512", "EdDSA")
+
+_supabase_url = os.environ.get("SUPABASE_URL")
+_jwks_client = None
+
+# Resolved profiles keyed by user id, and remotely verified tokens keyed by digest.
+# Profiles are edited outside this service (dashboard, Supabase Auth), so a
+# change shows up once the cached copy expires.
+_profile_cache = TTLCache(maxsize=int(os.getenv("USER_PROFILE_CACHE_SIZE", 10000)), ttl=300, name="user_profiles")
+_token_cache = TTLCache(maxsize=10000, ttl=60, name="tokens")
+
+def _get_jwks_client():
+    """The project's JWKS client, built on first use (PyJWT pulls in cryptography, which is slow to import)"""
+    global _jwks_client
+    if _jwks_client is None and _supabase_url:
+        import jwt
+        _jwks_client = jwt.PyJWKClient(f"{_supabase_url}/auth/v1/.well-known/jwks.json", cache_keys=True)
+    return _jwks_client
+
+def verify_token_locally(token: str) -> Optional[dict]:
+    """Verify signature and expiry of a Supabase access token without a network call.
+
+    Returns the token claims, or None when no local key material is configured
+    for the token's algorithm.
+    """
+    import jwt
+    algorithm = jwt.get_unverified_header(token).get("alg")
+
+    if algorithm == "HS256":
+        if not JWT_SECRET:
+            return None
+        key, algorithms = JWT_SECRET, ["HS256"]
+    elif _get_jwks_client() is not None:
+        signing_key = _jwks_client.get_signing_key_from_jwt(token)
+        # The key's algorithm, not the header's, so a public key is never used as an HMAC secret
+        if signing_key.algorithm_name not in JWKS_ALGORITHMS:
+            raise jwt.InvalidAlgorithmError(f"Unsupported signing key algorithm {signing_key.algorithm_name}")
+        key, algorithms = signing_key.key, [signing_key.algorithm_name]
+    else:
+        return None
+
+    return jwt.decode(
+        token,
+        key,
+        algorithms=algorithms,
+        audience=JWT_AUDIENCE,
+        leeway=JWT_LEEWAY_SECONDS,
+        options={"require": ["exp", "sub"]}
+    )
+
+async def verify_token_remotely(token: str) -> str:
+    """Verify token with Supabase Auth, remembering the result until the token expires"""
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    user_id = _token_cache.get(digest)
+    if user_id:
+        return user_id
+
+    with track_upstream("supabase", "auth.get_user"):
+        user_response = await run_sync(get_supabase_client().auth.get_user, token)
+
+    if user_response.user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token"
+        )
+
+    import jwt
+    expires_at = jwt.decode(token, options={"verify_signature": False}).get("exp", 0)
+    ttl = min(_token_cache.ttl, expires_at - time.time())
+    if ttl > 0:
+        _token_cache.set(digest, user_response.user.id, ttl=ttl)
+
+    return user_response.user.id
+
+async def get_user_profile(user_id: str) -> User:
+    """Get a user profile from the cache, loading it from the users table on a miss"""
+    profile = _profile_cache.get(user_id)
+    if profile is not None:
+        return profile
+
+    user_profile = await execute(get_supabase_client().table("users").select("*").eq("id", user_id).single())
+
+    if not user_profile.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User profile not found"
+        )
+
+    # Rows come straight from our own table, so skip re-validation
+    profile = User.model_construct(**user_profile.data)
+    _profile_cache.set(user_id, profile)
+    return profile
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Get current authenticated user from JWT token"""
     try:
         token = credentials.credentials
 
-        # Verify token with Supabase
-        user_response = supabase.auth.get_user(token)
-
-        if user_response.user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication token"
-            )
-
-        # Get user profile from our users table
-        user_profile = supabase.table("users").select("*").eq("id", user_response.user.id).single().execute()
-
-        if not user_profile.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User profile not found"
-            )
+        claims = verify_token_locally(token)
+        user_id = claims["sub"] if claims else await verify_token_remotely(token)
 
-        return user_profile.data
+        return await get_user_profile(user_id)
 
     except Exception as e:
         raise HTTPException(
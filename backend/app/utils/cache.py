@@ -0,0 +1,108 @@
+# backend/app/utils/cache.py
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+# Named caches by name, so their hit ratios can be exported
+CACHES: Dict[str, Any] = {}
+
+def register_cache(name: str, cache: Any) -> None:
+    """Track a cache exposing `hits`, `misses` and `len()` under `name`"""
+    CACHES[name] = cache
+
+class TTLCache:
+    """Bounded in-process cache with per-entry expiry and LRU eviction.
+
+    `on_evict(key, value)` is called for every entry that leaves the cache
+    (expired, evicted, replaced or popped), after the cache lock is released.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        name: Optional[str] = None,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        if name:
+            register_cache(name, self)
+
+    def _evicted(self, entries) -> None:
+        if self.on_evict is not None:
+            for key, value in entries:
+                self.on_evict(key, value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry and mark it as recently used"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and entry[1] >= time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+        if entry is not _MISSING:
+            self._evicted([(key, entry[0])])
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry, evicting the least recently used one when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        evicted = []
+        with self._lock:
+            previous = self._data.get(key, _MISSING)
+            if previous is not _MISSING:
+                evicted.append((key, previous[0]))
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                old_key, old_entry = self._data.popitem(last=False)
+                evicted.append((old_key, old_entry[0]))
+        self._evicted(evicted)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry (explicit invalidation)"""
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        self._evicted([(key, entry[0])])
+        return entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class SingleFlight:
+    """Collapse concurrent loads of the same key into one in-flight call"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(load())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A cancelled waiter must not cancel the load for everyone else
+        return await asyncio.shield(future)
@@ -0,0 +1,34 @@
+# backend/app/utils/db.py
+import os
+import time
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from app.utils.metrics import supabase_target, track_upstream
+from app.utils.query_log import RequestQueries, current_queries, log_query
+
+# The Supabase client is synchronous but shares one pooled keep-alive httpx
+# session, so queries are offloaded to a dedicated thread pool sized to that
+# pool instead of running on (and blocking) the event loop.
+SUPABASE_MAX_WORKERS = int(os.getenv("SUPABASE_MAX_WORKERS", 32))
+
+_executor = ThreadPoolExecutor(max_workers=SUPABASE_MAX_WORKERS, thread_name_prefix="supabase")
+
+async def run_sync(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call on the upstream thread pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+def _execute(query, queries: Optional[RequestQueries]) -> Any:
+    target = supabase_target(query)
+    with track_upstream("supabase", target):
+        started = time.perf_counter()
+        result = query.execute()
+    log_query(queries, "supabase", target, query, result.data, time.perf_counter() - started)
+    return result
+
+async def execute(query) -> Any:
+    """Execute a Supabase query builder off the event loop"""
+    # Worker threads don't see the request's context, so its query log is handed over
+    return await run_sync(_execute, query, current_queries())
@@ -0,0 +1,26 @@
+# backend/app/utils/etag.py
+import hashlib
+from fastapi import Request, Response
+
+# Clients may keep responses but must revalidate, which a matching ETag makes cheap
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match already names this version"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,184 @@
+# backend/app/utils/metrics.py
+import os
+import time
+import asyncio
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # metrics are optional; everything below turns into a no-op
+    REGISTRY = None
+
+from app.utils.cache import CACHES
+
+METRICS_ENABLED = REGISTRY is not None and os.getenv("METRICS_ENABLED", "true").lower() != "false"
+LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", 0.5))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+if METRICS_ENABLED:
+    REQUEST_LATENCY = Histogram(
+        "http_request_duration_seconds", "Request latency by route template and status",
+        ["method", "route", "status"], buckets=LATENCY_BUCKETS
+    )
+    IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being handled", ["method"])
+    UPSTREAM_CALLS = Counter("upstream_requests_total", "Calls to upstream services", ["service", "target", "outcome"])
+    UPSTREAM_LATENCY = Histogram(
+        "upstream_request_duration_seconds", "Upstream call latency by service and target",
+        ["service", "target"], buckets=LATENCY_BUCKETS
+    )
+    LOOP_LAG = Gauge("event_loop_lag_seconds", "How late the last event loop lag probe woke up")
+    LOOP_LAG_OBSERVED = Histogram("event_loop_lag_observed_seconds", "Event loop lag probes", buckets=LAG_BUCKETS)
+
+# Labelled children, looked up once per label set instead of on every observation
+_request_children: Dict[Tuple[str, str, str], object] = {}
+_in_flight_children: Dict[str, object] = {}
+_upstream_children: Dict[Tuple[str, str, str], tuple] = {}
+
+def observe_upstream(service: str, target: str, seconds: float, outcome: str = "ok") -> None:
+    """Record one upstream call, e.g. ("supabase", "products.select") or ("line", "push")"""
+    if not METRICS_ENABLED:
+        return
+    key = (service, target, outcome)
+    children = _upstream_children.get(key)
+    if children is None:
+        children = _upstream_children[key] = (UPSTREAM_CALLS.labels(*key), UPSTREAM_LATENCY.labels(service, target))
+    children[0].inc()
+    children[1].observe(seconds)
+
+@contextmanager
+def track_upstream(service: str, target: str):
+    """Time the enclosed upstream call; an exception counts it as an error"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        observe_upstream(service, target, time.perf_counter() - started, outcome)
+
+SUPABASE_OPERATIONS = {"GET": "select", "HEAD": "select", "POST": "insert", "PATCH": "update", "PUT": "upsert", "DELETE": "delete"}
+
+def supabase_target(query) -> str:
+    """"table.operation" or "rpc.function" for a PostgREST query builder"""
+    request = getattr(query, "request", None)
+    if request is None:
+        return "unknown"
+    path = str(request.path).rsplit("/rest/v1/", 1)[-1]
+    if path.startswith("rpc/"):
+        return path.replace("/", ".", 1)
+    method = str(getattr(request.http_method, "value", request.http_method))
+    return f"{path}.{SUPABASE_OPERATIONS.get(method, method.lower())}"
+
+def route_template(scope) -> str:
+    """The matched route's path template; raw paths would make the label set unbounded"""
+    # Routes from included routers carry their path without the include prefix;
+    # FastAPI keeps the full one on the effective route context
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by route template, method and status"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        in_flight = _in_flight_children.get(method)
+        if in_flight is None:
+            in_flight = _in_flight_children[method] = IN_FLIGHT.labels(method)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            key = (method, route_template(scope), str(status))
+            child = _request_children.get(key)
+            if child is None:
+                child = _request_children[key] = REQUEST_LATENCY.labels(*key)
+            child.observe(elapsed)
+
+class _StatsCollector:
+    """Numeric entries of a stats() dict (e.g. the webhook queue's), read at scrape time"""
+
+    def __init__(self, prefix: str, stats: Callable[[], dict]):
+        self.prefix = prefix
+        self.stats = stats
+
+    def collect(self):
+        for key, value in self.stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield GaugeMetricFamily(f"{self.prefix}_{key}", f"{self.prefix} {key.replace('_', ' ')}", value=value)
+
+class _CacheCollector:
+    """Hits, misses, hit ratio and size of every named in-process cache"""
+
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "Cache lookups answered from the cache", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache lookups that had to load", labels=["cache"])
+        ratio = GaugeMetricFamily("cache_hit_ratio", "Share of lookups answered from the cache since start", labels=["cache"])
+        entries = GaugeMetricFamily("cache_entries", "Entries currently cached", labels=["cache"])
+        for name, cache in list(CACHES.items()):
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+            lookups = cache.hits + cache.misses
+            ratio.add_metric([name], cache.hits / lookups if lookups else 0.0)
+            entries.add_metric([name], len(cache))
+        yield from (hits, misses, ratio, entries)
+
+if METRICS_ENABLED:
+    REGISTRY.register(_CacheCollector())
+
+def register_stats(prefix: str, stats: Callable[[], dict]) -> None:
+    """Expose a component's stats() dict as gauges named `{prefix}_{key}`"""
+    if METRICS_ENABLED:
+        REGISTRY.register(_StatsCollector(prefix, stats))
+
+def render_metrics() -> Tuple[bytes, str]:
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+class LoopLagMonitor:
+    """Samples how late the event loop runs a sleeping task, which is how long it was blocked"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if METRICS_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            LOOP_LAG.set(lag)
+            LOOP_LAG_OBSERVED.observe(lag)
+
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,143 @@
+# backend/app/utils/query_log.py
+import os
+import json
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+from urllib.parse import unquote
+from app.utils.metrics import route_template
+from app.utils.responses import dumps
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+QUERY_LOG_ENABLED = os.getenv("QUERY_LOG_ENABLED", "true").lower() != "false"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 250))
+# More upstream calls than this in one request gets it flagged
+MAX_UPSTREAM_CALLS = int(os.getenv("MAX_UPSTREAM_CALLS_PER_REQUEST", 3))
+# Per-request summary header, only when ENVIRONMENT=development
+QUERY_SUMMARY_HEADER = os.getenv("ENVIRONMENT") == "development"
+SUMMARY_HEADER_NAME = b"x-upstream-queries"
+# Long in.() filters are cut short in log lines
+MAX_LOGGED_FILTER_LENGTH = 300
+
+@dataclass
+class QueryRecord:
+    service: str
+    target: str
+    filters: str
+    rows: int
+    bytes_sent: int
+    # Measured by re-encoding the result, so only for slow queries and the summary header
+    bytes_received: Optional[int]
+    duration_ms: float
+    # Identical target, filters and payload means the very same query
+    fingerprint: Tuple = field(repr=False, default=())
+
+class RequestQueries:
+    """Upstream queries issued while handling one request"""
+
+    def __init__(self, request: str):
+        self.request = request
+        self.records: List[QueryRecord] = []
+
+    def add(self, record: QueryRecord) -> None:
+        self.records.append(record)
+
+    def repeated(self) -> List[Tuple[QueryRecord, int]]:
+        """Queries issued more than once, with how often"""
+        counts = Counter(record.fingerprint for record in self.records)
+        first = {}
+        for record in self.records:
+            first.setdefault(record.fingerprint, record)
+        return [(first[fingerprint], count) for fingerprint, count in counts.items() if count > 1]
+
+    def summary(self) -> str:
+        total_ms = sum(record.duration_ms for record in self.records)
+        received = sum(record.bytes_received or 0 for record in self.records)
+        return f"calls={len(self.records)}; time={total_ms:.1f}ms; bytes={received}; repeated={len(self.repeated())}"
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+def current_queries() -> Optional[RequestQueries]:
+    """The query log of the request being handled, if any"""
+    return _current.get() if QUERY_LOG_ENABLED else None
+
+def log_query(queries: Optional[RequestQueries], service: str, target: str, query, data: Any, seconds: float) -> None:
+    """Record an executed PostgREST query in the request's log and the slow-query log"""
+    if not QUERY_LOG_ENABLED:
+        return
+    request = getattr(query, "request", None)
+    filters = unquote(str(getattr(request, "params", "") or ""))
+    payload = getattr(request, "json", None)
+    sent = dumps(payload) if payload is not None else b""
+    duration_ms = round(seconds * 1000, 2)
+    measure = QUERY_SUMMARY_HEADER or duration_ms >= SLOW_QUERY_MS
+    record = QueryRecord(
+        service=service,
+        target=target,
+        filters=filters,
+        rows=len(data) if isinstance(data, list) else int(data is not None),
+        bytes_sent=len(sent),
+        bytes_received=(len(dumps(data)) if data is not None else 0) if measure else None,
+        duration_ms=duration_ms,
+        fingerprint=(target, filters, sent)
+    )
+    if queries is not None:
+        queries.add(record)
+    if record.duration_ms >= SLOW_QUERY_MS:
+        slow_query_logger.warning(json.dumps({
+            "event": "slow_query",
+            "request": queries.request if queries is not None else None,
+            "service": service,
+            "target": target,
+            "filters": filters[:MAX_LOGGED_FILTER_LENGTH],
+            "rows": record.rows,
+            "bytes_sent": record.bytes_sent,
+            "bytes_received": record.bytes_received,
+            "duration_ms": record.duration_ms
+        }))
+
+def _check(queries: RequestQueries) -> None:
+    """Flag requests that fan out into many upstream calls or repeat a query"""
+    repeated = queries.repeated()
+    if len(queries.records) <= MAX_UPSTREAM_CALLS and not repeated:
+        return
+    logger.warning(json.dumps({
+        "event": "upstream_fanout",
+        "request": queries.request,
+        "calls": len(queries.records),
+        "duration_ms": round(sum(record.duration_ms for record in queries.records), 2),
+        "targets": dict(Counter(record.target for record in queries.records)),
+        "repeated": [{"target": record.target, "filters": record.filters[:MAX_LOGGED_FILTER_LENGTH], "count": count} for record, count in repeated]
+    }))
+
+class QueryLogMiddleware:
+    """ASGI middleware giving each request its own query log, checked when the request ends"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not QUERY_LOG_ENABLED:
+            return await self.app(scope, receive, send)
+
+        queries = RequestQueries(f"{scope['method']} {scope['path']}")
+        token = _current.set(queries)
+
+        async def send_with_summary(message):
+            if message["type"] == "http.response.start":
+                template = route_template(scope)
+                if template != "unmatched":
+                    queries.request = f"{scope['method']} {template}"
+                if QUERY_SUMMARY_HEADER:
+                    message["headers"] = [*message.get("headers", []), (SUMMARY_HEADER_NAME, queries.summary().encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_summary)
+        finally:
+            _current.reset(token)
+            _check(queries)
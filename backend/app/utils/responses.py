@@ -0,0 +1,79 @@
+# backend/app/utils/responses.py
+from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union, get_args, get_origin
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.utils.etag import CACHE_CONTROL
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        # pydantic's own serializer (aliases, field serializers); UUIDs and datetimes come back through orjson
+        return value.model_dump(by_alias=True)
+    if isinstance(value, Decimal):
+        # A string, as pydantic (and so response_model) encodes it
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """JSON-encode models, dicts, UUIDs, datetimes and Decimals in one pass"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded straight from models with orjson.
+
+    Returning one from a route skips FastAPI's response_model validation and
+    serialization, so only hand it models built by our own services.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def json_response(content: Any, etag: Optional[str] = None, headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    headers = dict(headers or {})
+    if etag:
+        headers.update({"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return ORJSONResponse(content, headers=headers)
+
+def _to_decimal(value: Any) -> Any:
+    # PostgREST sends numeric as a JSON number; via str, like pydantic
+    return Decimal(str(value)) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+
+def _to_datetime(value: Any) -> Any:
+    # Parsed so orjson writes it like a model's ("Z", six fraction digits)
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+_CONVERTERS: Dict[type, Callable[[Any], Any]] = {Decimal: _to_decimal, datetime: _to_datetime}
+
+def _converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    if get_origin(annotation) is Union:
+        types = [arg for arg in get_args(annotation) if arg is not type(None)]
+        annotation = types[0] if len(types) == 1 else None
+    return _CONVERTERS.get(annotation)
+
+@lru_cache(maxsize=None)
+def _field_defaults(model: Type[BaseModel]) -> Tuple[Tuple[str, Any, Optional[Callable[[Any], Any]]], ...]:
+    return tuple(
+        (name, None if field.is_required() else field.get_default(call_default_factory=True), _converter(field.annotation))
+        for name, field in model.model_fields.items()
+    )
+
+def project(model: Type[BaseModel], rows: Iterable[dict]) -> List[dict]:
+    """Rows our own database returned, cut down to the model's fields without validating them.
+
+    Decimal and datetime values are converted so they encode exactly like a
+    dumped model. Defaults are shared between rows, so the result is for
+    encoding, not mutating.
+    """
+    fields = _field_defaults(model)
+    return [
+        {
+            name: convert(row.get(name, default)) if convert else row.get(name, default)
+            for name, default, convert in fields
+        }
+        for row in rows
+    ]
@@ -1,14 +1,28 @@
 # backend/app/utils/supabase_client.py
 import os
-from supabase import create_client, Client
+import threading
+from typing import TYPE_CHECKING, Optional
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 load_dotenv()
 
-url: str = os.environ.get("SUPABASE_URL")
-key: str = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-print(key)
-supabase: Client = create_client(url, key)
+_client: Optional["Client"] = None
+_lock = threading.Lock()
+
+def get_supabase_client() -> "Client":
+    """The shared client, created on first use (the SDK is only imported then)"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from supabase import create_client
+                _client = create_client(os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_SERVICE_ROLE_KEY"))
+    return _client
 
-def get_supabase_client():
-    return supabase
+def set_supabase_client(client) -> None:
+    """Use another client, e.g. the in-memory stand-in of the benchmarks"""
+    global _client
+    _client = client
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the Supabase data-access layer
+
+Fires N concurrent barcode lookups through InventoryService against an
+in-memory Supabase stand-in with a fixed per-query latency, once with queries
+executed inline on the event loop (the old behaviour) and once through
+app.utils.db.execute. Inline execution serializes the requests; offloaded
+execution lets them overlap.
+
+Usage (from backend/):
+    python -m benchmarks.bench_concurrency --requests 50 --latency 0.05
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import argparse
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+
+from benchmarks.fake_supabase import FakeSupabase
+from app.utils.supabase_client import set_supabase_client
+
+BUSINESS_ID = str(uuid.uuid4())
+OWNER_ID = str(uuid.uuid4())
+
+def build_fake(latency):
+    now = "2024-01-01T00:00:00+00:00"
+    return FakeSupabase(latency=latency, tables={
+        "businesses": [{"id": BUSINESS_ID, "owner_id": OWNER_ID}],
+        "products": [{
+            "id": str(uuid.uuid4()),
+            "business_id": BUSINESS_ID,
+            "name": "Benchmark Widget",
+            "barcode": "885000000001",
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now
+        }]
+    })
+
+# The services (access checks included) must pick up the stand-in when they are created
+fake = build_fake(0.0)
+set_supabase_client(fake)
+
+from app.services import inventory_service as inventory_module
+from app.services.inventory_service import InventoryService
+from app.services.access_control import access_control
+from app.services.product_catalog import catalog_cache
+
+offloaded_execute = inventory_module.execute
+
+async def execute_inline(query):
+    """The pre-offload behaviour: a blocking call straight on the event loop"""
+    return query.execute()
+
+async def run(requests, latency, inline):
+    service = InventoryService()
+    fake.latency, fake.calls = latency, 0
+    access_control.invalidate_user(OWNER_ID)
+    catalog_cache.invalidate(BUSINESS_ID)
+    inventory_module.execute = execute_inline if inline else offloaded_execute
+
+    started = time.perf_counter()
+    await asyncio.gather(*[
+        service.find_product_by_barcode(BUSINESS_ID, "885000000001", OWNER_ID)
+        for _ in range(requests)
+    ])
+    return time.perf_counter() - started, service.supabase.calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per upstream query")
+    args = parser.parse_args()
+
+    print(f"🔧 {args.requests} concurrent barcode lookups, {args.latency * 1000:.0f} ms per upstream query")
+    for label, inline in (("inline (blocking)", True), ("offloaded", False)):
+        elapsed, calls = asyncio.run(run(args.requests, args.latency, inline))
+        print(f"{label:>18}: {elapsed:7.3f}s wall, {calls} upstream calls, {args.requests / elapsed:8.1f} req/s")
+
+if __name__ == "__main__":
+    main()
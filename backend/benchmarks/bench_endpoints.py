@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark of the API endpoints
+
+Runs the FastAPI app in-process against the in-memory Supabase stand-in
+(benchmarks/fake_supabase.py) and the LINE API stub
+(benchmarks/stub_line_server.py, served on a local port), so no credentials
+or network are needed. A seeded business is driven scenario by scenario
+through the inventory, business, users and webhook routers at a fixed
+concurrency. Each scenario reports p50/p95/p99 latency, requests per second
+and upstream calls per request: Supabase queries, plus LINE API calls made by
+the webhook workers (which are waited for).
+
+Requests authenticate with HS256 tokens signed with a benchmark secret, so
+they take the local verification path; --auth remote verifies every token
+through auth.get_user instead.
+
+Results are written as JSON. Pass an earlier result file as --baseline to
+compare against it; the run exits non-zero when a scenario's p95 or
+throughput regressed by more than --tolerance. Baselines are only comparable
+on the same machine and settings.
+
+Usage (from backend/):
+    python -m benchmarks.bench_endpoints
+    python -m benchmarks.bench_endpoints --concurrency 64 --requests 1000 --latency 0.005
+    python -m benchmarks.bench_endpoints --scenarios products,barcode,webhook --output /tmp/after.json --baseline /tmp/before.json
+"""
+
+import os
+import hmac
+import json
+import time
+import uuid
+import base64
+import socket
+import random
+import asyncio
+import logging
+import hashlib
+import argparse
+import platform
+import threading
+import subprocess
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import numpy as np
+
+from benchmarks.fake_supabase import FakeSupabase
+
+BENCH_JWT_SECRET = "benchmark-jwt-secret"
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "results", "endpoints-latest.json")
+
+# Reads first: the write scenarios invalidate the caches the reads are served from
+SCENARIOS = [
+    "products", "products_304", "barcode", "sku", "summary", "analytics", "reorder_plan",
+    "business", "status", "webhook", "transaction", "batch", "business_update"
+]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def seed(products, ledger_rows, seed_value):
+    """Tables for one business with an owner who is also linked to LINE"""
+    rng = random.Random(seed_value)
+    now = datetime.now(timezone.utc)
+    stamp = now.isoformat()
+    owner_id, business_id = str(uuid.uuid4()), str(uuid.uuid4())
+    line_user_id = "U" + uuid.uuid4().hex
+
+    product_rows, inventory_rows = [], []
+    for number in range(products):
+        product_id = str(uuid.uuid4())
+        product_rows.append({
+            "id": product_id, "business_id": business_id, "name": f"Product {number}", "description": None,
+            "barcode": f"{8850000000000 + number}", "sku": f"SKU-{number:06d}",
+            "cost_price": round(rng.uniform(5, 50), 2), "selling_price": round(rng.uniform(10, 90), 2),
+            "unit": "piece", "category": f"Category {number % 12}", "image_url": None, "is_active": True,
+            "created_at": stamp, "updated_at": stamp
+        })
+        inventory_rows.append({
+            "id": str(uuid.uuid4()), "business_id": business_id, "product_id": product_id,
+            "current_stock": rng.randint(0, 200), "min_stock_level": rng.randint(0, 20), "location": "main",
+            "updated_at": stamp
+        })
+
+    ledger = []
+    for _ in range(ledger_rows):
+        product = rng.choice(product_rows)
+        created = now - timedelta(days=rng.uniform(0, 89), seconds=rng.randint(0, 86399))
+        quantity = rng.randint(1, 10)
+        transaction_type = rng.choice(["stock_in", "stock_out", "stock_out"])
+        previous = rng.randint(quantity, 200)
+        ledger.append({
+            "id": str(uuid.uuid4()), "business_id": business_id, "product_id": product["id"], "user_id": owner_id,
+            "transaction_type": transaction_type, "quantity": quantity, "previous_stock": previous,
+            "new_stock": previous + quantity if transaction_type == "stock_in" else previous - quantity,
+            "unit_cost": None, "reason": None, "notes": None, "reference_number": None, "metadata": {},
+            "created_at": created.isoformat()
+        })
+
+    tables = {
+        "users": [{
+            "id": owner_id, "email": "owner@example.com", "full_name": "Benchmark Owner", "phone": None,
+            "line_user_id": line_user_id, "avatar_url": None, "created_at": stamp, "updated_at": stamp
+        }],
+        "businesses": [{
+            "id": business_id, "owner_id": owner_id, "name": "Benchmark Mart", "business_type": "retail",
+            "timezone": "UTC", "currency": "THB", "is_trial_active": True, "settings": {},
+            "created_at": stamp, "updated_at": stamp
+        }],
+        "business_members": [{"id": str(uuid.uuid4()), "business_id": business_id, "user_id": owner_id, "role": "owner", "status": "active"}],
+        "products": product_rows,
+        "inventory": inventory_rows,
+        "inventory_transactions": ledger
+    }
+    return tables, owner_id, business_id, line_user_id
+
+class Workload:
+    """Builds the request of each scenario; called once per request"""
+
+    def __init__(self, tables, owner_id, business_id, line_user_id, channel_secret, seed_value):
+        self.products = tables["products"]
+        self.owner_id = owner_id
+        self.business_id = business_id
+        self.line_user_id = line_user_id
+        self.channel_secret = channel_secret.encode()
+        self.rng = random.Random(seed_value)
+        self.etags = {}
+        token = jwt.encode(
+            {"sub": owner_id, "aud": "authenticated", "role": "authenticated", "exp": int(time.time()) + 24 * 3600},
+            BENCH_JWT_SECRET, algorithm="HS256"
+        )
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def product(self):
+        return self.rng.choice(self.products)
+
+    def request(self, scenario):
+        """(method, path, keyword arguments for httpx)"""
+        inventory = f"/api/inventory/businesses/{self.business_id}"
+        headers = self.headers
+
+        if scenario == "products":
+            return "GET", f"{inventory}/products?limit=100", {"headers": headers}
+        if scenario == "products_304":
+            return "GET", f"{inventory}/products?limit=100", {"headers": {**headers, "If-None-Match": self.etags.get("products", "")}}
+        if scenario == "barcode":
+            return "GET", f"{inventory}/products/barcode/{self.product()['barcode']}", {"headers": headers}
+        if scenario == "sku":
+            return "GET", f"{inventory}/products/sku/{self.product()['sku']}", {"headers": headers}
+        if scenario == "summary":
+            return "GET", f"{inventory}/summary", {"headers": headers}
+        if scenario == "analytics":
+            return "GET", f"{inventory}/analytics?days=30", {"headers": headers}
+        if scenario == "reorder_plan":
+            return "GET", f"{inventory}/reorder-plan", {"headers": headers}
+        if scenario == "business":
+            return "GET", f"/api/business/{self.business_id}", {"headers": headers}
+        if scenario == "status":
+            return "GET", "/api/users/me/status", {"headers": headers}
+        if scenario == "transaction":
+            return "POST", "/api/inventory/transactions", {"headers": headers, "json": self.movement()}
+        if scenario == "batch":
+            return "POST", "/api/inventory/transactions/batch", {"headers": headers, "json": {"transactions": [self.movement() for _ in range(50)]}}
+        if scenario == "business_update":
+            return "PUT", f"/api/business/{self.business_id}", {"headers": headers, "json": {"description": f"Updated {self.rng.random()}"}}
+        if scenario == "webhook":
+            body = json.dumps(self.webhook_body()).encode()
+            signature = base64.b64encode(hmac.new(self.channel_secret, body, hashlib.sha256).digest()).decode()
+            return "POST", "/webhook/line", {"content": body, "headers": {"X-Line-Signature": signature, "Content-Type": "application/json"}}
+        raise ValueError(f"Unknown scenario {scenario}")
+
+    def movement(self):
+        return {
+            "business_id": self.business_id, "product_id": self.product()["id"], "user_id": self.owner_id,
+            "transaction_type": self.rng.choice(["stock_in", "stock_out"]), "quantity": self.rng.randint(1, 5)
+        }
+
+    def webhook_body(self):
+        product = self.product()
+        text = self.rng.choice([
+            f"/stock {product['sku']}", "/status", "/products", f"/in {product['barcode']} 1",
+            f"how many {product['name']} do we have?"
+        ])
+        return {"destination": "Ubenchmark", "events": [{
+            "type": "message", "mode": "active", "timestamp": int(time.time() * 1000),
+            "webhookEventId": uuid.uuid4().hex, "deliveryContext": {"isRedelivery": False},
+            "source": {"type": "user", "userId": self.line_user_id},
+            "replyToken": uuid.uuid4().hex,
+            "message": {"id": str(self.rng.randrange(10 ** 12)), "type": "text", "text": text}
+        }]}
+
+def percentiles(latencies):
+    values = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {"p50_ms": round(float(values[0]), 3), "p95_ms": round(float(values[1]), 3), "p99_ms": round(float(values[2]), 3)}
+
+async def run_scenario(client, workload, scenario, requests, concurrency, warmup, fake, line_stats, event_queue):
+    for _ in range(warmup):
+        method, path, kwargs = workload.request(scenario)
+        response = await client.request(method, path, **kwargs)
+        if scenario == "products":
+            workload.etags["products"] = response.headers.get("etag", "")
+
+    events_before = event_queue.processed + event_queue.failed
+    calls_before, line_before = fake.calls, sum(line_stats[name] for name in ("reply", "push", "profile"))
+    latencies, errors, statuses = [], 0, {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, path, kwargs = workload.request(scenario)
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if scenario == "webhook":
+        # Acks return before the events are handled; wait for the workers so their calls are counted
+        expected = events_before + requests
+        deadline = time.monotonic() + 60
+        while event_queue.processed + event_queue.failed < expected and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "statuses": {str(code): count for code, count in sorted(statuses.items())},
+        **percentiles(latencies),
+        "mean_ms": round(float(np.mean(latencies)) * 1000, 3),
+        "rps": round(requests / elapsed, 1),
+        "upstream_calls_per_request": round((fake.calls - calls_before) / requests, 3),
+        "line_calls_per_request": round((sum(line_stats[name] for name in ("reply", "push", "profile")) - line_before) / requests, 3)
+    }
+
+def start_line_stub(port, latency):
+    import uvicorn
+    from benchmarks.stub_line_server import create_app
+
+    stub = create_app(latency=latency)
+    server = uvicorn.Server(uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return stub, server
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline_path, tolerance):
+    """Print p95 and throughput against a baseline; True when something regressed beyond tolerance"""
+    with open(baseline_path) as file:
+        baseline = json.load(file)["scenarios"]
+    regressed = False
+    print(f"\nAgainst {baseline_path}:")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        p95 = result["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0
+        rps = result["rps"] / before["rps"] - 1 if before["rps"] else 0
+        flag = p95 > tolerance or rps < -tolerance
+        regressed |= flag
+        print(f"  {name:>16}: p95 {p95:+7.1%}  rps {rps:+7.1%}{'  ⚠️ regression' if flag else ''}")
+    return regressed
+
+async def drive(args, fake, workload, line_stub):
+    import httpx
+    from app.main import app
+    from app.services.line_event_queue import line_event_queue
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for scenario in args.scenarios:
+                result = await run_scenario(
+                    client, workload, scenario, args.requests, args.concurrency, args.warmup,
+                    fake, line_stub.state.stats, line_event_queue
+                )
+                results[scenario] = result
+                print(
+                    f"{scenario:>16} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                    f"{result['rps']:>9.1f} {result['upstream_calls_per_request']:>9.2f} {result['line_calls_per_request']:>6.2f} {result['errors']:>6}"
+                )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=5, help="untimed requests before each scenario")
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--ledger", type=int, default=20000, help="seeded inventory_transactions rows")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every Supabase call")
+    parser.add_argument("--line-latency", type=float, default=0.0, help="seconds added to every LINE API call")
+    parser.add_argument("--auth", choices=["local", "remote"], default="local", help="verify tokens locally (HS256) or through auth.get_user")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative p95 / rps regression")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    # Everything the app reads at import time has to be in place before it is imported
+    line_port = free_port()
+    os.environ["LINE_API_BASE_URL"] = f"http://127.0.0.1:{line_port}"
+    os.environ["SUPABASE_JWT_SECRET"] = BENCH_JWT_SECRET if args.auth == "local" else ""
+    os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+    os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+    os.environ.setdefault("LINE_CHANNEL_ACCESS_TOKEN", "benchmark")
+    os.environ.setdefault("LINE_CHANNEL_SECRET", "benchmark-channel-secret")
+    # Batches fan out (and re-read stock on conflicts) by design; a warning per request would bury the report
+    logging.getLogger("app.utils.query_log").setLevel(logging.ERROR)
+
+    tables, owner_id, business_id, line_user_id = seed(args.products, args.ledger, args.seed)
+    fake = FakeSupabase(tables=tables, latency=args.latency)
+
+    from app.utils.supabase_client import set_supabase_client
+    set_supabase_client(fake)
+
+    line_stub, server = start_line_stub(line_port, args.line_latency)
+    workload = Workload(tables, owner_id, business_id, line_user_id, os.environ["LINE_CHANNEL_SECRET"], args.seed)
+
+    print(f"🔧 {args.products:,} products, {args.ledger:,} ledger rows, {args.requests} requests per scenario at concurrency {args.concurrency}")
+    print(f"{'scenario':>16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'upstream':>9} {'line':>6} {'errors':>6}")
+    try:
+        results = asyncio.run(drive(args, fake, workload, line_stub))
+    finally:
+        server.should_exit = True
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "settings": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+        },
+        "scenarios": results,
+        "upstream_calls": dict(sorted(fake.calls_by.items()))
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline and compare(results, args.baseline, args.tolerance):
+        exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the vectorized reorder-point forecast
+
+Builds a synthetic stock_out history for P products over D days, turns it
+into the products × days demand matrix and runs the forecast / safety stock /
+reorder computation, timing each step on one core. With --businesses and
+--workers it also times the same work fanned out over a process pool, as
+run_forecast.py does.
+
+Usage (from backend/):
+    python -m benchmarks.bench_forecast --products 50000 --days 365
+    python -m benchmarks.bench_forecast --products 10000 --businesses 8 --workers 4
+"""
+
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.services.forecast_service import demand_matrix, reorder_points, ReorderPolicy
+
+def synthetic_history(products, days, sales_per_product_day, seed):
+    rng = np.random.default_rng(seed)
+    rows = int(products * days * sales_per_product_day)
+    popularity = rng.pareto(1.5, products) + 0.1
+    return (
+        rng.choice(products, size=rows, p=popularity / popularity.sum()),
+        rng.integers(0, days, rows, dtype=np.int32),
+        rng.integers(1, 6, rows).astype(np.int64),
+        rng.integers(0, 200, products).astype(np.float64)
+    )
+
+def plan(products, days, sales_per_product_day, seed):
+    codes, day_index, quantities, stock = synthetic_history(products, days, sales_per_product_day, seed)
+    started = time.perf_counter()
+    demand = demand_matrix(codes, day_index, quantities, products, days)
+    result = reorder_points(demand, stock, ReorderPolicy())
+    return time.perf_counter() - started, int((result["order"] > 0).sum())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--sales", type=float, default=0.2, help="stock_out rows per product per day")
+    parser.add_argument("--businesses", type=int, default=0, help="also time this many businesses over a process pool")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    codes, day_index, quantities, stock = synthetic_history(args.products, args.days, args.sales, args.seed)
+    print(f"🔧 {args.products:,} products × {args.days} days, {len(codes):,} stock_out rows")
+
+    started = time.perf_counter()
+    demand = demand_matrix(codes, day_index, quantities, args.products, args.days)
+    built = time.perf_counter()
+    result = reorder_points(demand, stock, ReorderPolicy())
+    done = time.perf_counter()
+
+    print(f"{'demand matrix':>22}: {(built - started) * 1000:8.1f} ms  ({demand.nbytes / 2 ** 20:.0f} MiB)")
+    print(f"{'forecast + reorder':>22}: {(done - built) * 1000:8.1f} ms")
+    print(f"{'total':>22}: {(done - started) * 1000:8.1f} ms  ({int((result['order'] > 0).sum()):,} products to reorder)")
+
+    if args.businesses:
+        jobs = [(args.products, args.days, args.sales, args.seed + number) for number in range(args.businesses)]
+        started = time.perf_counter()
+        serial = sum(plan(*job)[0] for job in jobs)
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            started = time.perf_counter()
+            list(pool.map(plan, *zip(*jobs)))
+            pooled = time.perf_counter() - started
+        print(f"{args.businesses} businesses: {serial:.2f}s of compute serially, {pooled:.2f}s wall over {args.workers} processes (incl. data generation)")
+
+if __name__ == "__main__":
+    main()
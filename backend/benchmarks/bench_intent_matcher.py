@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the LINE natural-language intent matcher
+
+Classifies a corpus of sample chat messages (English and Thai) with the old
+keyword-list scan and with the compiled intent matcher, then compares
+Aho-Corasick product-mention lookup against a catalog of N products with a
+naive per-product substring scan.
+
+Usage (from backend/):
+    python -m benchmarks.bench_intent_matcher --messages 20000 --products 5000
+"""
+
+import time
+import random
+import argparse
+from types import SimpleNamespace
+
+from app.services.intent_matcher import intent_matcher, build_product_index, find_product_mentions
+
+TEMPLATES = [
+    "how many {p} do we have",
+    "{p} stock left?",
+    "check inventory for {p}",
+    "what can you do",
+    "help",
+    "show me my products",
+    "list items please",
+    "hi there",
+    "thanks!",
+    "received 24 {p} today",
+    "{p} เหลือกี่ชิ้น",
+    "สต็อก {p} คงเหลือเท่าไหร่",
+    "ช่วยด้วย ใช้งานยังไง",
+    "ดูรายการสินค้าทั้งหมด",
+    "สวัสดีครับ",
+]
+
+BRANDS = ["iphone", "galaxy", "pixel", "coca cola", "pepsi", "singha", "chang", "lays", "oreo", "milo", "น้ำดื่ม", "มาม่า"]
+
+def legacy_intent(message):
+    """The keyword-list chain LineBotService used before the matcher"""
+    if any(word in message for word in ['stock', 'inventory', 'how many']):
+        return "stock_query"
+    elif any(word in message for word in ['help', 'what', 'how']):
+        return "help"
+    elif any(word in message for word in ['product', 'item']):
+        return "products"
+    return None
+
+def build_products(count):
+    return [
+        SimpleNamespace(id=i, name=f"{random.choice(BRANDS)} model {i}", sku=f"SKU-{i:06d}", barcode=f"885{i:09d}")
+        for i in range(count)
+    ]
+
+def naive_mentions(products, message):
+    message = message.lower()
+    return [p for p in products if p.name.lower() in message or p.sku.lower() in message]
+
+def timed(label, func, messages):
+    started = time.perf_counter()
+    for message in messages:
+        func(message)
+    elapsed = time.perf_counter() - started
+    print(f"{label:>34}: {elapsed * 1000:9.1f} ms  ({elapsed / len(messages) * 1e6:7.2f} µs/message)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    products = build_products(args.products)
+    messages = [
+        random.choice(TEMPLATES).format(p=random.choice(products).name if random.random() < 0.5 else random.choice(BRANDS))
+        for _ in range(args.messages)
+    ]
+
+    print(f"🔧 {args.messages} messages, {args.products} products")
+    timed("legacy keyword scan (English only)", legacy_intent, messages)
+    timed("compiled intent matcher", intent_matcher.match, messages)
+
+    started = time.perf_counter()
+    index = build_product_index(products)
+    print(f"{'product index build':>34}: {(time.perf_counter() - started) * 1000:9.1f} ms  (once per catalog)")
+
+    sample = messages[:max(1, args.messages // 20)]
+    timed("naive product scan", lambda message: naive_mentions(products, message), sample)
+    timed("Aho-Corasick product mentions", lambda message: find_product_mentions(index, message), sample)
+
+    thai = [m for m in messages if not m.isascii()]
+    recognized_legacy = sum(1 for m in thai if legacy_intent(m))
+    recognized_new = sum(1 for m in thai if intent_matcher.match(m).intent)
+    print(f"Thai messages with an intent: legacy {recognized_legacy}/{len(thai)}, matcher {recognized_new}/{len(thai)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the ledger replay used by rebuild_inventory.py
+
+Generates a synthetic ledger (stock in/out with occasional counts) over N
+products and replays it row by row with next_stock and with the vectorized
+replay_movements, checking both give the same stock.
+
+Usage (from backend/):
+    python -m benchmarks.bench_ledger_replay --rows 2000000 --products 20000
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from app.services.ledger import next_stock, replay_movements, STOCK_IN, STOCK_OUT, SET_STOCK
+
+TYPE_NAMES = {STOCK_IN: "stock_in", STOCK_OUT: "stock_out", SET_STOCK: "count"}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--products", type=int, default=20_000)
+    parser.add_argument("--page-size", type=int, default=5000, help="rows per replay call, as streamed by the tool")
+    parser.add_argument("--scalar-rows", type=int, default=200_000, help="rows timed for the row-by-row replay")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    products = rng.integers(0, args.products, args.rows)
+    types = rng.choice([STOCK_IN, STOCK_OUT, SET_STOCK], size=args.rows, p=[0.48, 0.48, 0.04]).astype(np.int8)
+    quantities = rng.integers(1, 50, args.rows)
+    print(f"🔧 {args.rows:,} ledger rows, {args.products:,} products")
+
+    sample = min(args.scalar_rows, args.rows)
+    started = time.perf_counter()
+    scalar = {}
+    expected = np.empty(sample, dtype=np.int64)
+    for index, (product, kind, quantity) in enumerate(zip(products[:sample].tolist(), types[:sample].tolist(), quantities[:sample].tolist())):
+        expected[index] = scalar[product] = next_stock(scalar.get(product, 0), TYPE_NAMES[kind], quantity)
+    scalar_rate = sample / (time.perf_counter() - started)
+    print(f"{'row-by-row next_stock':>26}: {scalar_rate:12,.0f} rows/s  ({sample:,} rows)")
+
+    for page_size in sorted({args.page_size, args.rows}):
+        stocks = np.zeros(args.products, dtype=np.int64)
+        replayed = np.empty(args.rows, dtype=np.int64)
+        started = time.perf_counter()
+        for start in range(0, args.rows, page_size):
+            end = start + page_size
+            replayed[start:end] = replay_movements(products[start:end], types[start:end], quantities[start:end], stocks)
+        elapsed = time.perf_counter() - started
+        label = f"vectorized, {page_size:,}/call"
+        print(f"{label:>26}: {args.rows / elapsed:12,.0f} rows/s  ({elapsed:.2f}s, {args.rows / elapsed / scalar_rate:.0f}x)")
+        assert np.array_equal(replayed[:sample], expected), "vectorized replay disagrees with next_stock"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the product list response path
+
+Serves N synthetic product rows (shaped like PostgREST returns them) through
+two FastAPI routes in one app: the old path, which validates every row into
+Product and lets FastAPI validate and serialize the page again through
+response_model, and the fast path, which trims the rows to the Product
+fields without validating them and encodes the page with orjson
+(app.utils.responses). Each route is timed end to end through the ASGI stack.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --rows 1000 10000 100000 --repeat 5
+"""
+
+import time
+import uuid
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models import Product, ProductPage
+from app.utils.responses import json_response, project
+
+def synthetic_rows(count):
+    business_id = str(uuid.uuid4())
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for number in range(count):
+        stamp = (created + timedelta(minutes=number)).isoformat()
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "business_id": business_id,
+            "name": f"Product {number}",
+            "description": "Synthetic benchmark product",
+            "barcode": f"{8850000000000 + number}",
+            "sku": f"SKU-{number:06d}",
+            "cost_price": round(10 + number % 97 * 0.25, 2),
+            "selling_price": round(15 + number % 89 * 0.35, 2),
+            "unit": "piece",
+            "category": f"Category {number % 20}",
+            "image_url": None,
+            "is_active": True,
+            "created_at": stamp,
+            "updated_at": stamp
+        })
+    return rows
+
+def build_app(rows):
+    app = FastAPI()
+
+    @app.get("/before", response_model=ProductPage)
+    async def before():
+        return ProductPage(items=[Product(**row) for row in rows], next_cursor=None)
+
+    @app.get("/after", response_model=ProductPage)
+    async def after():
+        return json_response({"items": project(Product, rows), "next_cursor": None})
+
+    return app
+
+def best_of(client, path, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return min(timings), len(response.content)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per route and size; the best is reported")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'before (ms)':>12} {'after (ms)':>11} {'speedup':>8} {'body (KiB)':>11}")
+    for count in args.rows:
+        with TestClient(build_app(synthetic_rows(count))) as client:
+            # Warm both routes once so imports and first-call setup aren't timed
+            client.get("/before?warmup=1")
+            client.get("/after?warmup=1")
+            before, size = best_of(client, "/before", args.repeat)
+            after, _ = best_of(client, "/after", args.repeat)
+        print(f"{count:>8,} {before * 1000:>12.1f} {after * 1000:>11.1f} {before / after:>7.1f}x {size / 1024:>11,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Cold-start report: how long a fresh process takes to serve its first request
+
+Each run starts a new interpreter with `-X importtime`, imports app.main,
+runs the lifespan startup and sends GET /health through the ASGI app, which
+is what a scaled-from-zero instance does before it can answer. The report
+splits that into import, startup and first request, and breaks import time
+down per package and per app module (self time, i.e. excluding what a
+module imports), from the median run.
+
+Clients and SDKs are built lazily or by the background warm-up, so neither
+should show up here; a module that does is the first place to look. The
+run exits non-zero when the median time to first response is over
+--budget-ms. Timings depend on the machine and on warm .pyc caches, so only
+compare runs from the same machine.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 7 --budget-ms 800 --top 20
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from collections import defaultdict
+
+# Runs in the child; everything it prints on stdout is the timing JSON. The
+# marker ends the part of the import log that belongs to `import app.main`;
+# later imports come from the warm-up and the first request.
+MARKER = "--- app.main imported\n"
+CHILD = f"MARKER = {MARKER!r}\n" + """
+import sys, time, json
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+sys.stderr.write(MARKER)
+import asyncio, httpx
+
+async def first_request():
+    clock = time.perf_counter()
+    async with app.main.app.router.lifespan_context(app.main.app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=app.main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            response = await client.get("/health")
+        return clock, ready, time.perf_counter(), response.status_code
+
+clock, ready, served, status = asyncio.run(first_request())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - clock) * 1000,
+    "first_request_ms": (served - ready) * 1000,
+    "status": status
+}))
+"""
+
+def parse_importtime(stderr):
+    """(module, self µs, cumulative µs) per module imported by `import app.main`"""
+    modules = []
+    for line in stderr.split(MARKER, 1)[0].splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_part, cumulative_part, name = line.split("|")
+        modules.append((name.strip(), int(self_part.rsplit(":", 1)[1]), int(cumulative_part)))
+    return modules
+
+def run_once():
+    env = {**os.environ, "PYTHONWARNINGS": "ignore"}
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        capture_output=True, text=True, env=env
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise SystemExit(f"Startup run failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["process_ms"] = wall_ms
+    timings["to_first_response_ms"] = timings["import_ms"] + timings["startup_ms"] + timings["first_request_ms"]
+    return timings, parse_importtime(result.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes; the median run is reported")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="allowed median time to first response")
+    parser.add_argument("--top", type=int, default=15, help="packages and app modules listed")
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    runs = sorted((run_once() for _ in range(args.runs)), key=lambda run: run[0]["to_first_response_ms"])
+    timings, modules = runs[len(runs) // 2]
+    if timings["status"] != 200:
+        raise SystemExit(f"/health answered {timings['status']}")
+
+    print(f"🔧 {args.runs} cold starts, median run:")
+    for key in ("import_ms", "startup_ms", "first_request_ms", "to_first_response_ms", "process_ms"):
+        spread = [run[0][key] for run in runs]
+        print(f"{key:>22} {timings[key]:>9.1f}   (min {min(spread):.1f}, max {max(spread):.1f})")
+
+    packages = defaultdict(int)
+    for name, self_us, _ in modules:
+        packages[name.split(".")[0]] += self_us
+    app_modules = sorted((module for module in modules if module[0].split(".")[0] == "app"), key=lambda module: -module[1])
+
+    print(f"\n{'package':>28} {'self ms':>9}")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:>28} {self_us / 1000:>9.1f}")
+
+    print(f"\n{'app module':>40} {'self ms':>9} {'cumul. ms':>10}")
+    for name, self_us, cumulative_us in app_modules[:args.top]:
+        print(f"{name:>40} {self_us / 1000:>9.1f} {cumulative_us / 1000:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "runs": [run[0] for run in runs],
+                "median": timings,
+                "packages_ms": {name: self_us / 1000 for name, self_us in packages.items()},
+                "app_modules_ms": {name: self_us / 1000 for name, self_us, _ in app_modules},
+                "budget_ms": args.budget_ms
+            }, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+    if timings["to_first_response_ms"] > args.budget_ms:
+        print(f"\n❌ {timings['to_first_response_ms']:.1f} ms to first response, over the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print(f"\n✅ {timings['to_first_response_ms']:.1f} ms to first response, within the {args.budget_ms:.0f} ms budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+In-memory stand-in for the synchronous Supabase client used by the services.
+
+It implements the table().select().eq().insert().update().execute() chain over
+plain lists of dicts, the keyset or_() filters, the two stock movement
+database functions behind rpc() (see migrations/) and auth.get_user. Selects
+return at most `max_rows` rows, like Supabase's PostgREST (1000). Every
+execute() sleeps for a configurable latency, blocking the calling thread
+exactly like a real PostgREST round trip would, and is counted per table and
+operation.
+"""
+
+import re
+import time
+import uuid
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import jwt
+
+def _now():
+    return datetime.now(timezone.utc)
+
+def _unquote(value):
+    return value[1:-1] if len(value) > 1 and value[0] == value[-1] == '"' else value
+
+def _split_top_level(text):
+    """Split a PostgREST logic filter on the commas that aren't inside parentheses or quotes"""
+    parts, depth, quoted, start = [], 0, False, 0
+    for position, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(text[start:position])
+            start = position + 1
+    parts.append(text[start:])
+    return parts
+
+COMPARISONS = {
+    "eq": lambda field, value: str(field) == value,
+    "neq": lambda field, value: str(field) != value,
+    "gt": lambda field, value: field is not None and str(field) > value,
+    "gte": lambda field, value: field is not None and str(field) >= value,
+    "lt": lambda field, value: field is not None and str(field) < value,
+    "lte": lambda field, value: field is not None and str(field) <= value,
+}
+
+def parse_logic(text):
+    """Row predicate for an or=(...) / and(...) filter string as sent by query.or_()"""
+    tests = []
+    for part in _split_top_level(text):
+        match = re.fullmatch(r"(and|or)\((.*)\)", part)
+        if match:
+            inner = [parse_logic(piece) for piece in _split_top_level(match.group(2))]
+            tests.append((lambda row, inner=inner: all(test(row) for test in inner)) if match.group(1) == "and"
+                         else (lambda row, inner=inner: any(test(row) for test in inner)))
+            continue
+        column, operator, value = part.split(".", 2)
+        compare, value = COMPARISONS[operator], _unquote(value)
+        tests.append(lambda row, column=column, compare=compare, value=value: compare(row.get(column), value))
+    return lambda row: any(test(row) for test in tests)
+
+HTTP_METHODS = {"select": "GET", "insert": "POST", "update": "PATCH"}
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.params = []
+        self.operation = "select"
+        self.payload = None
+        self.single_row = False
+        self.orders = []
+        self.row_limit = None
+        self.count_rows = False
+
+    @property
+    def request(self):
+        # What the upstream metrics read off a postgrest request builder
+        return SimpleNamespace(
+            path=f"/rest/v1/{self.table}", http_method=HTTP_METHODS[self.operation],
+            params="&".join(self.params), json=self.payload
+        )
+
+    def select(self, *columns, count=None, **kwargs):
+        self.operation = "select"
+        self.count_rows = count is not None
+        return self
+
+    def insert(self, payload, **kwargs):
+        self.operation = "insert"
+        self.payload = payload
+        return self
+
+    def update(self, payload, **kwargs):
+        self.operation = "update"
+        self.payload = payload
+        return self
+
+    def _compare(self, operator, column, value):
+        compare, value = COMPARISONS[operator], str(value)
+        self.params.append(f"{column}={operator}.{value}")
+        self.filters.append(lambda row: compare(row.get(column), value))
+        return self
+
+    def eq(self, column, value):
+        return self._compare("eq", column, value)
+
+    def neq(self, column, value):
+        return self._compare("neq", column, value)
+
+    def gt(self, column, value):
+        return self._compare("gt", column, value)
+
+    def gte(self, column, value):
+        return self._compare("gte", column, value)
+
+    def lt(self, column, value):
+        return self._compare("lt", column, value)
+
+    def lte(self, column, value):
+        return self._compare("lte", column, value)
+
+    def in_(self, column, values):
+        values = {str(value) for value in values}
+        self.params.append(f"{column}=in.({','.join(sorted(values))})")
+        self.filters.append(lambda row: str(row.get(column)) in values)
+        return self
+
+    def or_(self, filters, **kwargs):
+        self.params.append(f"or=({filters})")
+        self.filters.append(parse_logic(filters))
+        return self
+
+    def order(self, column, desc=False, **kwargs):
+        self.orders.append((column, desc))
+        self.params.append(f"order={column}.{'desc' if desc else 'asc'}")
+        return self
+
+    def limit(self, count, **kwargs):
+        self.row_limit = count
+        self.params.append(f"limit={count}")
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    def _matches(self, row):
+        return all(test(row) for test in self.filters)
+
+    def execute(self):
+        time.sleep(self.client.latency)
+        with self.client.lock:
+            self.client.count(f"{self.table}.{self.operation}")
+            rows = self.client.tables.setdefault(self.table, [])
+
+            if self.operation == "insert":
+                payload = self.payload if isinstance(self.payload, list) else [self.payload]
+                stamp = _now().isoformat()
+                data = [{"id": str(uuid.uuid4()), "created_at": stamp, "updated_at": stamp, **row} for row in payload]
+                rows.extend(data)
+            elif self.operation == "update":
+                data = [row for row in rows if self._matches(row)]
+                for row in data:
+                    row.update(self.payload)
+            else:
+                data = [row for row in rows if self._matches(row)]
+                # Stable sorts from the last key to the first give the combined order
+                for column, descending in reversed(self.orders):
+                    data.sort(key=lambda row: str(row.get(column)), reverse=descending)
+                total = len(data)
+                if self.row_limit is not None:
+                    data = data[:self.row_limit]
+                if self.client.max_rows is not None:
+                    data = data[:self.client.max_rows]
+
+        data = [dict(row) for row in data]
+        if self.single_row:
+            data = data[0] if data else None
+        return SimpleNamespace(data=data, count=total if self.count_rows and self.operation == "select" else None)
+
+class FakeRpc:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    @property
+    def request(self):
+        return SimpleNamespace(path=f"/rest/v1/rpc/{self.name}", http_method="POST", params="", json=self.params)
+
+    def execute(self):
+        time.sleep(self.client.latency)
+        with self.client.lock:
+            self.client.count(f"rpc.{self.name}")
+            return SimpleNamespace(data=getattr(self, f"_{self.name}")(**self.params))
+
+    def _snapshot(self, business_id, product_id):
+        """The inventory row movements apply to (the "main" location's), created at 0 if missing"""
+        for row in self.client.tables.setdefault("inventory", []):
+            if row["business_id"] == business_id and row["product_id"] == product_id and row.get("location") == "main":
+                return row
+        row = {"id": str(uuid.uuid4()), "business_id": business_id, "product_id": product_id,
+               "current_stock": 0, "min_stock_level": 0, "location": "main", "updated_at": _now().isoformat()}
+        self.client.tables["inventory"].append(row)
+        return row
+
+    def _record_inventory_transaction(self, p_business_id, p_product_id, p_user_id, p_transaction_type, p_quantity, **params):
+        snapshot = self._snapshot(p_business_id, p_product_id)
+        previous = snapshot["current_stock"]
+        if p_transaction_type == "stock_in":
+            new = previous + p_quantity
+        elif p_transaction_type == "stock_out":
+            new = max(0, previous - p_quantity)
+        else:
+            new = p_quantity
+        stamp = _now().isoformat()
+        transaction = {
+            "id": str(uuid.uuid4()), "business_id": p_business_id, "product_id": p_product_id, "user_id": p_user_id,
+            "transaction_type": p_transaction_type, "quantity": p_quantity, "previous_stock": previous, "new_stock": new,
+            "unit_cost": params.get("p_unit_cost"), "reason": params.get("p_reason"), "notes": params.get("p_notes"),
+            "reference_number": params.get("p_reference_number"), "metadata": params.get("p_metadata") or {},
+            "created_at": stamp
+        }
+        self.client.tables.setdefault("inventory_transactions", []).append(transaction)
+        snapshot.update(current_stock=new, updated_at=stamp)
+        return [dict(transaction)]
+
+    def _apply_inventory_batch(self, p_transactions):
+        first, last = {}, {}
+        for row in sorted(p_transactions, key=lambda row: row["position"]):
+            key = (row["business_id"], row["product_id"])
+            first.setdefault(key, row)
+            last[key] = row
+
+        snapshots = {key: self._snapshot(*key) for key in first}
+        for key, row in first.items():
+            if snapshots[key]["current_stock"] != row["previous_stock"]:
+                raise Exception(f"stock_conflict: product {key[1]} is at {snapshots[key]['current_stock']}, batch expected {row['previous_stock']}")
+
+        now = _now()
+        for key, row in last.items():
+            snapshots[key].update(current_stock=row["new_stock"], updated_at=now.isoformat())
+        ledger = self.client.tables.setdefault("inventory_transactions", [])
+        for row in p_transactions:
+            entry = {k: v for k, v in row.items() if k != "position"}
+            entry["metadata"] = entry.get("metadata") or {}
+            entry["created_at"] = (now + timedelta(microseconds=row["position"])).isoformat()
+            ledger.append(entry)
+        return len(p_transactions)
+
+class FakeAuth:
+    def __init__(self, client):
+        self.client = client
+
+    def get_user(self, token):
+        """The user a token belongs to, if its subject is in the users table (signatures aren't checked)"""
+        time.sleep(self.client.latency)
+        with self.client.lock:
+            self.client.count("auth.get_user")
+            try:
+                user_id = jwt.decode(token, options={"verify_signature": False}).get("sub")
+            except jwt.InvalidTokenError:
+                user_id = None
+            known = any(row["id"] == user_id for row in self.client.tables.get("users", []))
+        return SimpleNamespace(user=SimpleNamespace(id=user_id) if known else None)
+
+class FakeSupabase:
+    def __init__(self, tables=None, latency=0.0, max_rows=1000):
+        self.tables = tables or {}
+        self.latency = latency
+        self.max_rows = max_rows
+        self.calls = 0
+        self.calls_by = {}
+        self.lock = threading.Lock()
+        self.auth = FakeAuth(self)
+
+    def count(self, name):
+        self.calls += 1
+        self.calls_by[name] = self.calls_by.get(name, 0) + 1
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        return FakeRpc(self, name, params or {})
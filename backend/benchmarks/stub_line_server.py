@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Local stub of the LINE Messaging API endpoints the backend calls
+
+Implements reply, push and profile with optional latency and injected
+429/500 failures, and reports what it received at GET /_stats. Point the
+backend at it with LINE_API_BASE_URL.
+
+Usage (from backend/):
+    python -m benchmarks.stub_line_server --port 8081 --latency 0.02 --fail-rate 0.05
+    LINE_API_BASE_URL=http://localhost:8081 uvicorn app.main:app
+"""
+
+import random
+import asyncio
+import argparse
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+def create_app(latency: float = 0.0, fail_rate: float = 0.0) -> FastAPI:
+    app = FastAPI(title="LINE API stub")
+    stats = {"reply": 0, "push": 0, "profile": 0, "messages": 0, "failures": 0, "duplicates": 0}
+    used_reply_tokens = set()
+    retry_keys = set()
+    app.state.stats = stats
+    app.state.pushed = []
+
+    async def simulate():
+        if latency:
+            await asyncio.sleep(latency)
+        if fail_rate and random.random() < fail_rate:
+            stats["failures"] += 1
+            status = random.choice([429, 500])
+            return JSONResponse({"message": "injected failure"}, status_code=status, headers={"Retry-After": "0"} if status == 429 else None)
+        return None
+
+    @app.post("/v2/bot/message/reply")
+    async def reply(request: Request):
+        failure = await simulate()
+        if failure:
+            return failure
+        body = await request.json()
+        token = body["replyToken"]
+        if token in used_reply_tokens or token.startswith("expired"):
+            return JSONResponse({"message": "Invalid reply token"}, status_code=400)
+        used_reply_tokens.add(token)
+        stats["reply"] += 1
+        stats["messages"] += len(body["messages"])
+        return {}
+
+    @app.post("/v2/bot/message/push")
+    async def push(request: Request):
+        failure = await simulate()
+        if failure:
+            return failure
+        retry_key = request.headers.get("x-line-retry-key")
+        if retry_key in retry_keys:
+            stats["duplicates"] += 1
+            return JSONResponse({"message": "The retry key is already accepted"}, status_code=409)
+        if retry_key:
+            retry_keys.add(retry_key)
+        body = await request.json()
+        stats["push"] += 1
+        stats["messages"] += len(body["messages"])
+        app.state.pushed.append(body)
+        return {}
+
+    @app.get("/v2/bot/profile/{user_id}")
+    async def profile(user_id: str):
+        failure = await simulate()
+        if failure:
+            return failure
+        stats["profile"] += 1
+        return {"userId": user_id, "displayName": f"Stub {user_id[-4:]}", "pictureUrl": None}
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every call")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of calls answered with 429/500")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.latency, args.fail_rate), host="127.0.0.1", port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
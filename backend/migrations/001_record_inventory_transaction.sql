@@ -0,0 +1,88 @@
+-- backend/migrations/001_record_inventory_transaction.sql
+-- Atomic stock movement: reads the current stock, inserts the ledger row and
+-- updates the inventory snapshot in one transaction and one PostgREST call.
+--
+-- Apply in the Supabase SQL editor (or psql) before deploying the backend.
+
+-- One snapshot row per product and location, so a product's first movement
+-- can create its row without racing a concurrent first movement, and every
+-- movement addresses its row by location (default 'main', like the API).
+create unique index if not exists inventory_business_product_location_key
+    on inventory (business_id, product_id, location);
+
+create or replace function record_inventory_transaction(
+    p_business_id uuid,
+    p_product_id uuid,
+    p_user_id uuid,
+    p_transaction_type text,
+    p_quantity integer,
+    p_unit_cost numeric default null,
+    p_reason text default null,
+    p_notes text default null,
+    p_reference_number text default null,
+    p_metadata jsonb default '{}'::jsonb,
+    p_location text default null
+) returns setof inventory_transactions
+language plpgsql
+as $$
+declare
+    v_location text := coalesce(p_location, 'main');
+    v_inventory_id uuid;
+    v_previous_stock integer;
+    v_new_stock integer;
+    v_transaction inventory_transactions;
+begin
+    perform 1 from products where id = p_product_id and business_id = p_business_id;
+    if not found then
+        raise exception 'product_not_found: product % does not belong to business %', p_product_id, p_business_id;
+    end if;
+
+    -- The row lock makes concurrent movements on the same product queue up
+    -- behind each other instead of all reading the same previous stock.
+    select id, current_stock
+      into v_inventory_id, v_previous_stock
+      from inventory
+     where business_id = p_business_id
+       and product_id = p_product_id
+       and location = v_location
+       for update;
+
+    if not found then
+        insert into inventory (business_id, product_id, location, current_stock)
+        values (p_business_id, p_product_id, v_location, 0)
+        on conflict (business_id, product_id, location) do nothing;
+
+        select id, current_stock
+          into v_inventory_id, v_previous_stock
+          from inventory
+         where business_id = p_business_id
+           and product_id = p_product_id
+           and location = v_location
+           for update;
+    end if;
+
+    v_new_stock := case p_transaction_type
+        when 'stock_in' then v_previous_stock + p_quantity
+        when 'stock_out' then greatest(0, v_previous_stock - p_quantity)
+        else p_quantity  -- adjustment / count set the stock outright
+    end;
+
+    insert into inventory_transactions (
+        business_id, product_id, user_id, transaction_type, quantity,
+        previous_stock, new_stock, unit_cost, reason, notes,
+        reference_number, metadata
+    ) values (
+        p_business_id, p_product_id, p_user_id, p_transaction_type, p_quantity,
+        v_previous_stock, v_new_stock, p_unit_cost, p_reason, p_notes,
+        p_reference_number, coalesce(p_metadata, '{}'::jsonb)
+    )
+    returning * into v_transaction;
+
+    update inventory
+       set current_stock = v_new_stock,
+           updated_at = now()
+     where id = v_inventory_id;
+
+    return next v_transaction;
+end;
+$$;
@@ -0,0 +1,99 @@
+-- backend/migrations/002_apply_inventory_batch.sql
+-- Bulk stock movements: applies one chunk of pre-chained ledger rows (already
+-- grouped by product, with ids and previous_stock/new_stock computed by the
+-- API) in a single transaction and a single PostgREST call.
+--
+-- Each product's snapshot row is locked and its current_stock must still equal
+-- the previous_stock of the chunk's first row for that product; otherwise the
+-- whole chunk is rejected with 'stock_conflict' and the API re-reads and
+-- re-chains it. Rows move the 'main' location unless they carry a location.
+
+create or replace function apply_inventory_batch(p_transactions jsonb)
+returns integer
+language plpgsql
+as $$
+declare
+    v_product record;
+    v_missing record;
+    v_inventory_id uuid;
+    v_current_stock integer;
+    v_inserted integer;
+begin
+    select t.product_id, t.business_id
+      into v_missing
+      from jsonb_to_recordset(p_transactions) as t(business_id uuid, product_id uuid)
+     where not exists (
+           select 1 from products p
+            where p.id = t.product_id
+              and p.business_id = t.business_id)
+     limit 1;
+    if found then
+        raise exception 'product_not_found: product % does not belong to business %',
+            v_missing.product_id, v_missing.business_id;
+    end if;
+
+    for v_product in
+        select distinct on (t.business_id, t.product_id, t.location)
+               t.business_id, t.product_id, t.location, t.previous_stock, last.new_stock
+          from (
+                select position, business_id, product_id, coalesce(location, 'main') as location, previous_stock
+                  from jsonb_to_recordset(p_transactions) as r(
+                           position integer, business_id uuid, product_id uuid, location text, previous_stock integer)
+               ) t
+          join lateral (
+                select l.new_stock
+                  from jsonb_to_recordset(p_transactions) as l(
+                           position integer, business_id uuid, product_id uuid, location text, new_stock integer)
+                 where l.business_id = t.business_id
+                   and l.product_id = t.product_id
+                   and coalesce(l.location, 'main') = t.location
+                 order by l.position desc
+                 limit 1
+               ) last on true
+         order by t.business_id, t.product_id, t.location, t.position
+    loop
+        insert into inventory (business_id, product_id, location, current_stock)
+        values (v_product.business_id, v_product.product_id, v_product.location, 0)
+        on conflict (business_id, product_id, location) do nothing;
+
+        select i.id, i.current_stock
+          into v_inventory_id, v_current_stock
+          from inventory i
+         where i.business_id = v_product.business_id
+           and i.product_id = v_product.product_id
+           and i.location = v_product.location
+           for update;
+
+        if v_current_stock <> v_product.previous_stock then
+            raise exception 'stock_conflict: product % is at %, batch expected %',
+                v_product.product_id, v_current_stock, v_product.previous_stock;
+        end if;
+
+        update inventory
+           set current_stock = v_product.new_stock,
+               updated_at = now()
+         where id = v_inventory_id;
+    end loop;
+
+    -- Rows of one chunk share a transaction timestamp; offsetting by position
+    -- keeps the ledger order within a product deterministic.
+    insert into inventory_transactions (
+        id, business_id, product_id, user_id, transaction_type, quantity,
+        previous_stock, new_stock, unit_cost, reason, notes,
+        reference_number, metadata, created_at
+    )
+    select t.id, t.business_id, t.product_id, t.user_id, t.transaction_type, t.quantity,
+           t.previous_stock, t.new_stock, t.unit_cost, t.reason, t.notes,
+           t.reference_number, coalesce(t.metadata, '{}'::jsonb),
+           now() + t.position * interval '1 microsecond'
+      from jsonb_to_recordset(p_transactions) as t(
+               position integer, id uuid, business_id uuid, product_id uuid, user_id uuid,
+               transaction_type text, quantity integer, previous_stock integer,
+               new_stock integer, unit_cost numeric, reason text, notes text,
+               reference_number text, metadata jsonb)
+     order by t.position;
+
+    get diagnostics v_inserted = row_count;
+    return v_inserted;
+end;
+$$;
@@ -0,0 +1,12 @@
+-- backend/migrations/003_data_version_indexes.sql
+-- ETags are derived from each business's latest updated_at and row count
+-- (change_tracker.data_versions in the API); these indexes answer that
+-- query from the index alone instead of scanning the business's rows.
+--
+-- Apply in the Supabase SQL editor (or psql) before deploying the backend.
+
+create index if not exists products_business_updated_at_idx
+    on products (business_id, updated_at desc nulls last);
+
+create index if not exists inventory_business_updated_at_idx
+    on inventory (business_id, updated_at desc nulls last);
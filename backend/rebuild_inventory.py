@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Replay the inventory ledger and check the inventory snapshot against it
+
+inventory.current_stock is maintained as each movement commits by the
+record_inventory_transaction / apply_inventory_batch database functions
+(see migrations/). This tool replays inventory_transactions for a business
+in ledger order, reports products whose snapshot drifted from the ledger and,
+with --fix, rewrites them.
+
+Each product opens at the previous_stock recorded on its first ledger row, so
+opening balances loaded straight into inventory (e.g. by the seed script) are
+respected. Products without any ledger rows are reported but never changed.
+
+Usage (from backend/):
+    python rebuild_inventory.py --business-id <uuid>
+    python rebuild_inventory.py --all --fix
+"""
+
+import time
+import argparse
+from datetime import datetime, timezone
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.utils.supabase_client import get_supabase_client
+from app.services.ledger import replay_movements, DEFAULT_LOCATION, TYPE_CODES
+# PostgREST returns at most this many rows, so no page can be larger
+from app.storage.supabase_backend import PAGE_SIZE
+
+def stream_ledger(supabase, business_id, page_size=PAGE_SIZE):
+    """Ledger rows in (created_at, id) order, one keyset page at a time"""
+    cursor = None
+    while True:
+        query = supabase.table("inventory_transactions").select(
+            "id, product_id, transaction_type, quantity, previous_stock, new_stock, created_at"
+        ).eq("business_id", business_id)
+        if cursor:
+            created_at, last_id = cursor
+            query = query.or_(f'created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt.{last_id})')
+        result = query.order("created_at").order("id").limit(page_size).execute()
+        if result.data:
+            yield result.data
+        if len(result.data) < page_size:
+            return
+        cursor = (result.data[-1]["created_at"], result.data[-1]["id"])
+
+def select_all(supabase, table, columns, business_id, page_size=PAGE_SIZE, **filters):
+    last_id = None
+    while True:
+        query = supabase.table(table).select(columns).eq("business_id", business_id)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        if last_id:
+            query = query.gt("id", last_id)
+        result = query.order("id").limit(page_size).execute()
+        yield from result.data
+        if len(result.data) < page_size:
+            return
+        last_id = result.data[-1]["id"]
+
+def replay_ledger(supabase, business_id, page_size=PAGE_SIZE):
+    """Final stock per product id from the ledger, plus row counts"""
+    codes = {}
+    stocks = np.zeros(1024, dtype=np.int64)
+    rows = mismatched = 0
+
+    for page in stream_ledger(supabase, business_id, page_size):
+        for row in page:
+            if row["product_id"] not in codes:
+                code = codes[row["product_id"]] = len(codes)
+                if code >= len(stocks):
+                    stocks = np.concatenate([stocks, np.zeros(len(stocks), dtype=np.int64)])
+                stocks[code] = row["previous_stock"] or 0
+
+        count = len(page)
+        replayed = replay_movements(
+            np.fromiter((codes[row["product_id"]] for row in page), dtype=np.int64, count=count),
+            np.fromiter((TYPE_CODES[row["transaction_type"]] for row in page), dtype=np.int8, count=count),
+            np.fromiter((row["quantity"] for row in page), dtype=np.int64, count=count),
+            stocks
+        )
+        recorded = np.fromiter((-1 if row["new_stock"] is None else row["new_stock"] for row in page), dtype=np.int64, count=count)
+        mismatched += int(np.count_nonzero(replayed != recorded))
+        rows += count
+
+    return {product_id: int(stocks[code]) for product_id, code in codes.items()}, rows, mismatched
+
+def load_snapshot(supabase, business_id, page_size=PAGE_SIZE):
+    """The inventory row per product that stock movements apply to (the default location's)"""
+    rows = select_all(supabase, "inventory", "id, product_id, current_stock", business_id, page_size, location=DEFAULT_LOCATION)
+    return {row["product_id"]: row for row in rows}
+
+def check_business(supabase, business_id, fix=False, page_size=PAGE_SIZE, show=20):
+    started = time.perf_counter()
+    started_at = datetime.now(timezone.utc).isoformat()
+
+    replayed, rows, mismatched = replay_ledger(supabase, business_id, page_size)
+    snapshot = load_snapshot(supabase, business_id, page_size)
+
+    drift = []
+    for product_id, stock in replayed.items():
+        row = snapshot.get(product_id)
+        current = row["current_stock"] if row else None
+        if current != stock:
+            drift.append((product_id, current, stock, row))
+    unledgered = [product_id for product_id, row in snapshot.items() if product_id not in replayed and row["current_stock"]]
+    elapsed = time.perf_counter() - started
+
+    print(f"🏢 Business {business_id}")
+    print(f"   Ledger rows replayed: {rows} in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+    print(f"   Products in ledger: {len(replayed)}, snapshot rows: {len(snapshot)}")
+    print(f"   Ledger rows whose recorded new_stock differs from the replay: {mismatched}")
+    print(f"   Products with stock but no ledger history (left as is): {len(unledgered)}")
+    print(f"   Drifted products: {len(drift)}")
+    for product_id, current, stock, _ in drift[:show]:
+        print(f"     {product_id}: snapshot {'missing' if current is None else current} → ledger {stock}")
+    if len(drift) > show:
+        print(f"     ... and {len(drift) - show} more")
+
+    if fix and drift:
+        fixed = skipped = 0
+        for product_id, current, stock, row in drift:
+            if row is None:
+                result = supabase.table("inventory").insert({
+                    "business_id": business_id, "product_id": product_id, "location": DEFAULT_LOCATION, "current_stock": stock
+                }).execute()
+            else:
+                # Rows moved since the replay started are already ahead of it
+                result = supabase.table("inventory").update({
+                    "current_stock": stock, "updated_at": datetime.now(timezone.utc).isoformat()
+                }).eq("id", row["id"]).lte("updated_at", started_at).execute()
+            if result.data:
+                fixed += 1
+            else:
+                skipped += 1
+        print(f"   Fixed {fixed} products, skipped {skipped} that changed during the check")
+
+    return drift
+
+def business_ids(supabase, page_size=PAGE_SIZE):
+    last_id = None
+    while True:
+        query = supabase.table("businesses").select("id")
+        if last_id:
+            query = query.gt("id", last_id)
+        result = query.order("id").limit(page_size).execute()
+        yield from (row["id"] for row in result.data)
+        if len(result.data) < page_size:
+            return
+        last_id = result.data[-1]["id"]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--business-id", help="business to check")
+    target.add_argument("--all", action="store_true", help="check every business")
+    parser.add_argument("--fix", action="store_true", help="rewrite drifted snapshot rows from the ledger")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--show", type=int, default=20, help="drifted products to list per business")
+    args = parser.parse_args()
+    if not 0 < args.page_size <= PAGE_SIZE:
+        parser.error(f"--page-size must be between 1 and {PAGE_SIZE}, the most rows PostgREST returns")
+
+    supabase = get_supabase_client()
+    targets = business_ids(supabase, args.page_size) if args.all else [args.business_id]
+
+    drifted = 0
+    for business_id in targets:
+        drifted += len(check_business(supabase, business_id, args.fix, args.page_size, args.show))
+
+    print(f"\n{'✅ No drift found' if not drifted else f'⚠️ {drifted} drifted products'}")
+    if drifted and not args.fix:
+        exit(1)
+
+if __name__ == "__main__":
+    main()
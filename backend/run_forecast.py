@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Batch reorder-point job: forecast demand and reorder quantities for every
+active product of one or all businesses
+
+Each business is forecast in one vectorized pass over a products × days
+demand matrix (see app/services/forecast_service.py). With --workers N,
+businesses are spread over N processes, each with its own Supabase client.
+Plans are written as JSON lines, one business per line.
+
+Usage (from backend/):
+    python run_forecast.py --business-id <uuid> --output plan.jsonl
+    python run_forecast.py --all --workers 4 --history-days 365 --output plans.jsonl
+"""
+
+import sys
+import json
+import time
+import atexit
+import asyncio
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services.forecast_service import forecast_service, ReorderPolicy
+from app.storage import close_storage
+from app.utils.supabase_client import get_supabase_client
+
+# One event loop per process for all the businesses it plans: the storage
+# backend's connection pool (asyncpg with STORAGE_BACKEND=postgres) belongs to
+# the loop that opened it, so asyncio.run per business would hand the second
+# business a pool on a closed loop
+_runner = None
+
+def business_ids():
+    supabase = get_supabase_client()
+    last_id = None
+    while True:
+        query = supabase.table("businesses").select("id")
+        if last_id:
+            query = query.gt("id", last_id)
+        result = query.order("id").limit(1000).execute()
+        yield from (row["id"] for row in result.data)
+        if len(result.data) < 1000:
+            return
+        last_id = result.data[-1]["id"]
+
+def start_worker():
+    """Process initializer (also called for inline runs): open this process's event loop"""
+    global _runner
+    _runner = asyncio.Runner()
+    atexit.register(stop_worker)
+
+def stop_worker():
+    """Close the storage pool on the loop that opened it, then the loop"""
+    global _runner
+    if _runner is not None:
+        runner, _runner = _runner, None
+        try:
+            runner.run(close_storage())
+        finally:
+            runner.close()
+
+def plan_business(business_id, history_days, policy, only_reorder):
+    """Runs in a worker process (or inline); returns the plan as JSON-ready data"""
+    started = time.perf_counter()
+    plan = _runner.run(forecast_service.compute_plan(business_id, history_days, policy, only_reorder))
+    return plan.model_dump(mode="json"), time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--business-id", help="business to plan")
+    target.add_argument("--all", action="store_true", help="plan every business")
+    parser.add_argument("--history-days", type=int, default=90)
+    parser.add_argument("--lead-time-days", type=int, default=7)
+    parser.add_argument("--review-days", type=int, default=7)
+    parser.add_argument("--service-level", type=float, default=0.95)
+    parser.add_argument("--include-all", action="store_true", help="list every product, not only those to reorder")
+    parser.add_argument("--workers", type=int, default=1, help="processes to spread businesses over")
+    parser.add_argument("--output", help="JSON lines file (default: stdout)")
+    args = parser.parse_args()
+
+    policy = ReorderPolicy(args.lead_time_days, args.review_days, args.service_level)
+    targets = list(business_ids()) if args.all else [args.business_id]
+    jobs = [(business_id, args.history_days, policy, not args.include_all) for business_id in targets]
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    started = time.perf_counter()
+    products = failed = 0
+    pool = None
+    try:
+        if args.workers > 1 and len(jobs) > 1:
+            # Spawned, not forked: a forked worker would inherit the parent's
+            # Supabase client, whose connections business_ids() already opened
+            pool = ProcessPoolExecutor(
+                max_workers=args.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=start_worker
+            )
+            futures = [(job[0], pool.submit(plan_business, *job)) for job in jobs]
+            outcomes = ((business_id, future.result) for business_id, future in futures)
+        else:
+            start_worker()
+            outcomes = ((job[0], lambda job=job: plan_business(*job)) for job in jobs)
+
+        for business_id, outcome in outcomes:
+            try:
+                plan, elapsed = outcome()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {business_id}: {e}", file=sys.stderr)
+                continue
+            products += plan["products_evaluated"]
+            output.write(json.dumps(plan) + "\n")
+            print(f"✅ {business_id}: {plan['products_evaluated']} products, {len(plan['products'])} to list ({elapsed:.2f}s)", file=sys.stderr)
+    finally:
+        if pool:
+            pool.shutdown()
+        stop_worker()
+        if args.output:
+            output.close()
+
+    print(f"\n🏁 {len(jobs) - failed}/{len(jobs)} businesses, {products} products in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    if failed:
+        exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -221,7 +221,7 @@ def create_sample_products(business_id):
                 "reserved_stock": 0,
                 "min_stock_level": 10,
                 "max_stock_level": 200,
-                "location": "Main Warehouse",
+                "location": "main",
                 "last_counted_at": datetime.utcnow().isoformat(),
                 "updated_at": datetime.utcnow().isoformat()
             }
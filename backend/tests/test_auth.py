@@ -0,0 +1,59 @@
+# backend/tests/test_auth.py
+import json
+import time
+import uuid
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from app.utils import auth
+
+def claims():
+    return {"sub": str(uuid.uuid4()), "aud": auth.JWT_AUDIENCE, "exp": int(time.time()) + 60}
+
+class FakeJWKSClient:
+    """Serves one JWK, like PyJWKClient does for a token whose kid matches"""
+
+    def __init__(self, jwk):
+        self.jwk = jwk
+
+    def get_signing_key_from_jwt(self, token):
+        return self.jwk
+
+@pytest.fixture
+def es256_key(monkeypatch):
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    jwk = jwt.PyJWK.from_json(jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key()))
+    monkeypatch.setattr(auth, "_jwks_client", FakeJWKSClient(jwk))
+    return private_key
+
+def test_secret_path_accepts_hs256(monkeypatch):
+    monkeypatch.setattr(auth, "JWT_SECRET", "test-secret")
+    payload = claims()
+    token = jwt.encode(payload, "test-secret", algorithm="HS256")
+    assert auth.verify_token_locally(token)["sub"] == payload["sub"]
+
+def test_secret_path_rejects_other_hmac_algorithms(monkeypatch, es256_key):
+    monkeypatch.setattr(auth, "JWT_SECRET", "test-secret")
+    token = jwt.encode(claims(), "test-secret", algorithm="HS512")
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        auth.verify_token_locally(token)
+
+def test_jwks_path_verifies_with_the_key_algorithm(es256_key):
+    payload = claims()
+    token = jwt.encode(payload, es256_key, algorithm="ES256")
+    assert auth.verify_token_locally(token)["sub"] == payload["sub"]
+
+def test_jwks_path_rejects_the_public_key_as_an_hmac_secret(es256_key):
+    public_jwk = json.dumps(jwt.algorithms.ECAlgorithm.to_jwk(es256_key.public_key()))
+    token = jwt.encode(claims(), public_jwk, algorithm="HS384")
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        auth.verify_token_locally(token)
+
+def test_jwks_path_rejects_symmetric_keys(monkeypatch):
+    jwk = jwt.PyJWK({"kty": "oct", "k": "c2VjcmV0LXNlY3JldC1zZWNyZXQtc2VjcmV0", "alg": "HS256"})
+    monkeypatch.setattr(auth, "_jwks_client", FakeJWKSClient(jwk))
+    token = jwt.encode(claims(), "secret-secret-secret-secret", algorithm="HS512")
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        auth.verify_token_locally(token)
@@ -0,0 +1,42 @@
+# backend/tests/test_change_tracker.py
+import asyncio
+import uuid
+
+import pytest
+
+from app.services.change_tracker import ChangeTracker, PRODUCTS, INVENTORY
+from app.utils.supabase_client import set_supabase_client
+from benchmarks.fake_supabase import FakeSupabase
+
+BUSINESS_ID = str(uuid.uuid4())
+
+@pytest.fixture
+def fake():
+    fake = FakeSupabase(tables={
+        "products": [{"id": str(uuid.uuid4()), "business_id": BUSINESS_ID, "updated_at": "2024-01-01T00:00:00+00:00"}],
+        "inventory": []
+    })
+    set_supabase_client(fake)
+    yield fake
+    set_supabase_client(None)
+
+def test_repeated_versions_cost_no_query(fake):
+    tracker = ChangeTracker(data_version_ttl=60)
+    first = asyncio.run(tracker.data_versions(BUSINESS_ID, PRODUCTS, INVENTORY))
+    calls = fake.calls
+
+    assert asyncio.run(tracker.data_versions(BUSINESS_ID, PRODUCTS, INVENTORY)) == first
+    assert fake.calls == calls
+
+def test_a_write_through_this_process_reads_the_version_again(fake):
+    tracker = ChangeTracker(data_version_ttl=60)
+    before = asyncio.run(tracker.data_versions(BUSINESS_ID, PRODUCTS, INVENTORY))
+
+    fake.tables["products"][0]["updated_at"] = "2024-01-02T00:00:00+00:00"
+    tracker.bump(BUSINESS_ID, PRODUCTS)
+    calls = fake.calls
+    after = asyncio.run(tracker.data_versions(BUSINESS_ID, PRODUCTS, INVENTORY))
+
+    assert after[PRODUCTS] != before[PRODUCTS]
+    assert after[INVENTORY] == before[INVENTORY]
+    assert fake.calls == calls + 1
@@ -0,0 +1,19 @@
+# backend/tests/test_intent_matcher.py
+import pytest
+
+from app.services.intent_matcher import intent_matcher
+
+@pytest.mark.parametrize("message, intent, quantity", [
+    ("How many iphone do we have?", "stock_query", None),
+    ("do we have 5 iphone in stock", "stock_query", 5),
+    ("ไอโฟน เหลือ 3 ชิ้นไหม", "stock_query", 3),
+    ("stock 8850000000011", "stock_query", None),
+    ("how many SKU-000012", "stock_query", None),
+    ("1.5 litre water stock", "stock_query", None),
+    ("show me the leftover products", "products", None),
+    ("ใช้งานยังไง", "help", None),
+    ("hi there", None, None),
+])
+def test_match(message, intent, quantity):
+    match = intent_matcher.match(message)
+    assert (match.intent, match.quantity) == (intent, quantity)
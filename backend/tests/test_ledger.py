@@ -0,0 +1,114 @@
+# backend/tests/test_ledger.py
+import random
+
+import numpy as np
+import pytest
+
+from app.services.ledger import TYPE_CODES, chain_movements, next_stock, replay_movements
+
+def scalar_replay(rows, opening):
+    """The row-by-row rule replay_movements vectorizes: (new_stock per row, closing stocks)"""
+    stocks = dict(opening)
+    replayed = []
+    for product, transaction_type, quantity in rows:
+        stocks[product] = next_stock(stocks[product], transaction_type, quantity)
+        replayed.append(stocks[product])
+    return replayed, stocks
+
+def vector_replay(rows, opening):
+    stocks = np.array([opening[product] for product in range(len(opening))], dtype=np.int64)
+    replayed = replay_movements(
+        [product for product, _, _ in rows],
+        [TYPE_CODES[transaction_type] for _, transaction_type, _ in rows],
+        [quantity for _, _, quantity in rows],
+        stocks
+    )
+    return replayed.tolist(), dict(enumerate(stocks.tolist()))
+
+@pytest.mark.parametrize("rows, opening", [
+    # stock_out past zero floors at zero, and the next stock_in starts from there
+    ([(0, "stock_in", 5), (0, "stock_out", 8), (0, "stock_in", 2)], {0: 0}),
+    ([(0, "stock_out", 3), (0, "stock_out", 3), (0, "stock_out", 3)], {0: 7}),
+    # adjustment / count set the stock outright, whatever came before
+    ([(0, "stock_out", 10), (0, "adjustment", 4), (0, "stock_out", 1), (0, "count", 9), (0, "stock_in", 1)], {0: 2}),
+    # interleaved products keep their own running stock
+    ([(0, "stock_in", 3), (1, "stock_out", 1), (0, "adjustment", 0), (1, "stock_in", 4), (0, "stock_out", 1)], {0: 1, 1: 0}),
+    # negative quantities and opening stocks take the row-by-row path
+    ([(0, "stock_in", -4), (0, "stock_out", 1), (1, "adjustment", -2), (1, "stock_in", 3)], {0: 2, 1: -1}),
+])
+def test_replay_matches_scalar_loop(rows, opening):
+    assert vector_replay(rows, opening) == scalar_replay(rows, opening)
+
+def test_replay_matches_scalar_loop_on_random_ledgers():
+    rng = random.Random(14)
+    for trial in range(500):
+        product_count = rng.randint(1, 6)
+        negative = trial % 4 == 0
+        rows = [
+            (rng.randrange(product_count), rng.choice(list(TYPE_CODES)), rng.randint(-3 if negative else 0, 12))
+            for _ in range(rng.randint(1, 60))
+        ]
+        opening = {product: rng.randint(-2 if negative else 0, 10) for product in range(product_count)}
+        assert vector_replay(rows, opening) == scalar_replay(rows, opening), (rows, opening)
+
+def test_replay_empty_chunk():
+    stocks = np.array([3], dtype=np.int64)
+    assert replay_movements([], [], [], stocks).tolist() == []
+    assert stocks.tolist() == [3]
+
+def test_replay_chunks_chain_through_stocks():
+    rows = [(0, "stock_in", 5), (0, "stock_out", 9), (1, "count", 4), (0, "stock_in", 2), (1, "stock_out", 1)]
+    opening = {0: 1, 1: 0}
+    stocks = np.array([1, 0], dtype=np.int64)
+    replayed = []
+    for chunk in (rows[:2], rows[2:4], rows[4:]):
+        replayed += replay_movements(
+            [product for product, _, _ in chunk],
+            [TYPE_CODES[transaction_type] for _, transaction_type, _ in chunk],
+            [quantity for _, _, quantity in chunk],
+            stocks
+        ).tolist()
+    assert (replayed, dict(enumerate(stocks.tolist()))) == scalar_replay(rows, opening)
+
+def movement(product_id, transaction_type, quantity):
+    return {"product_id": product_id, "transaction_type": transaction_type, "quantity": quantity}
+
+def test_chain_movements_fills_previous_and_new_stock():
+    rows = chain_movements([
+        movement("a", "stock_in", 5),
+        movement("b", "stock_out", 2),
+        movement("a", "stock_out", 7),
+        movement("a", "adjustment", 3),
+    ], {"b": 10})
+    assert [(row["previous_stock"], row["new_stock"]) for row in rows] == [(0, 5), (10, 8), (5, 0), (0, 3)]
+
+def test_chain_movements_chains_consecutive_chunks():
+    # Batches are written chunk by chunk; each chunk opens where the last one closed
+    movements = [movement(product, transaction_type, quantity) for product, transaction_type, quantity in [
+        ("a", "stock_in", 4), ("b", "count", 6), ("a", "stock_out", 1),
+        ("b", "stock_out", 10), ("a", "stock_in", 2), ("b", "stock_in", 3),
+    ]]
+    whole = chain_movements([dict(row) for row in movements], {"a": 1})
+
+    stocks = {"a": 1}
+    chunked = []
+    for start in range(0, len(movements), 2):
+        chunked += chain_movements([dict(row) for row in movements[start:start + 2]], stocks)
+
+    assert chunked == whole
+    assert stocks == {"a": 6, "b": 3}
+    # previous_stock of each row is new_stock of the product's row before it
+    last = {"a": 1}
+    for row in chunked:
+        assert row["previous_stock"] == last.get(row["product_id"], 0)
+        last[row["product_id"]] = row["new_stock"]
+
+def test_chain_movements_with_business_keys():
+    key = lambda row: (row["business_id"], row["product_id"])
+    stocks = {("x", "a"): 2}
+    rows = chain_movements([
+        {"business_id": "x", "product_id": "a", "transaction_type": "stock_out", "quantity": 1},
+        {"business_id": "y", "product_id": "a", "transaction_type": "stock_out", "quantity": 1},
+    ], stocks, key=key)
+    assert [row["new_stock"] for row in rows] == [1, 0]
+    assert stocks == {("x", "a"): 1, ("y", "a"): 0}
@@ -0,0 +1,66 @@
+# backend/tests/test_responses.py
+import os
+import uuid
+from types import SimpleNamespace
+
+for name, value in {
+    "SUPABASE_URL": "http://127.0.0.1:9", "SUPABASE_SERVICE_ROLE_KEY": "test",
+    "LINE_CHANNEL_ACCESS_TOKEN": "test", "LINE_CHANNEL_SECRET": "test"
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.product import Product
+from app.utils.auth import get_current_user
+from app.utils.responses import dumps, project
+from app.utils.supabase_client import set_supabase_client
+from benchmarks.fake_supabase import FakeSupabase
+
+BUSINESS_ID = str(uuid.uuid4())
+OWNER_ID = str(uuid.uuid4())
+
+def product_row(**overrides):
+    """A products row as PostgREST returns it: numeric as a JSON number, timestamps with an offset"""
+    row = {
+        "id": str(uuid.uuid4()), "business_id": BUSINESS_ID, "name": "Jasmine rice 5kg",
+        "barcode": "8850000000011", "sku": "RICE-5", "category": "grocery", "unit": "bag",
+        "cost_price": 12.5, "selling_price": 20, "min_stock_level": 5, "is_active": True,
+        "created_at": "2024-01-01T10:00:00.12+00:00", "updated_at": "2024-01-02T10:00:00+00:00"
+    }
+    row.update(overrides)
+    return row
+
+@pytest.mark.parametrize("row", [
+    product_row(),
+    product_row(cost_price=None, selling_price="7.25", updated_at="2024-01-02T17:00:00.123456+07:00")
+])
+def test_projected_row_encodes_like_the_model(row):
+    assert dumps(project(Product, [row])[0]) == dumps(Product(**row))
+
+@pytest.fixture
+def client():
+    from app.main import app
+
+    row = product_row()
+    set_supabase_client(FakeSupabase(tables={
+        "businesses": [{"id": BUSINESS_ID, "owner_id": OWNER_ID, "name": "Shop",
+                        "created_at": row["created_at"], "updated_at": row["updated_at"]}],
+        "business_members": [], "products": [row], "inventory": [], "inventory_transactions": []
+    }))
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=OWNER_ID)
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+        set_supabase_client(None)
+
+def test_list_and_barcode_lookup_encode_a_product_the_same(client):
+    listed = client.get(f"/api/inventory/businesses/{BUSINESS_ID}/products")
+    found = client.get(f"/api/inventory/businesses/{BUSINESS_ID}/products/barcode/8850000000011")
+
+    assert listed.status_code == found.status_code == 200
+    assert listed.json()["items"] == [found.json()]
+    assert found.json()["cost_price"] == "12.5"
+    assert found.json()["created_at"] == "2024-01-01T10:00:00.120000Z"
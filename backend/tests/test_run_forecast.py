@@ -0,0 +1,50 @@
+# backend/tests/test_run_forecast.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import run_forecast
+from app.storage import get_storage, set_storage
+
+class LoopBoundStorage:
+    """Stands in for PostgresStorage: its pool belongs to the loop that opened it, as asyncpg's does"""
+
+    def __init__(self):
+        self.loop = None
+        self.closed = False
+
+    async def pool(self):
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            raise RuntimeError("pool is attached to a different loop")
+        return self
+
+    async def close(self):
+        await self.pool()
+        self.closed = True
+
+async def compute_plan(business_id, history_days, policy, only_reorder):
+    await get_storage().pool()
+    return SimpleNamespace(model_dump=lambda mode: {"business_id": business_id, "products_evaluated": 0})
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = LoopBoundStorage()
+    set_storage(storage)
+    monkeypatch.setattr(run_forecast.forecast_service, "compute_plan", compute_plan)
+    yield storage
+    run_forecast.stop_worker()
+    set_storage(None)
+
+def test_businesses_of_one_worker_share_the_storage_pool(storage):
+    run_forecast.start_worker()
+    for business_id in ("a", "b", "c"):
+        plan, _ = run_forecast.plan_business(business_id, 90, None, True)
+        assert plan["business_id"] == business_id
+
+    run_forecast.stop_worker()
+    assert storage.closed
+    assert storage.loop.is_closed()